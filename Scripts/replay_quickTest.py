@@ -510,9 +510,32 @@ class TestLineSuppress(unittest.TestCase):
         lineSuppress.undo_Reverse()
         self.assertEqual(len(macro.children), 1)
         self.assertFalse(macro.children[0].direct_suppress)
-                
+
         lx.eval('replay.fileClose prompt_save:false')
-        
+
+    def test_lineSuppressBlockAndChildren(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        replay.RecordingCache().clear()
+        replay.RecordingCache().add_command('tool.set preset:"prim.cube" mode:on')
+        replay.RecordingCache().add_command('tool.set preset:"prim.sphere" mode:off')
+        lx.eval("replay.lastBlockInsert")
+
+        macro = replay.Macro()
+        lineSuppress = UndoLineSuppress([[0], [0, 1]])
+        lineSuppress.undo_Forward()
+        self.assertTrue(macro.children[0].direct_suppress)
+        self.assertFalse(macro.node_for_path([0, 0]).direct_suppress)
+        self.assertTrue(macro.node_for_path([0, 1]).direct_suppress)
+        self.assertFalse(macro.node_for_path([0, 0]).columns['enable'].value)
+        self.assertFalse(macro.node_for_path([0, 1]).columns['enable'].value)
+
+        lineSuppress.undo_Reverse()
+        self.assertTrue(macro.node_for_path([0, 0]).columns['enable'].value)
+        self.assertTrue(macro.node_for_path([0, 1]).columns['enable'].value)
+        self.assertEqual(macro.paths_for_nodes(macro.children[0].children), [[0, 0], [0, 1]])
+
+        lx.eval('replay.fileClose prompt_save:false')
+
 from replay_selToBlock import UndoToBlock
 class TestSelToBlock(unittest.TestCase):
     def test_selToBlock(self):
@@ -768,7 +791,32 @@ class TestArgEdit(unittest.TestCase):
         self.assertEqual(len(macro.children[0].args), 5)
         self.assertEqual(macro.children[0].args[0].display_prefix, " ")
         self.assertEqual(macro.children[0].args[0].value, "prim.cube")
-        
+
+        lx.eval('replay.fileClose prompt_save:false')
+
+    def test_argEditMultiSelection(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        lx.eval('replay.lineInsert command:{tool.set preset:"prim.cube" mode:on}')
+        lx.eval('replay.lineInsert command:{tool.set preset:"prim.cube" mode:on}')
+        # Command 0 is selected both as a line and through its argument
+        lx.eval('replay.lineSelect 0')
+        lx.eval('replay.lineSelect 0;0 add:true')
+        lx.eval('replay.lineSelect 1 add:true')
+
+        macro = replay.Macro()
+        commands = macro.argument_index.commands("preset")
+        self.assertEqual(len(commands), 2)
+
+        # Cannot use app.undo app.redo here. Have to do it manually
+        argEdit = UndoArgEdit(False, "prim.sphere", [command.args[idx].path for command, idx in commands])
+        argEdit.undo_Forward()
+        self.assertEqual(macro.children[0].args[0].value, "prim.sphere")
+        self.assertEqual(macro.children[1].args[0].value, "prim.sphere")
+
+        argEdit.undo_Reverse()
+        self.assertEqual(macro.children[0].args[0].value, "prim.cube")
+        self.assertEqual(macro.children[1].args[0].value, "prim.cube")
+
         lx.eval('replay.fileClose prompt_save:false')
 
 from replay_argEditFCL import CommandClass as ArgEditFCL
@@ -953,7 +1001,30 @@ class TestClipboardPast(unittest.TestCase):
         lx.eval('replay.lineSelect 0;0')
         with self.assertRaises(Exception):
             lx.eval('!replay.clipboardPaste')
-        
+
+    def test_past_structured(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        lx.eval('replay.lineInsert command:{tool.set preset:"prim.cube" mode:on}')
+        lx.eval('replay.lineSelect 0')
+        lx.eval('replay.lineRename Cube')
+        lx.eval('replay.clipboardCopy')
+        macro = replay.Macro()
+        self.assertIsNotNone(replay.Clipboard().commands_json(pyperclip.paste()))
+
+        lx.eval('replay.clipboardPaste')
+        self.assertEqual(len(macro.children), 2)
+        self.assertEqual(macro.children[1].name, "Cube")
+        self.assertEqual(macro.children[1].args[0].value, "prim.cube")
+
+        # Text from elsewhere is parsed
+        pyperclip.copy('#LXMacro#\r\ntool.set preset:"prim.sphere" mode:on\r\n')
+        self.assertIsNone(replay.Clipboard().commands_json(pyperclip.paste()))
+        lx.eval('replay.clipboardPaste')
+        self.assertEqual(len(macro.children), 3)
+        self.assertEqual(macro.children[2].args[0].value, "prim.sphere")
+
+        lx.eval('replay.fileClose prompt_save:false')
+
 class TestDelete(unittest.TestCase):
     def test_delete(self):
         lx.eval('replay.fileClose prompt_save:false')
@@ -1820,6 +1891,369 @@ class TestFileOpenAddRecent_Pop(unittest.TestCase):
         self.assertEqual(existing_paths, "%s;%s;" % (os.path.join("path2", "file2"), os.path.join("path1", "file1")))
         self.assertEqual(fileOpenRecentPop().list_commands(), [(os.path.join("path2", "file2"), "file2"), (os.path.join("path1", "file1"), "file1")])
         
+class TestUndoJournal(unittest.TestCase):
+    def test_trim(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        lx.eval('replay.lineInsert command:{tool.set preset:"prim.cube" mode:on}')
+        lx.eval('replay.lineInsert command:{tool.set preset:"prim.cube" mode:on}')
+
+        macro = replay.Macro()
+        self.assertEqual(len(macro.children), 2)
+
+        # Cannot use app.undo app.redo here. Have to do it manually
+        lineDelete1 = UndoLineDelete([[1]])
+        lineDelete2 = UndoLineDelete([[0]])
+        lineDelete1.undo_Forward()
+        lineDelete2.undo_Forward()
+        self.assertEqual(len(macro.children), 0)
+
+        # Only the newest step fits in the budget
+        journal = replay.UndoJournal()
+        journal.trim(1)
+        self.assertTrue(lineDelete1.m_delta.expired)
+        self.assertFalse(lineDelete2.m_delta.expired)
+
+        lineDelete2.undo_Reverse()
+        self.assertEqual(len(macro.children), 1)
+
+        # Expired steps do nothing
+        lineDelete1.undo_Reverse()
+        self.assertEqual(len(macro.children), 1)
+
+        lx.eval('replay.fileClose prompt_save:false')
+        self.assertEqual(journal.deltas, [])
+
+class TestRenderQuotes(unittest.TestCase):
+    def test_quotes_in_value(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        macro = replay.Macro()
+        macro.parse_and_insert_string('#LXMacro#\nitem.name name:{say "hi" now} type:mesh\n', [0])
+        self.assertEqual(macro.children[0].render_LXM_without_comment(), 'item.name name:{say "hi" now} type:mesh')
+        self.assertEqual(macro.children[0].arg_value(0), 'say "hi" now')
+        lx.eval('replay.fileClose prompt_save:false')
+
+class TestCommandCatalog(unittest.TestCase):
+    def test_catalog(self):
+        catalog = replay.CommandCatalog()
+        self.assertTrue(catalog.is_valid('tool.set'))
+        self.assertFalse(catalog.is_valid('replay.noSuchCommand'))
+        self.assertIn('tool.set', catalog.complete('tool.'))
+        self.assertNotIn('item.name', catalog.complete('tool.'))
+        self.assertEqual(catalog.match('tool.set')[0], 'tool.set')
+        self.assertIn('item.name', catalog.fuzzy('itemnam'))
+
+class TestMessage(unittest.TestCase):
+    def test_compose(self):
+        composed = lx.eval('query messageservice msgcompose ? {@MECCO_REPLAY@@OPEN_FILE_FAIL_MSG@ {file.lxm}}')
+        self.assertEqual(replay.message("MECCO_REPLAY", "OPEN_FILE_FAIL_MSG", "file.lxm"), composed)
+        self.assertEqual(replay.message("MECCO_REPLAY", "REFRESH"), "Refresh")
+
+    def test_find(self):
+        self.assertEqual(lx.eval('query messageservice msgfind ? {@MECCO_REPLAY@@REFRESH@}'), "Refresh")
+        composed = lx.eval('query messageservice msgcompose ? {@MECCO_REPLAY@@OPEN_FILE_FAIL_MSG@ {file.lxm}}')
+        self.assertEqual(composed, "Failed to open file: file.lxm")
+
+class TestCommander(unittest.TestCase):
+    def test_cached_arguments(self):
+        lx.eval('user.value mecco_replay_recent_files ""')
+        lx.eval('replay.fileOpenAddRecent "%s"' % os.path.join("path1", "file1"))
+
+        first, second = fileOpenRecentPop(), fileOpenRecentPop()
+        self.assertIs(first.commander_argument_specs(), second.commander_argument_specs())
+        self.assertIs(second.commander_cached_arguments()[0]['values_list'].im_self, second)
+
+        hints = first.arg_UIValueHints(0)
+        self.assertIs(second.arg_UIValueHints(0), hints)
+
+        lx.eval('replay.fileOpenAddRecent "%s"' % os.path.join("path2", "file2"))
+        hints = second.arg_UIValueHints(0)
+        self.assertEqual(hints.uiv_PopCount(), 2)
+        self.assertEqual(hints.uiv_PopUserName(0), "file2")
+
+class TestMacroLibrary(unittest.TestCase):
+    def test_index_search(self):
+        directory = tempfile.mkdtemp()
+        file_path = os.path.join(directory, "cleanup.lxm")
+        with open(file_path, "w") as lxm_file:
+            lxm_file.write('#LXMacro#\n\n# replay name:"Clean Up"\nmesh.cleanup true\n')
+
+        library = replay.MacroLibrary()
+        library.database_path = os.path.join(directory, "library.db")
+        self.assertEqual(library.update([directory], processes=1), (1, 0))
+        self.assertEqual(library.update([directory], processes=1), (0, 0))
+
+        matches = library.search("mesh.cleanup", "command")
+        self.assertEqual([(match.path, match.name) for match in matches], [(file_path, "Clean Up")])
+        self.assertEqual(len(library.search("Clean*", "name")), 1)
+
+        os.remove(file_path)
+        self.assertEqual(library.update([directory], processes=1), (0, 1))
+        self.assertEqual(library.search("mesh.cleanup"), [])
+        library.close()
+
+    def test_search_limit(self):
+        directory = tempfile.mkdtemp()
+        file_path = os.path.join(directory, "names.lxm")
+        with open(file_path, "w") as lxm_file:
+            lxm_file.write('#LXMacro#\n# replay name:"select first"\nitem.name selected mesh\n'
+                           '# replay name:"select second"\nitem.name selected mesh\n')
+
+        library = replay.MacroLibrary()
+        library.database_path = os.path.join(directory, "library.db")
+        library.update([directory], processes=1)
+
+        # Each command matches on its name and an argument, and counts once
+        matches = library.search("select", limit=2)
+        self.assertEqual([match.name for match in matches], ["select first", "select second"])
+        with self.assertRaises(ValueError):
+            library.search("select", "bogus")
+        library.close()
+
+class TestMergeWithBuiltIn(unittest.TestCase):
+    def test_merge(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        macro = replay.Macro()
+        macro.start_track_insertions(True)
+        kept = macro.add_command(command='item.name name:first type:mesh', path=[0])
+        macro.add_command(command='select.type polygon', path=[1])
+        macro.add_command(command='item.name name:third type:mesh', path=[2])
+        macro.start_track_insertions(False)
+
+        # MODO records arguments by position, and the second command differently
+        file_path = os.path.join(tempfile.mkdtemp(), "Replay_built_in.LXM")
+        with open(file_path, "w") as lxm_file:
+            lxm_file.write('#LXMacro#\nitem.name first mesh\nselect.type edge\nitem.name third mesh\n')
+        macro.merge_with_build_in(file_path)
+
+        self.assertIs(macro.children[0], kept)
+        self.assertEqual([node.render_LXM_without_comment() for node in macro.children],
+                         ['item.name name:first type:mesh', 'select.type type:edge', 'item.name name:third type:mesh'])
+        lx.eval('replay.fileClose prompt_save:false')
+
+    def test_json_block(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        macro = replay.Macro()
+        macro.parse_and_insert_string('#LXMacro#\n# Command Block Begin: b\nselect.all\n# Command Block End: b\n', [0])
+        block_json = macro.children[0].render_json()
+        lx.eval('replay.fileClose prompt_save:false')
+
+        # Commands nested in a json block are listed too
+        macro.start_track_insertions(True)
+        block = macro.add_block(block_json=block_json, path=[0])
+        macro.start_track_insertions(False)
+        self.assertEqual(len(macro.insertions), 2)
+        self.assertIs(macro.insertions[0], block.children[0])
+        self.assertIs(macro.insertions[1], block)
+        lx.eval('replay.fileClose prompt_save:false')
+
+class TestFileDiff(unittest.TestCase):
+    def test_diff_merge(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        macro = replay.Macro()
+        macro.parse_and_insert_string('#LXMacro#\nselect.type polygon\nitem.name name:ours type:mesh\nselect.type vertex\nselect.type item\n', [0])
+
+        directory = tempfile.mkdtemp()
+        base_path = os.path.join(directory, "base.lxm")
+        with open(base_path, "w") as lxm_file:
+            lxm_file.write('#LXMacro#\nselect.type polygon\nitem.name name:base type:mesh\nselect.type vertex\nselect.type item\n')
+        theirs_path = os.path.join(directory, "theirs.lxm")
+        with open(theirs_path, "w") as lxm_file:
+            lxm_file.write('#LXMacro#\nselect.type polygon\nitem.name base mesh\nselect.type vertex\nselect.type edge\n')
+
+        # Only the renamed item differs from base, however its arguments are written
+        lx.eval('replay.fileDiff {%s}' % base_path)
+        self.assertEqual(macro.selected_descendants, [macro.children[1]])
+
+        lx.eval('replay.fileDiff {%s} {%s}' % (theirs_path, base_path))
+        self.assertEqual([node.render_LXM_without_comment() for node in macro.children],
+                         ['select.type type:polygon', 'item.name name:ours type:mesh', 'select.type type:vertex', 'select.type type:edge'])
+        lx.eval('replay.fileClose prompt_save:false')
+
+    def test_conflict_at_end(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        macro = replay.Macro()
+        macro.parse_and_insert_string('#LXMacro#\nselect.type polygon\nselect.type vertex\n', [0])
+
+        directory = tempfile.mkdtemp()
+        base_path = os.path.join(directory, "base.lxm")
+        with open(base_path, "w") as lxm_file:
+            lxm_file.write('#LXMacro#\nselect.type polygon\nselect.type item\n')
+        theirs_path = os.path.join(directory, "theirs.lxm")
+        with open(theirs_path, "w") as lxm_file:
+            lxm_file.write('#LXMacro#\nselect.type polygon\nselect.type edge\n')
+
+        # The closing marker has no line after it, and stays after the last one
+        lx.eval('replay.fileDiff {%s} {%s}' % (theirs_path, base_path))
+        self.assertEqual(macro.children[-1].user_comment_after, [replay.MacroDiff.conflict_markers[2]])
+
+        merged_path = os.path.join(directory, "merged.lxm")
+        macro.render('lxm', merged_path)
+        macro.parse('open', merged_path)
+        self.assertEqual(macro.children[-1].render_LXM(), ['# ' + replay.MacroDiff.conflict_markers[1], 'select.type type:edge',
+                                                           '# ' + replay.MacroDiff.conflict_markers[2]])
+        lx.eval('replay.fileClose prompt_save:false')
+
+class TestMacroValidator(unittest.TestCase):
+    def test_validate(self):
+        validator = replay.MacroValidator()
+        self.assertEqual(validator.validate_line('select.element 1 polygon add index:2'), [])
+        self.assertEqual([issue.message for issue in validator.validate_line('select.element 1 polygon add 1.5 mode:set', 4, 'a.lxm')],
+                         ['Argument "index" expects integer, got "1.5"', 'Argument "mode" is set twice'])
+        self.assertEqual(validator.validate_line('replay.noSuchCommand 1'),
+                         [replay.ValidationIssue(None, None, 'replay.noSuchCommand', 'Unknown command "replay.noSuchCommand"')])
+
+        lx.eval('replay.fileClose prompt_save:false')
+        macro = replay.Macro()
+        macro.parse_and_insert_string('#LXMacro#\nselect.type polygon\n# replay suppress:\n# select.element 1 polygon add 0.5\nselect.element 1 polygon add 2.5\n', [0])
+        found = validator.validate_nodes(macro.children)
+        self.assertEqual([node for node, issue in found], [macro.children[2]])
+        lx.eval('replay.fileClose prompt_save:false')
+
+class TestPythonImport(unittest.TestCase):
+    def test_import(self):
+        lx.eval('replay.fileClose prompt_save:false')
+        macro = replay.Macro()
+        directory = tempfile.mkdtemp()
+        file_path = os.path.join(directory, "generated.py")
+        with open(file_path, "w") as py_file:
+            py_file.write("# python\n\nlx.eval('select.type polygon')\n"
+                          "for i in range(3):\n    lx.eval('select.type edge')\n"
+                          "lx.command('item.name', name='Cube 1', type='mesh')\n")
+
+        macro.parse('open', file_path)
+        self.assertEqual([node.render_LXM_without_comment() for node in macro.children],
+                         ['select.type type:polygon', 'item.name name:"Cube 1" type:mesh'])
+        # The loop can't be replayed line by line and is kept as comments
+        self.assertEqual(macro.children[1].user_comment_before, ['for i in range(3):', "    lx.eval('select.type edge')"])
+
+        with open(file_path, "w") as py_file:
+            py_file.write("# python\n\nlx.eval('select.type polygon')\nlx.eval('select.type'\n")
+        with self.assertRaises(replay.LXMError) as context:
+            macro.parse('open', file_path)
+        self.assertEqual(context.exception.line, 4)
+
+        # A line with several statements is kept once
+        with open(file_path, "w") as py_file:
+            py_file.write("# python\n\nx = 'edge'; lx.eval('select.type %s' % x)\n"
+                          "x = 1; lx.eval('select.all')\n"
+                          "lx.eval('select.type polygon'); lx.eval('select.drop item')\n"
+                          "lx.eval('select.type polygon'); x = 'edge'\n"
+                          "lx.eval('select.type %s' % x)\n")
+        macro.parse('open', file_path)
+        self.assertEqual([node.render_LXM_without_comment() for node in macro.children],
+                         ['select.type type:polygon', 'select.drop type:item'])
+        self.assertEqual(macro.children[0].user_comment_before,
+                         ["x = 'edge'; lx.eval('select.type %s' % x)", "x = 1; lx.eval('select.all')"])
+        self.assertEqual(macro.children[-1].user_comment_after,
+                         ["lx.eval('select.type polygon'); x = 'edge'", "lx.eval('select.type %s' % x)"])
+        lx.eval('replay.fileClose prompt_save:false')
+
+class TestMacroDocuments(unittest.TestCase):
+    def test_switch(self):
+        lx.eval('replay.docClose all:true')
+        documents = replay.MacroDocuments()
+        macro = replay.Macro()
+        directory = tempfile.mkdtemp()
+        paths = [os.path.join(directory, "first.LXM"), os.path.join(directory, "second.LXM")]
+        for path, command in zip(paths, ['select.type polygon', 'select.type edge']):
+            with open(path, "w") as lxm_file:
+                lxm_file.write("#LXMacro#\n%s\n" % command)
+
+        lx.eval('replay.fileOpen {%s}' % paths[0])
+        first = macro.children[0]
+        lx.eval('replay.fileOpen {%s}' % paths[1])
+        self.assertEqual(len(documents.documents), 2)
+        self.assertEqual(macro.children[0].render_LXM_without_comment(), 'select.type type:edge')
+
+        # Switching back shows the same nodes, without reading the file
+        lx.eval('replay.docSelect 0')
+        self.assertIs(macro.children[0], first)
+        self.assertEqual(macro.file_path, paths[0])
+        lx.eval('replay.docSelect 1')
+        lx.eval('replay.fileOpen {%s}' % paths[0])
+        self.assertEqual(documents.active, 0)
+        self.assertIs(macro.children[0], first)
+
+        lx.eval('replay.docClose')
+        self.assertEqual(len(documents.documents), 1)
+        self.assertEqual(macro.file_path, paths[1])
+        lx.eval('replay.docClose all:true')
+        self.assertEqual(len(documents.documents), 1)
+        self.assertTrue(macro.is_empty)
+
+    def test_reopen_after_save(self):
+        lx.eval('replay.docClose all:true')
+        documents = replay.MacroDocuments()
+        macro = replay.Macro()
+        file_path = os.path.join(tempfile.mkdtemp(), "saved.LXM")
+        with open(file_path, "w") as lxm_file:
+            lxm_file.write("#LXMacro#\nselect.type polygon\n")
+
+        lx.eval('replay.fileOpen {%s}' % file_path)
+        lx.eval('replay.lineInsert command:{select.type edge}')
+        lx.eval('replay.fileSave')
+        self.assertFalse(macro.unsaved_changes)
+        lx.eval('replay.lineInsert command:{select.all}')
+        nodes = list(macro.children)
+
+        # The saved file is unchanged, so its document is shown as it is
+        lx.eval('replay.docNew')
+        lx.eval('replay.fileOpen {%s}' % file_path)
+        self.assertEqual(documents.active, 0)
+        self.assertEqual(macro.children, nodes)
+        self.assertTrue(macro.unsaved_changes)
+
+        # A saved macro changed on disk is read again
+        lx.eval('replay.fileSave')
+        with open(file_path, "a") as lxm_file:
+            lxm_file.write("select.drop item\n")
+        lx.eval('replay.fileOpen {%s}' % file_path)
+        self.assertEqual(len(macro.children), 4)
+        self.assertNotEqual(macro.children[:3], nodes)
+        lx.eval('replay.docClose all:true')
+
+    def test_undo_after_switch(self):
+        lx.eval('replay.docClose all:true')
+        documents = replay.MacroDocuments()
+        macro = replay.Macro()
+        lineInsert = UndoLineInsert('select.type edge', "", [0])
+        lineInsert.undo_Forward()
+        self.assertEqual(len(macro.children), 1)
+
+        # Undoing a step of a hidden macro shows it again
+        lx.eval('replay.docNew')
+        lineInsert.undo_Reverse()
+        self.assertEqual(documents.active, 0)
+        self.assertTrue(macro.is_empty)
+        lx.eval('replay.docSelect 1')
+        lineInsert.undo_Forward()
+        self.assertEqual(documents.active, 0)
+        self.assertEqual(macro.children[0].render_LXM_without_comment(), 'select.type type:edge')
+        lx.eval('replay.docClose all:true')
+
+class TestConvertMacros(unittest.TestCase):
+    def test_convert_utest(self):
+        kit = lx.eval('query platformservice alias ? {kit_mecco_replay:}')
+        sys.path.insert(0, os.path.join(kit, 'bin'))
+        import convert_macros
+
+        directory = tempfile.mkdtemp()
+        files = convert_macros.scan([os.path.join(kit, 'utest')], set(['lxm', 'py']))
+        self.assertNotEqual(files, [])
+        for source_root, path in files:
+            destination = os.path.join(directory, os.path.splitext(os.path.basename(path))[0] + '.json')
+            result = convert_macros.convert_file((path, destination, 'json'))
+            self.assertIsNone(result['error'])
+            self.assertTrue(os.path.exists(destination))
+
+        # Unknown commands are reported at their line
+        file_path = os.path.join(directory, "unknown.lxm")
+        with open(file_path, "w") as lxm_file:
+            lxm_file.write("#LXMacro#\nselect.all\nbogus.command 1\n")
+        result = convert_macros.convert_file((file_path, file_path + '.json', 'json'))
+        self.assertTrue(result['error'].startswith('%s:3: ' % file_path))
+        lx.eval('replay.fileClose prompt_save:false')
+
 def runUnitTest():
     moc_stdout = StringIO()
         
@@ -1846,6 +2280,18 @@ def runUnitTest():
     suite.addTests(loader.loadTestsFromTestCase(TestFileExportInsert))
     suite.addTests(loader.loadTestsFromTestCase(TestFileSaveOpen))
     suite.addTests(loader.loadTestsFromTestCase(TestFileOpenAddRecent_Pop))
+    suite.addTests(loader.loadTestsFromTestCase(TestUndoJournal))
+    suite.addTests(loader.loadTestsFromTestCase(TestCommandCatalog))
+    suite.addTests(loader.loadTestsFromTestCase(TestMessage))
+    suite.addTests(loader.loadTestsFromTestCase(TestCommander))
+    suite.addTests(loader.loadTestsFromTestCase(TestMacroLibrary))
+    suite.addTests(loader.loadTestsFromTestCase(TestRenderQuotes))
+    suite.addTests(loader.loadTestsFromTestCase(TestMergeWithBuiltIn))
+    suite.addTests(loader.loadTestsFromTestCase(TestFileDiff))
+    suite.addTests(loader.loadTestsFromTestCase(TestMacroValidator))
+    suite.addTests(loader.loadTestsFromTestCase(TestPythonImport))
+    suite.addTests(loader.loadTestsFromTestCase(TestMacroDocuments))
+    suite.addTests(loader.loadTestsFromTestCase(TestConvertMacros))
     runner.run(suite)
     lx.out(moc_stdout.getvalue())
     
@@ -0,0 +1,98 @@
+# python
+'''
+Times the line commands' undo objects on a large selection.
+
+Opens a synthetic macro (10k lines by default), selects every line and runs
+each edit forward and back the way MODO does for do, undo and redo:
+suppress, color, prefix, rename, comment and an argument edit.
+
+Usage:
+    python benchmarks/bench_batchedit.py [--lines N]
+'''
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+import headless
+
+
+def timed(name, undo):
+    '''
+    Runs an undo object forward, back and forward again and prints the time.
+
+    Args:
+        name (str): label to print
+        undo (lxifc.Undo): undo object of a line command
+
+    Returns:
+        None
+    '''
+    gc.collect()
+    start = time.time()
+    undo.undo_Forward()
+    undo.undo_Reverse()
+    undo.undo_Forward()
+    print('%-10s %.3fs' % (name, time.time() - start))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--lines', type=int, default=10000)
+    options = parser.parse_args()
+
+    headless.install()
+    macro = headless.bless_macro()
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lxserv'))
+    from replay_lineSuppress import UndoLineSuppress
+    from replay_lineColor import UndoLineColor, ColorActionList
+    from replay_linePrefix import UndoLinePrefix, PrefixActionList
+    from replay_lineRename import UndoLineRename, NameActionList
+    from replay_lineComment import UndoInsertComment
+    from replay_argEdit import UndoArgEdit
+
+    handle, path = tempfile.mkstemp(suffix='.LXM')
+    os.write(handle, headless.synthetic_lxm(options.lines).encode('utf-8'))
+    os.close(handle)
+    try:
+        macro.parse('open', path)
+    finally:
+        os.remove(path)
+
+    # Select every command and block, but not their arguments
+    lines = list()
+    for node in macro.children:
+        lines.append(node)
+        if node.__class__.__name__ == 'MacroBlockCommand':
+            lines.extend(node.children)
+    for line in lines:
+        line.selected = True
+    commands = [line for line in lines if line.__class__.__name__ == 'MacroCommand']
+
+    start = time.time()
+    paths = macro.paths_for_nodes(lines)
+    print('%d selected lines, paths in %.3fs' % (len(lines), time.time() - start))
+
+    timed('suppress', UndoLineSuppress(paths))
+
+    # Blocks have no prefix
+    for name, undo_class, list_class, attr, value, nodes in (
+            ('color', UndoLineColor, ColorActionList, 'row_color', 'red', lines),
+            ('prefix', UndoLinePrefix, PrefixActionList, 'prefix', '!', commands),
+            ('rename', UndoLineRename, NameActionList, 'name', 'Renamed', lines)):
+        actionList = list_class()
+        for path, line in zip(macro.paths_for_nodes(nodes), nodes):
+            actionList.append(path, getattr(line, attr), value)
+        timed(name, undo_class(actionList))
+
+    timed('comment', UndoInsertComment(paths, 'Comment'))
+
+    args = [command.args[0] for command in commands if command.args]
+    timed('argEdit', UndoArgEdit(True, '1.0', macro.paths_for_nodes(args)))
+
+
+if __name__ == '__main__':
+    main()
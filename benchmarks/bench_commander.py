@@ -0,0 +1,88 @@
+# python
+'''
+Times the commander overhead of every command in lxserv: creating the
+command object, which MODO does for each command it runs or queries, and
+building the value hints of its popups and form command lists.
+
+Usage:
+    python benchmarks/bench_commander.py [--count N] [--top N]
+
+Plugins that need modules missing here (e.g. pyperclip) are listed as
+skipped, as are commands whose hints need a running MODO.
+'''
+import argparse
+import glob
+import inspect
+import os
+import sys
+import time
+
+import headless
+
+
+def command_classes(lxserv, commander):
+    '''Imports every plugin and returns (name, class) for the commands they
+    define, along with the plugins that could not be imported.'''
+    classes = list()
+    skipped = list()
+    for path in sorted(glob.glob(os.path.join(lxserv, '*.py'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            module = __import__(name)
+        except ImportError as error:
+            skipped.append((name, str(error)))
+            continue
+        for class_name, cls in sorted(vars(module).items()):
+            if inspect.isclass(cls) and issubclass(cls, commander.CommanderClass) and cls.__module__ == name:
+                classes.append(('%s.%s' % (name, class_name), cls))
+    return classes, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--top', type=int, default=10)
+    options = parser.parse_args()
+
+    headless.install()
+    lxserv = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lxserv')
+    sys.path.insert(0, lxserv)
+
+    import replay
+    classes, skipped = command_classes(lxserv, replay.commander)
+
+    init_times = list()
+    hint_times = list()
+    for name, cls in classes:
+        start = time.time()
+        for i in range(options.count):
+            command = cls()
+        init_times.append((time.time() - start, name))
+
+        arguments = len(command.commander_arguments())
+        try:
+            start = time.time()
+            for i in range(options.count):
+                command = cls()
+                for index in range(arguments):
+                    command.arg_UIValueHints(index)
+            hint_times.append((time.time() - start, name))
+        except Exception as error:
+            skipped.append((name, 'hints: %s' % error))
+
+    print('%d commands, %d instances each' % (len(classes), options.count))
+    print('create:          %.3fs total' % sum(seconds for seconds, name in init_times))
+    print('create + hints:  %.3fs total' % sum(seconds for seconds, name in hint_times))
+
+    print('\nslowest create + hints:')
+    for seconds, name in sorted(hint_times, reverse=True)[:options.top]:
+        print('  %-48s %.3fs' % (name, seconds))
+
+    if skipped:
+        print('\nskipped:')
+        for name, error in skipped:
+            print('  %-48s %s' % (name, error))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# python
+'''
+Times loading the kit the way MODO does at startup: importing replay, then
+every plugin in lxserv. Reports the time per plugin, the replay modules
+imported lazily along the way, and the MODO queries made while loading.
+
+Usage:
+    python benchmarks/bench_import.py [--top N]
+
+Plugins that need modules missing here (e.g. pyperclip) are listed as
+skipped.
+'''
+import argparse
+import glob
+import os
+import sys
+import time
+
+import headless
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--top', type=int, default=10)
+    options = parser.parse_args()
+
+    headless.install()
+    lxserv = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lxserv')
+    sys.path.insert(0, lxserv)
+
+    start = time.time()
+    import replay
+    package_time = time.time() - start
+
+    plugin_times = list()
+    skipped = list()
+    for path in sorted(glob.glob(os.path.join(lxserv, '*.py'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        start = time.time()
+        try:
+            __import__(name)
+        except ImportError as error:
+            skipped.append((name, str(error)))
+            continue
+        plugin_times.append((time.time() - start, name))
+
+    total = package_time + sum(seconds for seconds, name in plugin_times)
+    print('import replay: %.3fs' % package_time)
+    print('%d plugins: %.3fs total' % (len(plugin_times), total))
+
+    print('\nslowest plugins:')
+    for seconds, name in sorted(plugin_times, reverse=True)[:options.top]:
+        print('  %-32s %.3fs' % (name, seconds))
+
+    print('\nlazy replay imports:')
+    for name, seconds in replay.import_report():
+        print('  %-32s %.3fs' % (name, seconds))
+
+    print('\nMODO queries while loading:')
+    for kind, count in sorted(headless.calls.items()):
+        print('  %-32s %d' % (kind, count))
+
+    if skipped:
+        print('\nskipped:')
+        for name, error in skipped:
+            print('  %-32s %s' % (name, error))
+
+
+if __name__ == '__main__':
+    main()
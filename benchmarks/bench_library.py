@@ -0,0 +1,68 @@
+# python
+'''
+Times the macro library: a full index of a folder of synthetic macros, in
+this process and in a process pool, a reindex with nothing changed, a
+reindex after touching a few files, and some searches.
+
+Usage:
+    python benchmarks/bench_library.py [--files N] [--lines N] [--processes N]
+'''
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import headless
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--files', type=int, default=1000)
+    parser.add_argument('--lines', type=int, default=200)
+    parser.add_argument('--processes', type=int, default=None)
+    options = parser.parse_args()
+
+    headless.install()
+    import replay
+
+    directory = tempfile.mkdtemp(prefix='replay_library_')
+    try:
+        for i in range(options.files):
+            sub_directory = os.path.join(directory, 'folder%d' % (i % 10))
+            if not os.path.isdir(sub_directory):
+                os.makedirs(sub_directory)
+            with open(os.path.join(sub_directory, 'macro%d.lxm' % i), 'w') as lxm_file:
+                lxm_file.write(headless.synthetic_lxm(options.lines))
+
+        library = replay.MacroLibrary()
+        for processes in (1, options.processes):
+            library.database_path = os.path.join(directory, 'library%s.db' % processes)
+            start = time.time()
+            read, dropped = library.update([directory], processes=processes)
+            print('full index, %s processes: %d files in %.3fs' % (processes or 'cpu_count', read, time.time() - start))
+
+        start = time.time()
+        read, dropped = library.update([directory])
+        print('reindex, nothing changed:  %d files in %.3fs' % (read, time.time() - start))
+
+        for i in range(0, options.files, 100):
+            path = os.path.join(directory, 'folder%d' % (i % 10), 'macro%d.lxm' % i)
+            os.utime(path, (time.time() + 10, time.time() + 10))
+        start = time.time()
+        read, dropped = library.update([directory])
+        print('reindex, touched files:    %d files in %.3fs' % (read, time.time() - start))
+
+        print('')
+        for text, field in (('mesh.cleanup', 'command'), ('Cube 44', 'arg'), ('block5*', 'block'), ('poly.triple', 'any')):
+            start = time.time()
+            matches = library.search(text, field)
+            print('search %-14s %-8s %4d matches in %.4fs' % (text, field, len(matches), time.time() - start))
+
+        library.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# python
+'''
+Measures memory used per macro line by the Replay node tree.
+
+Opens a synthetic macro (50k lines by default) through replay.Macro().parse()
+and reports the bytes allocated per line. Uses tracemalloc when the
+interpreter has it, otherwise a deep sys.getsizeof walk of the tree, which
+counts objects shared between cells only once.
+
+Usage:
+    python benchmarks/bench_memory.py [--lines N] [--expand]
+
+--expand builds every argument node, as if every line were expanded in the
+treeview.
+'''
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import types
+
+import headless
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def deep_size(root):
+    '''
+    Returns the size in bytes of an object graph. Each object is counted once.
+
+    Args:
+        root (object): object to measure
+
+    Returns:
+        int: size in bytes
+    '''
+    skip = (type, types.ModuleType, types.FunctionType, types.MethodType,
+            types.BuiltinFunctionType)
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, skip):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+
+        attributes = getattr(obj, '__dict__', None)
+        if isinstance(attributes, dict):
+            stack.append(attributes)
+        for cls in type(obj).__mro__:
+            for slot in cls.__dict__.get('__slots__', ()):
+                if hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return total
+
+
+def open_macro(macro, lines, expand):
+    '''Writes a synthetic macro to disk and opens it.'''
+    handle, path = tempfile.mkstemp(suffix='.LXM')
+    os.write(handle, headless.synthetic_lxm(lines).encode('utf-8'))
+    os.close(handle)
+    try:
+        macro.parse('open', path)
+    finally:
+        os.remove(path)
+
+    if expand:
+        # Walking the whole tree builds every node
+        for node in macro.depth_first_search():
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--lines', type=int, default=50000)
+    parser.add_argument('--expand', action='store_true')
+    options = parser.parse_args()
+
+    headless.install()
+    macro = headless.bless_macro()
+
+    gc.collect()
+    if tracemalloc:
+        method = 'tracemalloc'
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        open_macro(macro, options.lines, options.expand)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+    else:
+        method = 'deep getsizeof'
+        open_macro(macro, options.lines, options.expand)
+        gc.collect()
+        used = deep_size(macro.root)
+
+    print('%d lines, %s, %s: %d bytes total, %.0f bytes per line' % (
+        options.lines,
+        'expanded' if options.expand else 'collapsed',
+        method,
+        used,
+        float(used) / options.lines
+    ))
+
+
+if __name__ == '__main__':
+    main()
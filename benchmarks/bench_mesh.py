@@ -0,0 +1,129 @@
+# python
+'''
+Times commander.MeshEditorClass polygon queries on a stub mesh: the mesh
+snapshot against walking the accessors with the visitors, one call per
+polygon, point and edge, as the helpers used to.
+
+Results of both are compared. Accessor calls are counted, as each one is a
+call into MODO. `cached` is the same query again on the same snapshot.
+
+Usage:
+    python benchmarks/bench_mesh.py [--islands N] [--size N] [--selected 0.01]
+'''
+import argparse
+import gc
+import time
+
+import headless
+
+
+def visitor_queries(commander, lx):
+    '''The helpers as they walked the accessors, by name.'''
+    def active_polys_by_island(editor):
+        mark_mode_checked = editor.mesh_svc.ModeCompose('user0', None)
+        mark_mode_unchecked = editor.mesh_svc.ModeCompose(None, 'user0')
+        editor.polygon_accessor.Enumerate(mark_mode_checked, commander.SetMarksClass(editor.polygon_accessor, mark_mode_unchecked), 0)
+        visitor = commander.PolysByIslandClass(editor.polygon_accessor, editor.point_accessor, mark_mode_checked)
+        editor.polygon_accessor.Enumerate(mark_mode_unchecked, visitor, 0)
+        return visitor.islands
+
+    def active_polys(editor):
+        mark_mode_selected = editor.mesh_svc.ModeCompose(lx.symbol.sMARK_SELECT, None)
+        mark_mode_valid = editor.mesh_svc.ModeCompose(None, 'hide lock')
+        visitor = commander.PolysClass(editor.polygon_accessor, editor.edge_accessor, mark_mode_valid)
+        editor.polygon_accessor.Enumerate(mark_mode_selected, visitor, 0)
+        return visitor.getPolyIDs()
+
+    def selected_polys_by_island(editor):
+        mesh_svc = editor.mesh_svc
+        mark_mode_toCheck = mesh_svc.ModeCompose(lx.symbol.sMARK_SELECT, lx.symbol.sMARK_USER_0)
+        mark_mode_valid = mesh_svc.ModeCompose(None, ' '.join((lx.symbol.sMARK_USER_0, lx.symbol.sMARK_HIDE, lx.symbol.sMARK_LOCK)))
+        mark_mode_checked = mesh_svc.ModeCompose(lx.symbol.sMARK_USER_0, None)
+        mark_mode_clearChecked = mesh_svc.ModeCompose(None, lx.symbol.sMARK_USER_0)
+        editor.polygon_accessor.Enumerate(mark_mode_checked, commander.SetMarksClass(editor.polygon_accessor, mark_mode_clearChecked), 0)
+        visitor = commander.PolysByConnectedClass(editor.polygon_accessor, editor.edge_accessor, mark_mode_valid, mark_mode_checked)
+        editor.polygon_accessor.Enumerate(mark_mode_toCheck, visitor, 0)
+        return visitor.getIslands()
+
+    def selected_polys_by_flood(editor):
+        mark_mode_selected = editor.mesh_svc.ModeCompose(lx.symbol.sMARK_SELECT, None)
+        mark_mode_valid = editor.mesh_svc.ModeCompose(None, 'hide lock')
+        visitor = commander.PolysByTagFloodClass(editor.polygon_accessor, editor.edge_accessor, mark_mode_valid, lx.symbol.i_POLYTAG_MATERIAL)
+        editor.polygon_accessor.Enumerate(mark_mode_selected, visitor, 0)
+        return visitor.getPolyIDs()
+
+    def selected_polys(editor):
+        mark_mode = editor.mesh_svc.ModeCompose(lx.symbol.sMARK_SELECT, 'hide lock')
+        selected = set()
+        for p in xrange(editor.mesh.PolygonCount()):
+            editor.polygon_accessor.SelectByIndex(p)
+            if editor.polygon_accessor.TestMarks(mark_mode):
+                selected.add(editor.polygon_accessor.ID())
+        return selected
+
+    return (
+        ('selected_polys', selected_polys),
+        ('active_polys', active_polys),
+        ('selected_polys_by_island', selected_polys_by_island),
+        ('selected_polys_by_flood', selected_polys_by_flood),
+        ('active_polys_by_island', active_polys_by_island),
+    )
+
+
+def normalized(result):
+    '''Islands compare as sets of sets, in any order.'''
+    if isinstance(result, list):
+        return sorted(sorted(island) for island in result)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--islands', type=int, default=4)
+    parser.add_argument('--size', type=int, default=100, help='quads across and down each island')
+    parser.add_argument('--selected', type=float, default=0.01)
+    options = parser.parse_args()
+
+    headless.install()
+    import lx
+    import replay
+
+    commander = replay.commander
+    mesh = headless.mesh.grid(options.islands, options.size, options.size, selected=options.selected)
+    print('%d polygons, %d points\n' % (mesh.PolygonCount(), mesh.PointCount()))
+
+    editor = commander.MeshEditorClass()
+    mesh.attach(editor)
+    gc.collect()
+    start = time.time()
+    editor.mesh_snapshot()
+    print('snapshot: %.3fs, %d accessor calls\n' % (time.time() - start, mesh.calls(editor)))
+
+    print('%-26s %10s %12s %10s %12s %10s' % ('query', 'visitors', 'calls', 'snapshot', 'calls', 'cached'))
+    for name, query in visitor_queries(commander, lx):
+        mesh.attach(editor)
+        gc.collect()
+        start = time.time()
+        expected = query(editor)
+        visitor_time = time.time() - start
+        visitor_calls = mesh.calls(editor)
+
+        # Marks left by the visitors don't matter to the snapshot
+        mesh.attach(editor)
+        gc.collect()
+        start = time.time()
+        result = getattr(editor, 'get_' + name)()
+        snapshot_time = time.time() - start
+        snapshot_calls = mesh.calls(editor)
+
+        start = time.time()
+        getattr(editor, 'get_' + name)()
+        cached_time = time.time() - start
+
+        if normalized(result) != normalized(expected):
+            raise AssertionError('%s differs from the visitors' % name)
+        print('%-26s %9.3fs %12d %9.3fs %12d %9.3fs' % (name, visitor_time, visitor_calls, snapshot_time, snapshot_calls, cached_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# python
+'''
+Times parsing and rendering of generated macros in each format.
+
+Generates a macro with corpus.py (10k commands by default) and writes it as
+LXM, Python and JSON. For each format it times the LXMParser alone (LXM and
+Python) and the PythonParser, opening it with replay.Macro().parse(), and rendering the opened
+macro back to LXM, Python and JSON. Every rendering is opened again and
+checked to give the same commands.
+
+Usage:
+    python benchmarks/bench_parse.py [--lines N] [--seed N] [--repeat N]
+'''
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import time
+
+import corpus
+import headless
+
+
+class CountingBuilder(object):
+    '''LXMParser builder that only counts what it is given.'''
+    def __init__(self):
+        self.commands = 0
+        self.blocks = 0
+        self.comments = 0
+        self.meta = 0
+
+    def buildType(self, type):
+        pass
+
+    def buildCommand(self, line, suppress):
+        self.commands += 1
+
+    def buildBlockStart(self, block, suppress):
+        self.blocks += 1
+
+    def buildBlockEnd(self, block):
+        pass
+
+    def buildMeta(self, name, value):
+        self.meta += 1
+
+    def buildComment(self, comment):
+        self.comments += 1
+
+
+def best(repeat, function, *args):
+    '''Runs a function `repeat` times and returns the fastest time.'''
+    times = []
+    for i in range(repeat):
+        gc.collect()
+        start = time.time()
+        function(*args)
+        times.append(time.time() - start)
+    return min(times)
+
+
+def commands(macro):
+    '''The command strings of a macro, depth first.'''
+    result = []
+    for node in macro.root.descendants:
+        if node.__class__.__name__ == 'MacroCommand':
+            result.append((node.render_LXM_without_comment(), node.direct_suppress, node.meta.get('name')))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--lines', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    options = parser.parse_args()
+
+    headless.install()
+    macro = headless.bless_macro()
+    import replay
+
+    generator = corpus.CorpusGenerator(corpus.load_schema(), seed=options.seed)
+    nodes = generator.generate(options.lines)
+
+    directory = tempfile.mkdtemp(prefix='replay_parse_')
+    try:
+        paths = {}
+        for format_name in ('lxm', 'py', 'json'):
+            paths[format_name] = os.path.join(directory, 'corpus.%s' % format_name)
+            with open(paths[format_name], 'w') as macro_file:
+                macro_file.write(generator.render(nodes, format_name))
+
+        print('%d commands, %d blocks, %d bytes of LXM\n' % (
+            options.lines, generator.blocks, os.path.getsize(paths['lxm'])))
+
+        for format_name in ('lxm', 'py'):
+            builder = CountingBuilder()
+            seconds = best(options.repeat, lambda: replay.LXMParser().parse(paths[format_name], CountingBuilder()))
+            replay.LXMParser().parse(paths[format_name], builder)
+            print('LXMParser %-5s %8.3fs  %d commands, %d comments, %d meta' % (
+                format_name, seconds, builder.commands, builder.comments, builder.meta))
+
+        builder = CountingBuilder()
+        seconds = best(options.repeat, lambda: replay.PythonParser().parse(paths['py'], CountingBuilder()))
+        replay.PythonParser().parse(paths['py'], builder)
+        print('PythonParser py %8.3fs  %d commands, %d comments, %d meta' % (
+            seconds, builder.commands, builder.comments, builder.meta))
+
+        expected = None
+        for format_name in ('lxm', 'py', 'json'):
+            seconds = best(options.repeat, macro.parse, 'open', paths[format_name])
+            found = commands(macro)
+            if expected is None:
+                expected = found
+            elif found != expected:
+                raise AssertionError('%s opens with different commands than lxm' % format_name)
+            print('open      %-5s %8.3fs' % (format_name, seconds))
+
+        print('')
+        macro.parse('open', paths['lxm'])
+        for format_name in ('lxm', 'py', 'json'):
+            path = os.path.join(directory, 'render.%s' % format_name)
+            seconds = best(options.repeat, macro.render, format_name, path)
+            print('render    %-5s %8.3fs' % (format_name, seconds))
+
+            macro.parse('open', path)
+            if commands(macro) != expected:
+                raise AssertionError('rendered %s opens with different commands' % format_name)
+            macro.parse('open', paths['lxm'])
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
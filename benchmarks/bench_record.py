@@ -0,0 +1,151 @@
+# python
+'''
+Times Macro.merge_with_build_in at the end of long recording sessions: the
+tree diff against deleting every inserted node and inserting the whole
+recording again, as it used to.
+
+Each session inserts generated commands one at a time after the primary
+command of a small macro, as replay.lineInsert does while recording, with
+now and then a block, as replay.lastBlockInsert does. MODO's recording of
+the session writes arguments the other way (by name where Replay wrote them
+by position and the other way round), and differs in a share of commands.
+Both merges are checked to give the same commands, and the nodes kept from
+the session are counted.
+
+Usage:
+    python benchmarks/bench_record.py [--commands 2000,5000] [--changed 0.02]
+'''
+import argparse
+import gc
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import corpus
+import headless
+
+
+def other_style(node):
+    '''The same command with named arguments positional and the other way round.'''
+    named = any(name for name, value in node['args'])
+    args = []
+    for arg, (name, value) in zip(node['schema_args'], node['args']):
+        args.append((None if named else arg['argName'], value))
+    return corpus.CorpusGenerator.command_string(dict(node, args=args))
+
+
+def session(generator, count, changed, rng):
+    '''
+    Returns the lines Replay inserts and the LXM MODO records. Lines are
+    command strings, or lists of them for blocks.
+    '''
+    inserted = []
+    recorded = []
+    for node in generator.generate(count):
+        node['schema_args'] = generator.schema[node['command']]['args']
+        if rng.random() < 0.01:
+            inserted.append([corpus.CorpusGenerator.command_string(node)] * 3)
+            recorded.append('# Command Block Begin: ')
+            recorded.extend(['    ' + other_style(node)] * 3)
+            recorded.append('# Command Block End: ')
+            continue
+
+        inserted.append(corpus.CorpusGenerator.command_string(node))
+        roll = rng.random()
+        if roll < changed / 3:
+            # Left out of MODO's recording
+            continue
+        elif roll < changed * 2 / 3:
+            # Recorded by MODO only, before this one
+            recorded.append(corpus.CorpusGenerator.command_string(generator.command()))
+        elif roll < changed:
+            # Recorded with a different value
+            recorded.append(corpus.CorpusGenerator.command_string(generator.command()))
+            continue
+        recorded.append(other_style(node))
+    return inserted, '#LXMacro#\n' + '\n'.join(recorded) + '\n'
+
+
+def record(macro, base_path, inserted):
+    '''Opens the base macro and inserts a session's lines as the recorder does.'''
+    macro.parse('open', base_path)
+    macro.select(macro.children[len(macro.children) // 2].path)
+    path = macro.primary.path
+    macro.start_track_insertions(True)
+    for line in inserted:
+        path[-1] += 1
+        if isinstance(line, list):
+            macro.add_block(block=line, name='', index=path[-1])
+        else:
+            macro.add_command(command=line, path=list(path))
+    macro.start_track_insertions(False)
+    return list(macro.insertions)
+
+
+def replace_all(macro, file_path):
+    '''merge_with_build_in as it was: every inserted node deleted, the whole recording inserted.'''
+    import replay
+    primary_path = macro.insertions[0].path[0:1]
+    cache = replay.Macro.TmpCommandCache()
+    macro._parse_and_insert(file_path, path=primary_path, receiver=cache)
+    macro.remove_nodes(macro.insertions, notify=False)
+    macro.insert_cache(cache)
+
+
+def commands(macro):
+    import replay
+    return [replay.node_key(node) for node in macro.children]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--commands', default='2000,5000', help='comma separated session sizes')
+    parser.add_argument('--changed', type=float, default=0.02, help='share of commands MODO records differently')
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args()
+
+    headless.install()
+    macro = headless.bless_macro()
+    schema = corpus.load_schema()
+
+    directory = tempfile.mkdtemp(prefix='replay_record_')
+    try:
+        base_path = os.path.join(directory, 'base.lxm')
+        with open(base_path, 'w') as base_file:
+            base_file.write(headless.synthetic_lxm(40))
+
+        print('%8s %14s %14s %10s' % ('commands', 'replace all', 'tree diff', 'kept'))
+        for count in [int(size) for size in options.commands.split(',')]:
+            generator = corpus.CorpusGenerator(
+                schema, seed=options.seed, block_rate=0, suppress_rate=0, meta_rate=0,
+                button_rate=0, comment_rate=0, long_value_rate=0.02, prefix_rate=0)
+            inserted, recording = session(generator, count, options.changed, random.Random(options.seed))
+            file_path = os.path.join(directory, 'Replay_built_in.LXM')
+            with open(file_path, 'w') as recording_file:
+                recording_file.write(recording)
+
+            record(macro, base_path, inserted)
+            gc.collect()
+            start = time.time()
+            replace_all(macro, file_path)
+            replace_time = time.time() - start
+            expected = commands(macro)
+
+            nodes = set(id(node) for node in record(macro, base_path, inserted))
+            gc.collect()
+            start = time.time()
+            macro.merge_with_build_in(file_path)
+            merge_time = time.time() - start
+            if commands(macro) != expected:
+                raise AssertionError('merge gives different commands than replacing all of them')
+            kept = sum(1 for node in macro.children if id(node) in nodes)
+
+            print('%8d %13.3fs %13.3fs %9.1f%%' % (count, replace_time, merge_time, 100.0 * kept / len(nodes)))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
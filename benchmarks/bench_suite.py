@@ -0,0 +1,204 @@
+# python
+'''
+Runs Replay's commands through the headless stand-in on synthetic macros and
+reports operations per second and memory, optionally against a baseline.
+
+Every operation runs the blessed command with lx.eval, the way a button or
+key press does in MODO: open, insert, paste, save, export, select, step and
+reorder. The macro is opened again before each operation, untimed.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1000,10000,100000] [--repeat N]
+        [--save-baseline FILE] [--baseline FILE] [--tolerance 0.25]
+
+With --baseline the run exits with status 1 if any operation is slower than
+the baseline by more than the tolerance.
+'''
+import argparse
+import gc
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import headless
+
+
+def rss():
+    '''Resident memory of this process in bytes.'''
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except (IOError, OSError):
+        # Peak rather than current memory, in kilobytes on linux and bytes on mac
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Suite(object):
+    '''
+    The operations, each running a command `count` times on the opened macro.
+    Returns the number of commands run.
+    '''
+    def __init__(self, lx, replay, directory, path):
+        self.lx = lx
+        self.replay = replay
+        self.directory = directory
+        self.path = path
+
+    def open(self, count):
+        for i in range(count):
+            self.lx.eval('!!replay.fileClose')
+            self.lx.eval('replay.fileOpen {%s}' % self.path)
+        return count
+
+    def insert(self, count):
+        self.lx.eval('replay.lineSelect path:{%d}' % (len(self.replay.Macro().children) // 2))
+        for i in range(count):
+            self.lx.eval('replay.lineInsert {tool.doApply}')
+        return count
+
+    def paste(self, count):
+        macro = self.replay.Macro()
+        macro.clear_selection()
+        for child in macro.children[:10]:
+            child.selected = True
+        self.lx.eval('replay.clipboardCopy')
+        self.lx.eval('replay.lineSelect path:{%d}' % (len(macro.children) // 2))
+        for i in range(count):
+            self.lx.eval('replay.clipboardPaste')
+        return count
+
+    def save(self, count):
+        for i in range(count):
+            self.lx.eval('replay.fileSave')
+        return count
+
+    def export(self, count):
+        formats = ('lxm', 'py', 'json')
+        for i in range(count):
+            name = 'export%d.%s' % (i, formats[i % len(formats)])
+            self.lx.eval('replay.fileExport format:%s destination:{%s}' % (
+                formats[i % len(formats)], os.path.join(self.directory, name)))
+        return count
+
+    def select(self, count):
+        lines = len(self.replay.Macro().children)
+        for i in range(count):
+            self.lx.eval('replay.lineSelect path:{%d}' % (i * 7919 % lines))
+        return count
+
+    def step(self, count):
+        self.lx.eval('replay.lineSelect path:{0}')
+        for i in range(count):
+            self.lx.eval('replay.step')
+        return count
+
+    def reorder(self, count):
+        self.lx.eval('replay.lineSelect path:{%d}' % (len(self.replay.Macro().children) // 2))
+        for i in range(count):
+            self.lx.eval('replay.lineReorder %s' % ('up' if i % 2 else 'down'))
+        return count
+
+
+# Operation names and how many commands each runs, relative to --repeat
+OPERATIONS = (
+    ('open', 1),
+    ('insert', 20),
+    ('paste', 10),
+    ('save', 1),
+    ('export', 3),
+    ('select', 100),
+    ('step', 50),
+    ('reorder', 50),
+)
+
+
+def run_size(lx, replay, lines, repeat):
+    '''
+    Times every operation on a macro of `lines` lines.
+
+    Returns:
+        dict: {operation: (ops per second, resident bytes after the run)}
+    '''
+    directory = tempfile.mkdtemp(prefix='replay_suite_')
+    path = os.path.join(directory, 'macro.LXM')
+    with open(path, 'w') as lxm_file:
+        lxm_file.write(headless.synthetic_lxm(lines))
+
+    results = {}
+    suite = Suite(lx, replay, directory, path)
+    try:
+        for name, count in OPERATIONS:
+            # Start from the same macro, saved fresh for save to overwrite
+            with open(path, 'w') as lxm_file:
+                lxm_file.write(headless.synthetic_lxm(lines))
+            lx.eval('!!replay.fileClose')
+            lx.eval('replay.fileOpen {%s}' % path)
+            headless.reset()
+            gc.collect()
+
+            start = time.time()
+            ran = getattr(suite, name)(count * repeat)
+            seconds = time.time() - start
+
+            errors = [line for line in lx.output if 'Traceback' in line]
+            if errors:
+                raise RuntimeError('%s failed:\n%s' % (name, errors[0]))
+            results[name] = (ran / max(seconds, 1e-9), rss())
+    finally:
+        lx.eval('!!replay.fileClose')
+        shutil.rmtree(directory)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--sizes', default='1000,10000', help='comma separated macro sizes in lines')
+    parser.add_argument('--repeat', type=int, default=1, help='multiplies the commands run per operation')
+    parser.add_argument('--save-baseline', metavar='FILE')
+    parser.add_argument('--baseline', metavar='FILE')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown against the baseline')
+    options = parser.parse_args()
+
+    headless.install()
+    import lx
+    import replay
+    # Blesses the treeview too, as replay_treeBless does in MODO
+    headless.load_servers()
+
+    results = {}
+    print('%-8s %-8s %12s %10s' % ('lines', 'op', 'ops/sec', 'rss MB'))
+    for lines in [int(size) for size in options.sizes.split(',')]:
+        for name, (rate, memory) in sorted(run_size(lx, replay, lines, options.repeat).items(),
+                                           key=lambda item: [op for op, count in OPERATIONS].index(item[0])):
+            results['%d/%s' % (lines, name)] = rate
+            print('%-8d %-8s %12.1f %10.1f' % (lines, name, rate, memory / 1048576.0))
+
+    if options.save_baseline:
+        with open(options.save_baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, sort_keys=True, indent=2)
+        print('\nbaseline saved to %s' % options.save_baseline)
+
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = []
+        print('\n%-16s %12s %12s %8s' % ('op', 'baseline', 'now', 'change'))
+        for key in sorted(set(baseline) & set(results)):
+            change = results[key] / baseline[key] - 1.0
+            print('%-16s %12.1f %12.1f %+7.0f%%' % (key, baseline[key], results[key], change * 100))
+            if change < -options.tolerance:
+                regressions.append(key)
+
+        if regressions:
+            print('\nslower than the baseline: %s' % ', '.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# python
+'''
+Simulates MODO walking and painting the Replay treeview.
+
+Opens a synthetic macro (10k lines by default), expands every block and then
+walks the whole tree the way the treeview does on a repaint: one
+`tree_Spawn()` per tier, and per row the item state, selection state, leaf
+test and every cell string. Reports rows and spawns per second.
+
+Usage:
+    python benchmarks/bench_treewalk.py [--lines N] [--walks N] [--expand]
+
+--expand also walks into every command's arguments.
+'''
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+import headless
+
+fTREE_VIEW_ITEM_EXPAND = 0x00000002
+
+
+def walk(tree, columns, expand, stats):
+    '''
+    Walks one tier of the tree and recurses into expanded rows.
+
+    Args:
+        tree (lx.object.Tree): tree positioned on the tier to walk
+        columns (int): number of columns to paint
+        expand (bool): recurse into every row with children
+        stats (dict): 'rows' and 'spawns' counters
+
+    Returns:
+        None
+    '''
+    import lx
+    view = lx.object.TreeView(tree)
+    attributes = lx.object.Attributes(tree)
+
+    for index in range(tree.Count()):
+        tree.SetCurrent(index)
+        stats['rows'] += 1
+
+        state = tree.ItemState(None)
+        view.IsSelected()
+        for column in range(columns):
+            view.IsInputRegion(column, 0)
+            attributes.GetString(column)
+
+        if tree.ChildIsLeaf():
+            continue
+        if expand or state & fTREE_VIEW_ITEM_EXPAND:
+            stats['spawns'] += 1
+            walk(tree.Spawn(lx.symbol.iTREE_CHILD), columns, expand, stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--lines', type=int, default=10000)
+    parser.add_argument('--walks', type=int, default=5)
+    parser.add_argument('--expand', action='store_true')
+    options = parser.parse_args()
+
+    headless.install()
+    import lx
+    macro = headless.bless_macro()
+
+    handle, path = tempfile.mkstemp(suffix='.LXM')
+    os.write(handle, headless.synthetic_lxm(options.lines).encode('utf-8'))
+    os.close(handle)
+    try:
+        macro.parse('open', path)
+    finally:
+        os.remove(path)
+
+    for node in macro.children:
+        if node.__class__.__name__ == 'MacroBlockCommand':
+            node.add_state_flag(fTREE_VIEW_ITEM_EXPAND)
+
+    columns = len(macro.column_definitions)
+    stats = {'rows': 0, 'spawns': 0}
+
+    gc.collect()
+    start = time.time()
+    for n in range(options.walks):
+        stats['spawns'] += 1
+        walk(macro.treeview.tree_Spawn(lx.symbol.iTREE_ROOT), columns, options.expand, stats)
+    elapsed = time.time() - start
+
+    print('%d walks of %d rows: %.3fs, %.0f rows/s, %.0f spawns/s' % (
+        options.walks,
+        stats['rows'] / options.walks,
+        elapsed,
+        stats['rows'] / elapsed,
+        stats['spawns'] / elapsed
+    ))
+
+
+if __name__ == '__main__':
+    main()
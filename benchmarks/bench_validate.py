@@ -0,0 +1,88 @@
+# python
+'''
+Times MacroValidator: a single long generated macro in each format, then a
+library of generated macros in this process and in a process pool.
+
+The generated macros only use commands and values from the schema snapshot,
+so any issue found is a false positive and fails the benchmark. A copy of
+the long LXM macro with a broken command every hundred lines checks that
+the problems are found too.
+
+Usage:
+    python benchmarks/bench_validate.py [--lines 100000] [--files 200] [--file-lines 500] [--processes N]
+'''
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import corpus
+import headless
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--lines', type=int, default=100000)
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--file-lines', type=int, default=500)
+    parser.add_argument('--processes', type=int, default=None)
+    options = parser.parse_args()
+
+    headless.install()
+    import replay
+
+    directory = tempfile.mkdtemp(prefix='replay_validate_')
+    try:
+        validator = replay.MacroValidator(include_suppressed=True)
+        for format_name in ('lxm', 'py', 'json'):
+            path = os.path.join(directory, 'long.%s' % format_name)
+            with open(path, 'w') as macro_file:
+                macro_file.write(corpus.generate(options.lines, format_name))
+
+            start = time.time()
+            issues, lines = validator.validate_file(path)
+            elapsed = time.time() - start
+            if issues:
+                raise AssertionError('false positive: %s' % (issues[0],))
+            print('%-5s %7d commands in %.3fs, %8.0f lines/s' % (format_name, lines, elapsed, lines / elapsed))
+
+        broken_path = os.path.join(directory, 'broken.lxm')
+        with open(os.path.join(directory, 'long.lxm')) as macro_file:
+            lines = macro_file.read().split('\n')
+        broken = 0
+        for index in range(1, len(lines), 100):
+            if lines[index].startswith(('#', ' ')) or not lines[index]:
+                continue
+            lines[index] = lines[index].split(' ')[0] + ' bogus:1'
+            broken += 1
+        with open(broken_path, 'w') as macro_file:
+            macro_file.write('\n'.join(lines))
+        issues, unused = validator.validate_file(broken_path)
+        print('broken: %d issues found for %d broken lines' % (len(issues), broken))
+        if len(issues) < broken:
+            raise AssertionError('broken lines missed')
+
+        print('')
+        paths = []
+        for i in range(options.files):
+            path = os.path.join(directory, 'macro%d.lxm' % i)
+            with open(path, 'w') as macro_file:
+                macro_file.write(corpus.generate(options.file_lines, seed=i))
+            paths.append(path)
+
+        for processes in (1, options.processes):
+            start = time.time()
+            results = validator.validate_files(paths, processes=processes)
+            elapsed = time.time() - start
+            lines = sum(result['lines'] for result in results)
+            if any(result['issues'] or result['error'] for result in results):
+                raise AssertionError('false positive in the library')
+            print('library, %s processes: %d files, %d commands in %.3fs, %8.0f lines/s' % (
+                processes or 'cpu_count', len(results), lines, elapsed, lines / elapsed))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,428 @@
+# python
+'''
+Generates large synthetic macros in LXM, Python and JSON, for scale and
+stress testing the parser, argument parsing and the renderers.
+
+Commands and their arguments are drawn from the schema snapshot in
+headless/schema.json, in a configurable mix. The macros have nested command
+blocks, suppressed lines and blocks, `# replay` metadata (button names and
+row colors), user comments, prefixes and long quoted and brace-wrapped
+argument values, rendered the same way Replay renders them. The same seed
+always gives the same macro.
+
+Usage:
+    python benchmarks/corpus.py OUTPUT [--lines N] [--format lxm|py|json]
+        [--seed N] [--mix select.element=5,tool.attr=2] [--blocks 0.02]
+        [--depth 3] [--suppress 0.05] [--meta 0.05] [--comments 0.05]
+        [--long-values 0.05]
+'''
+import argparse
+import json
+import os
+import random
+import re
+
+_schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'headless', 'schema.json')
+
+_words = (
+    'cube', 'sphere', 'bevel', 'edge', 'loop', 'vertex', 'polygon', 'mesh',
+    'item', 'layer', 'group', 'left', 'right', 'top', 'bottom', 'inner',
+    'outer', 'soft', 'hard', 'copy', 'final', 'temp', 'base', 'detail',
+)
+
+_colors = (
+    'red', 'magenta', 'pink', 'brown', 'orange', 'yellow', 'green', 'light_g',
+    'cyan', 'blue', 'light_blue', 'ultrama', 'purple', 'light_pu', 'dark_grey',
+    'grey', 'white',
+)
+
+
+def load_schema(path=None):
+    '''
+    Loads command schemas from a schema snapshot.
+
+    Args:
+        path (str): schema snapshot, headless/schema.json by default
+
+    Returns:
+        dict: command schemas by command name
+    '''
+    with open(path or _schema_path) as schema_file:
+        commands = json.load(schema_file)['commands']
+    return _strings(commands)
+
+
+def _strings(value):
+    # json gives unicode, which would render as u'' in Python macros
+    if isinstance(value, dict):
+        return dict((_strings(key), _strings(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [_strings(item) for item in value]
+    if isinstance(value, type(u'')):
+        return value.encode('utf-8')
+    return value
+
+
+def parse_mix(text):
+    '''
+    Parses a command mix such as `select.element=5,tool.attr=2`.
+
+    Args:
+        text (str): comma separated command=weight pairs
+
+    Returns:
+        dict: weights by command name
+    '''
+    mix = {}
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        name, unused, weight = item.partition('=')
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+class CorpusGenerator(object):
+    '''
+    Generates macros as trees of commands and blocks, and renders them.
+
+    A command is a dict with `command`, `prefix`, `args` ((name, value)
+    tuples, name None for positional values), `suppress`, `comments` and
+    `meta`. A block has `block`, `suppress`, `comments`, `meta` and
+    `children`.
+
+    Args:
+        schema (dict): command schemas by command name
+        mix (dict): weights by command name, every schema command equally by default
+        seed (int): random seed
+        block_rate (float): chance that a line opens a block
+        max_depth (int): deepest block nesting
+        suppress_rate (float): chance that a line is suppressed
+        meta_rate (float): chance that a line has a row color
+        button_rate (float): chance that a command has a button name
+        comment_rate (float): chance that a line has comments before it
+        long_value_rate (float): chance that a string argument gets a long value
+        prefix_rate (float): chance that a command has a prefix
+
+    Returns:
+        CorpusGenerator
+    '''
+    def __init__(self, schema, mix=None, seed=0, block_rate=0.02, max_depth=3,
+                 suppress_rate=0.05, meta_rate=0.05, button_rate=0.03,
+                 comment_rate=0.05, long_value_rate=0.05, prefix_rate=0.05):
+        mix = mix or dict((name, 1.0) for name in schema)
+        unknown = [name for name in mix if name not in schema]
+        if unknown:
+            raise ValueError('Commands missing from the schema: %s' % ', '.join(sorted(unknown)))
+
+        self.schema = schema
+        self.random = random.Random(seed)
+        self.block_rate = block_rate
+        self.max_depth = max_depth
+        self.suppress_rate = suppress_rate
+        self.meta_rate = meta_rate
+        self.button_rate = button_rate
+        self.comment_rate = comment_rate
+        self.long_value_rate = long_value_rate
+        self.prefix_rate = prefix_rate
+
+        # Cumulative weights for picking commands
+        self.mix_names = sorted(mix)
+        self.mix_totals = []
+        total = 0.0
+        for name in self.mix_names:
+            total += mix[name]
+            self.mix_totals.append(total)
+        self.blocks = 0
+
+    def chance(self, rate):
+        return self.random.random() < rate
+
+    def words(self, count):
+        return ' '.join(self.random.choice(_words) for i in range(count))
+
+    def pick_command(self):
+        target = self.random.random() * self.mix_totals[-1]
+        for name, total in zip(self.mix_names, self.mix_totals):
+            if target < total:
+                return name
+        return self.mix_names[-1]
+
+    def value(self, arg):
+        '''Returns a value for an argument, by its type name.'''
+        type_name = arg['argTypeName']
+        if type_name in ('integer',):
+            return str(self.random.randint(0, 999))
+        if type_name == 'boolean':
+            return self.random.choice(('true', 'false'))
+        if type_name in ('color', 'float3', 'distance3', 'percent3', 'angle3'):
+            return ' '.join('%.4g' % self.random.uniform(0, 1) for i in range(3))
+        if arg['argType'] == 2 or type_name in ('float', 'distance', 'percent', 'angle'):
+            return '%.4g' % self.random.uniform(-100, 100)
+        if self.chance(self.long_value_rate):
+            # Long values, with spaces and now and then with double quotes
+            value = self.words(self.random.randint(8, 40))
+            if self.chance(0.5):
+                value = '%s "%s" %s' % (self.words(2), self.words(3), value)
+            return value
+        if type_name == '&item':
+            return '%s%d' % (self.random.choice(_words), self.random.randint(0, 99))
+        return self.random.choice(_words)
+
+    def comments(self):
+        if not self.chance(self.comment_rate):
+            return []
+        return ['%s.' % self.words(self.random.randint(3, 12)).capitalize()
+                for i in range(self.random.randint(1, 3))]
+
+    def meta(self):
+        meta = {}
+        if self.chance(self.meta_rate):
+            meta['row_color'] = self.random.choice(_colors)
+        return meta
+
+    def command(self):
+        name = self.pick_command()
+        args = []
+        named = self.chance(0.5)
+        for arg in self.schema[name]['args']:
+            # Optional trailing arguments are left out now and then
+            if args and self.chance(0.1):
+                break
+            args.append((arg['argName'] if named else None, self.value(arg)))
+
+        meta = self.meta()
+        if self.chance(self.button_rate):
+            meta['name'] = self.words(self.random.randint(1, 4)).title()
+
+        return {
+            'command': name,
+            'prefix': self.random.choice(('!', '!!', '+')) if self.chance(self.prefix_rate) else None,
+            'args': args,
+            'suppress': self.chance(self.suppress_rate),
+            'comments': self.comments(),
+            'meta': meta,
+        }
+
+    def generate(self, lines, depth=0):
+        '''
+        Generates a macro of `lines` commands, not counting block markers
+        and comments.
+
+        Args:
+            lines (int): number of commands
+            depth (int): block nesting depth of the commands
+
+        Returns:
+            list: commands and blocks
+        '''
+        nodes = []
+        count = 0
+        while count < lines:
+            if depth < self.max_depth and lines - count > 1 and self.chance(self.block_rate * (depth + 1)):
+                size = min(self.random.randint(2, 12), lines - count)
+                self.blocks += 1
+                nodes.append({
+                    'block': 'block%d' % self.blocks,
+                    'suppress': self.chance(self.suppress_rate),
+                    'comments': self.comments(),
+                    'meta': self.meta(),
+                    'children': self.generate(size, depth + 1),
+                })
+                count += size
+            else:
+                nodes.append(self.command())
+                count += 1
+        return nodes
+
+    @staticmethod
+    def command_string(node):
+        '''Renders a command and its arguments, quoting values like Replay.'''
+        result = (node['prefix'] or '') + node['command']
+        for name, value in node['args']:
+            if '"' in value:
+                value = '{%s}' % value
+            elif re.search(r'\W', value) and not re.match(r'^-?[\d.]+$', value):
+                value = '"%s"' % value
+            result += ' %s:%s' % (name, value) if name else ' %s' % value
+        return result
+
+    @staticmethod
+    def comment_lines(node):
+        lines = ['# ' + comment for comment in node['comments']]
+        for key in sorted(node['meta']):
+            lines.append('# replay %s:%s' % (key, json.dumps(node['meta'][key])))
+        return lines
+
+    def render_lines(self, nodes, python):
+        lines = []
+        for node in nodes:
+            suppress = '# ' if node['suppress'] else ''
+            lines.extend(self.comment_lines(node))
+            if node['suppress']:
+                lines.append('# replay suppress:')
+
+            if 'command' in node:
+                command = self.command_string(node)
+                if python:
+                    command = 'lx.eval(%s)' % repr(command)
+                lines.append(suppress + command)
+                continue
+
+            lines.append(suppress + '# Command Block Begin: %s' % node['block'])
+            for line in self.render_lines(node['children'], python):
+                lines.append(suppress + (line if line.startswith('#') else ' ' * 4 + line))
+            lines.append(suppress + '# Command Block End: %s' % node['block'])
+        return lines
+
+    def render_LXM(self, nodes):
+        '''
+        Renders a macro as LXM.
+
+        Args:
+            nodes (list): commands and blocks from `generate()`
+
+        Returns:
+            str: LXM macro
+        '''
+        header = ['#LXMacro#', '# Made with Replay', '# mechanicalcolor.com', '']
+        return '\n'.join(header + self.render_lines(nodes, False)) + '\n'
+
+    def render_Python(self, nodes):
+        '''
+        Renders a macro as a Python script of lx.eval calls.
+
+        Args:
+            nodes (list): commands and blocks from `generate()`
+
+        Returns:
+            str: python script
+        '''
+        header = ['# python', '# Made with Replay', '# mechanicalcolor.com', '']
+        return '\n'.join(header + self.render_lines(nodes, True)) + '\n'
+
+    def render_json_node(self, node):
+        comments = list(node['comments'])
+        for key in sorted(node['meta']):
+            comments.append('replay %s:%s' % (key, json.dumps(node['meta'][key])))
+
+        if 'block' in node:
+            return {'command block': {
+                'name': node['block'],
+                'suppress': node['suppress'],
+                'comment': comments,
+                'commands': [self.render_json_node(child) for child in node['children']],
+            }}
+
+        schema_args = self.schema[node['command']]['args']
+        values = [None] * len(schema_args)
+        names = [arg['argName'] for arg in schema_args]
+        position = 0
+        for name, value in node['args']:
+            position = names.index(name) if name else position
+            values[position] = value
+            position += 1
+
+        args = []
+        for arg, value in zip(schema_args, values):
+            arg = dict((key, arg[key]) for key in (
+                'argName', 'argUsername', 'argType', 'argTypeName', 'argDesc', 'argExample'))
+            arg['argUsername'] = '%s \x03(c:4113)(%s)' % (arg['argUsername'], arg['argName'])
+            arg['value'] = value
+            args.append(arg)
+
+        return {'command': {
+            'name': node['command'],
+            'prefix': node['prefix'],
+            'suppress': node['suppress'],
+            'comment': comments,
+            'args': args,
+        }}
+
+    def render_json(self, nodes):
+        '''
+        Renders a macro as Replay's json.
+
+        Args:
+            nodes (list): commands and blocks from `generate()`
+
+        Returns:
+            str: json macro
+        '''
+        return json.dumps([self.render_json_node(node) for node in nodes], indent=4)
+
+    def render(self, nodes, format_name):
+        '''
+        Renders a macro in a format: lxm, py or json.
+
+        Args:
+            nodes (list): commands and blocks from `generate()`
+            format_name (str): lxm, py or json
+
+        Returns:
+            str: macro
+        '''
+        renderers = {'lxm': self.render_LXM, 'py': self.render_Python, 'json': self.render_json}
+        return renderers[format_name](nodes)
+
+
+def generate(lines, format_name='lxm', seed=0, schema=None, **kwargs):
+    '''
+    Generates and renders a macro.
+
+    Args:
+        lines (int): number of commands
+        format_name (str): lxm, py or json
+        seed (int): random seed
+        schema (dict): command schemas, from headless/schema.json by default
+        \**kwargs: CorpusGenerator options
+
+    Returns:
+        str: macro
+    '''
+    generator = CorpusGenerator(schema or load_schema(), seed=seed, **kwargs)
+    return generator.render(generator.generate(lines), format_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('output', help='file to write, or a folder for one file per format')
+    parser.add_argument('--lines', type=int, default=10000)
+    parser.add_argument('--format', choices=('lxm', 'py', 'json', 'all'), default='lxm')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mix', default='', help='command=weight pairs, every schema command equally by default')
+    parser.add_argument('--schema', default=None)
+    parser.add_argument('--blocks', type=float, default=0.02)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--suppress', type=float, default=0.05)
+    parser.add_argument('--meta', type=float, default=0.05)
+    parser.add_argument('--buttons', type=float, default=0.03)
+    parser.add_argument('--comments', type=float, default=0.05)
+    parser.add_argument('--long-values', type=float, default=0.05)
+    parser.add_argument('--prefixes', type=float, default=0.05)
+    options = parser.parse_args()
+
+    generator = CorpusGenerator(
+        load_schema(options.schema), mix=parse_mix(options.mix), seed=options.seed,
+        block_rate=options.blocks, max_depth=options.depth,
+        suppress_rate=options.suppress, meta_rate=options.meta,
+        button_rate=options.buttons, comment_rate=options.comments,
+        long_value_rate=options.long_values, prefix_rate=options.prefixes)
+    nodes = generator.generate(options.lines)
+
+    if options.format == 'all':
+        if not os.path.isdir(options.output):
+            os.makedirs(options.output)
+        outputs = [(format_name, os.path.join(options.output, 'corpus%d.%s' % (options.lines, format_name)))
+                   for format_name in ('lxm', 'py', 'json')]
+    else:
+        outputs = [(options.format, options.output)]
+
+    for format_name, path in outputs:
+        with open(path, 'w') as output_file:
+            output_file.write(generator.render(nodes, format_name))
+        print('%s: %d commands, %d blocks' % (path, options.lines, generator.blocks))
+
+
+if __name__ == '__main__':
+    main()
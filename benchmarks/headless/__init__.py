@@ -0,0 +1,299 @@
+# python
+'''
+Headless stand-in for the MODO python API (lx, lxu, lxifc and modo), so
+that Replay can be run and benchmarked outside of MODO.
+
+Command schemas are answered from schema.json, a snapshot recorded in MODO
+with record_schema.py. Replay's own commands, notifiers and servers are
+blessed by importing lxserv as usual, and then run through `lx.eval()`.
+
+Usage:
+    import headless
+    headless.install()
+    headless.load_servers()
+    lx.eval('replay.fileOpen {%s}' % path)
+'''
+import os
+import sys
+import tempfile
+
+import lx
+import lxifc
+import lxu
+import mesh
+import modo
+
+# Number of lx.eval / lx.evalN calls answered, by kind
+calls = lx.calls
+
+# Contents of the system clipboard
+clipboard = ['']
+
+_kit = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.json')
+
+
+def install(schema_path=None):
+    '''
+    Registers the stand-in modules in sys.modules, loads the schema
+    snapshot and the kit's Configs, and puts the kit on sys.path. Must run
+    before `import replay`.
+
+    Args:
+        schema_path (str): schema snapshot, schema.json by default
+
+    Returns:
+        None
+    '''
+    sys.modules.update({
+        'lx': lx,
+        'lx.object': lx.object,
+        'lx.service': lx.service,
+        'lx.result': lx.result,
+        'lxifc': lxifc,
+        'lxu': lxu,
+        'lxu.command': lxu.command,
+        'modo': modo,
+    })
+
+    lx.load_schema(schema_path or _schema_path)
+    lx.load_configs(os.path.join(_kit, 'Configs'))
+
+    scripts = tempfile.mkdtemp(prefix='replay_scripts_')
+    lx.aliases.update({
+        'kit_mecco_replay:': _kit,
+        'scripts:': scripts,
+    })
+    lx.paths.update({
+        'user': scripts,
+        'temp': tempfile.gettempdir(),
+    })
+
+    for path in (os.path.join(_kit, 'Lib'), _kit):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    # The system clipboard may not exist, e.g. without a display
+    import pyperclip
+    pyperclip.copy = _copy
+    pyperclip.paste = _paste
+
+    calls.clear()
+
+
+def _copy(text):
+    # Text on MODO's clipboard has Windows line ends, whatever python wrote
+    clipboard[0] = text.replace('\r\n', '\n').replace('\n', '\r\n')
+
+
+def _paste():
+    return clipboard[0]
+
+
+def load_servers():
+    '''
+    Imports every plugin in the kit's lxserv folder, blessing Replay's
+    commands and servers.
+
+    Args:
+        None
+
+    Returns:
+        list: names of the plugins that could not be imported
+    '''
+    lxserv = os.path.join(_kit, 'lxserv')
+    if lxserv not in sys.path:
+        sys.path.insert(0, lxserv)
+
+    skipped = []
+    for name in sorted(os.listdir(lxserv)):
+        name, extension = os.path.splitext(name)
+        if extension != '.py':
+            continue
+        try:
+            __import__(name)
+        except ImportError:
+            skipped.append(name)
+    return skipped
+
+
+def reset():
+    '''
+    Clears the undo and redo stacks, idle visitors, executed commands and
+    call counts.
+
+    Args:
+        None
+
+    Returns:
+        None
+    '''
+    del lx.service.undo_stack[:]
+    del lx.service.redo_stack[:]
+    del lx.service.idle_visitors[:]
+    del lx.executed[:]
+    del lx.output[:]
+    calls.clear()
+
+
+def undo():
+    '''
+    Undoes the last recorded action.
+
+    Args:
+        None
+
+    Returns:
+        bool: False if there was nothing to undo
+    '''
+    if not lx.service.undo_stack:
+        return False
+    action = lx.service.undo_stack.pop()
+    action.undo_Reverse()
+    lx.service.redo_stack.append(action)
+    return True
+
+
+def redo():
+    '''
+    Redoes the last undone action.
+
+    Args:
+        None
+
+    Returns:
+        bool: False if there was nothing to redo
+    '''
+    if not lx.service.redo_stack:
+        return False
+    action = lx.service.redo_stack.pop()
+    action.undo_Forward()
+    lx.service.undo_stack.append(action)
+    return True
+
+
+def idle():
+    '''
+    Runs the visitors queued with DoWhenUserIsIdle, as MODO does once the
+    command stack is empty.
+
+    Args:
+        None
+
+    Returns:
+        int: number of visitors run
+    '''
+    count = 0
+    while lx.service.idle_visitors:
+        lx.service.idle_visitors.pop(0).vis_Evaluate()
+        count += 1
+    return count
+
+
+class _Client(object):
+    '''Notifier client counting the events it receives.'''
+    def __init__(self):
+        self.events = 0
+
+    def __peekobj__(self):
+        return self
+
+    def cevt_Event(self, flags):
+        self.events += 1
+
+    Event = cevt_Event
+
+
+def listen(notifier_name):
+    '''
+    Adds a client to a blessed notifier.
+
+    Args:
+        notifier_name (str): notifier server name
+
+    Returns:
+        object: client, with the number of events received in `events`
+    '''
+    client = _Client()
+    lx.service.NotifySys().Spawn(notifier_name, '').AddClient(client)
+    return client
+
+
+def bless_macro():
+    '''
+    Blesses the Replay treeview the same way lxserv/replay_treeBless.py does.
+
+    Args:
+        None
+
+    Returns:
+        replay.Macro: macro singleton
+    '''
+    import replay
+    replay.Macro().bless(
+        viewport_type='vpapplication',
+        nice_name='Replay',
+        internal_name='ReplayTreeview',
+        ident='RPLY',
+        column_definitions={
+            'primary_position': 1,
+            'list': [
+                {'name': 'name', 'width': 400},
+                {'name': 'enable', 'width': 20},
+                {'name': 'prefix', 'width': 20},
+                {'name': 'command', 'width': -1}
+            ]
+        },
+        input_regions=[
+            '(anywhere)',
+            'MacroCommandEnable',
+            'MacroCommandPrefix',
+            'MacroCommandCommand',
+            'MacroCommandArg',
+            'MacroCommandBlock'
+        ],
+        notifiers=[]
+    )
+    return replay.Macro()
+
+
+def synthetic_lxm(lines):
+    '''
+    Returns a macro of roughly `lines` commands as an LXM string. Every tenth
+    line is suppressed and every hundredth line opens a block of five commands.
+
+    Args:
+        lines (int): number of commands
+
+    Returns:
+        str: LXM macro
+    '''
+    templates = [
+        'select.type polygon',
+        'tool.set preset:"prim.cube" mode:on',
+        'tool.attr prim.cube sizeX 0.5',
+        'tool.doApply',
+        'item.name name:"Cube {0}" type:mesh',
+        'transform.channel name:pos.X value:{0}.5',
+        'select.element layer:1 type:polygon mode:add index:{0}',
+        '!mesh.cleanup true true true false true true true false true',
+        'poly.triple',
+        'view3d.wireframeOverlay mode:colored',
+    ]
+    result = ['#LXMacro#']
+    n = 0
+    while n < lines:
+        if n % 100 == 50:
+            result.append('# Command Block Begin: block%d' % n)
+            for i in range(5):
+                result.append('    ' + templates[(n + i) % len(templates)].format(n + i))
+            result.append('# Command Block End: block%d' % n)
+            n += 5
+            continue
+        if n % 10 == 9:
+            result.append('# replay suppress:')
+            result.append('# ' + templates[n % len(templates)].format(n))
+        else:
+            result.append(templates[n % len(templates)].format(n))
+        n += 1
+    return '\n'.join(result) + '\n'
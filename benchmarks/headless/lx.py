@@ -0,0 +1,397 @@
+# python
+'''
+Stand-in for MODO's `lx` module.
+
+`eval()` answers the commandservice, platformservice and messageservice
+queries Replay makes and reads and writes user values. It also runs the
+commands blessed with `bless()` the way MODO does: it creates the command
+object, sets its arguments, and then executes or queries it. Any other
+command is recorded in `executed` and returns None, or raises if `strict`
+is set, as it would in MODO for a command that doesn't exist.
+
+Command schemas come from the snapshot loaded by `load_schema()`. Blessed
+commands describe themselves through their `dyna_Add()` arguments.
+'''
+import os
+import re
+import json
+
+# Command schemas by command name, as recorded in schema.json
+schema = {}
+
+# Server classes by name, from bless()
+servers = {}
+
+# User values by name, and their types ('integer', 'boolean', 'string', ...)
+user_values = {}
+user_value_types = {}
+
+# Message templates by (table, message id)
+messages = {}
+
+# Paths of platformservice aliases, e.g. 'scripts:', and of path.path names
+aliases = {}
+paths = {}
+
+# Number of lx.eval / lx.evalN calls answered, by kind
+calls = {}
+
+# Commands run through lx.eval that have no server, in order
+executed = []
+
+# Lines written with lx.out, in order
+output = []
+
+# Raise for commands that neither have a server nor a schema
+strict = False
+
+# Interface type of an argument, by type name. Anything else is a string.
+_type_ids = {
+    'integer': 1, 'boolean': 1,
+    'float': 2, 'distance': 2, 'percent': 2, 'angle': 2, 'time': 2,
+    'light': 2, 'mass': 2, 'speed': 2, 'force': 2, 'acceleration': 2,
+    'axis': 2, 'uvcoord': 2, 'color1': 2,
+    'value': 0,
+}
+
+
+def _count(kind):
+    calls[kind] = calls.get(kind, 0) + 1
+
+
+class _Symbols(object):
+    '''lx.symbol constants. Type names resolve to the names MODO uses, e.g.
+    sTYPE_STRING is 'string'; other unknown constants resolve to their own
+    name.'''
+    e_FAILED = 0x80000001
+    e_NOTFOUND = 0x80000003
+    iUNDO_INVALID = 0
+    iUNDO_ACTIVE = 1
+    iTREE_PARENT = 0
+    iTREE_CHILD = 1
+    iTREE_ROOT = 2
+    iTREEVIEW_SELECT_PRIMARY = 0
+    iTREEVIEW_SELECT_ADD = 1
+    iTREEVIEW_SELECT_REMOVE = 2
+    iTREEVIEW_SELECT_CLEAR = 3
+    i_TYPE_OBJECT = 0
+    i_TYPE_INTEGER = 1
+    i_TYPE_FLOAT = 2
+    i_TYPE_STRING = 3
+    fCMD_MODEL = 0x01
+    fCMD_UNDO = 0x04
+    fCMD_UI = 0x10
+    fCMD_QUIET = 0x80
+    fCMDARG_OPTIONAL = 0x0008
+    fCMDARG_QUERY = 0x0010
+    fCMDARG_HIDDEN = 0x0020
+    fCMDARG_VARIABLE = 0x0040
+    fCMDARG_REQFORVARIABLE = 0x0080
+    fCMDARG_VALUE_SET = 0x1000
+    fCMDNOTIFY_VALUE = 0x01
+    fCMDNOTIFY_CHANGE_ALL = 0x04
+    fVALHINT_POPUPS = 0x01
+    fVALHINT_FORM_COMMAND_LIST = 0x08
+    fUSERIDLE_CMD_STACK_EMPTY = 0x01
+    f_LAYERSCAN_ACTIVE = 0x01
+    f_LAYERSCAN_MARKPOLYS = 0x40
+    f_LAYERSCAN_EDIT = 0x0F
+    sMARK_SELECT = 'select'
+    sMARK_HIDE = 'hide'
+    sMARK_LOCK = 'lock'
+    sMARK_USER_0 = 'user0'
+    i_POLYTAG_MATERIAL = 0x4D415452
+
+    def __getattr__(self, name):
+        if name.startswith('sTYPE_'):
+            return name[len('sTYPE_'):].lower()
+        return name
+
+
+symbol = _Symbols()
+
+
+class _Result(object):
+    OK = 0
+    NOTFOUND = symbol.e_NOTFOUND
+
+
+result = _Result()
+
+
+def out(*args):
+    output.append(' '.join(str(arg) for arg in args))
+
+
+def notimpl():
+    raise NotImplementedError()
+
+
+def bless(server, name, tags=None):
+    '''Registers a server class under a name, as MODO does.'''
+    servers[name] = server
+
+
+def split_args(args_string):
+    '''
+    Splits a command's argument string into (name, value) tuples. Values
+    may be quoted with "", '' or {}, and braces nest.
+    '''
+    args = []
+    position = 0
+    length = len(args_string)
+    while position < length:
+        while position < length and args_string[position].isspace():
+            position += 1
+        if position >= length:
+            break
+
+        name = None
+        match = re.match(r'([\w.]+):(?=\S)', args_string[position:])
+        if match is not None:
+            name = match.group(1)
+            position += len(match.group(0))
+
+        opener = args_string[position]
+        if opener in '"\'':
+            end = args_string.find(opener, position + 1)
+            end = length if end < 0 else end
+            value = args_string[position + 1:end]
+            position = end + 1
+        elif opener == '{':
+            depth = 0
+            end = position
+            while end < length:
+                if args_string[end] == '{':
+                    depth += 1
+                elif args_string[end] == '}':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                end += 1
+            value = args_string[position + 1:end]
+            position = end + 1
+        else:
+            end = position
+            while end < length and not args_string[end].isspace():
+                end += 1
+            value = args_string[position:end]
+            position = end
+
+        args.append((name, value))
+    return args
+
+
+def command_schema(name):
+    '''
+    Returns the schema of a command: the recorded snapshot's entry, or one
+    built from a blessed command's arguments. None for unknown commands.
+    '''
+    if name in schema:
+        return schema[name]
+
+    server = servers.get(name)
+    if server is None or not hasattr(server, 'dyna_Add'):
+        return None
+
+    command = server()
+    args = []
+    for arg in command._headless_args:
+        args.append({
+            'argName': arg.name,
+            'argUsername': arg.name.replace('_', ' ').title(),
+            'argType': _type_ids.get(arg.datatype, 3),
+            'argTypeName': arg.datatype,
+            'argDesc': '',
+            'argExample': '',
+            'argFlags': [],
+        })
+    return {'username': name, 'buttonName': name, 'args': args}
+
+
+def _query_commandservice(term, name):
+    _count('commandservice')
+    command = command_schema(name)
+    if command is None:
+        raise RuntimeError('Unknown command %s' % name)
+
+    columns = ('argNames', 'argUsernames', 'argTypes', 'argTypeNames', 'argDescs', 'argExamples')
+    if term in columns:
+        key = term[:-1]
+        return [arg.get(key, '') for arg in command['args']]
+    if term in ('username', 'buttonName'):
+        return command.get(term, name)
+    return ''
+
+
+def _query_messageservice(term, argument):
+    _count('messageservice')
+    match = re.match(r'^@([^@]*)@@([^@]*)@(.*)$', argument, re.S)
+    if match is None:
+        return argument
+    table, message_id, rest = match.groups()
+
+    template = messages.get((table, message_id), message_id)
+    if term == 'msgcompose':
+        values = [value for name, value in split_args(rest)]
+
+        def replace(match):
+            index = int(match.group(1)) - 1
+            return values[index] if 0 <= index < len(values) else match.group(0)
+        return re.sub(r'%(\d+)', replace, template)
+    return template
+
+
+def _user_value(name, value):
+    _count('uservalue')
+    if value == '?':
+        return user_values.get(name)
+
+    value_type = user_value_types.get(name, 'string')
+    if value == '' and value_type != 'string':
+        value = '0'
+    if value_type in ('integer', 'boolean'):
+        value = int({'true': 1, 'false': 0}.get(value.lower(), value))
+    elif value_type in ('float', 'distance', 'percent'):
+        value = float(value)
+    user_values[name] = value
+    return None
+
+
+def _run_server(name, args_string):
+    _count('command')
+    command = servers[name]()
+    arg_names = [arg.name for arg in command._headless_args]
+
+    query_index = None
+    position = 0
+    for arg_name, value in split_args(args_string):
+        if arg_name is not None:
+            if arg_name not in arg_names:
+                raise RuntimeError('Unknown argument %s of %s' % (arg_name, name))
+            index = arg_names.index(arg_name)
+        else:
+            index = position
+        position = index + 1
+        if index >= len(arg_names):
+            raise RuntimeError('Too many arguments for %s' % name)
+        if value == '?':
+            query_index = index
+        else:
+            command._headless_args[index].value = value
+
+    if query_index is not None:
+        query = object.ValueArray()
+        command.cmd_Query(query_index, query)
+        return query.values[0] if query.values else None
+
+    if not command.basic_Enable(None):
+        raise RuntimeError('Command %s is disabled' % name)
+    command.basic_Execute(None, 0)
+    return None
+
+
+def eval(command):
+    '''Runs a command or query the way MODO's lx.eval does.'''
+    command = command.strip()
+
+    match = re.match(r'^query commandservice command\.(\w+) \? \{(.*)\}$', command)
+    if match:
+        return _query_commandservice(*match.groups())
+
+    if command == 'query commandservice commands ?':
+        _count('commandservice')
+        return sorted(set(schema) | set(servers))
+
+    match = re.match(r'^query platformservice (alias|path\.path) \? \{?([^}]*)\}?$', command)
+    if match:
+        _count('platformservice')
+        kind, name = match.groups()
+        if kind == 'alias':
+            return aliases.get(name, name)
+        return paths.get(name)
+
+    match = re.match(r'^query messageservice (msgfind|msgcompose) \? \{(.*)\}$', command, re.S)
+    if match:
+        return _query_messageservice(*match.groups())
+
+    match = re.match(r'^user\.value (\S+) (.*)$', command)
+    if match:
+        name, value = match.groups()
+        values = split_args(value)
+        return _user_value(name, values[0][1] if values else '')
+
+    match = re.match(r'^([!?+]*)(\S+)(.*)$', command, re.S)
+    if match and match.group(2) in servers:
+        return _run_server(match.group(2), match.group(3))
+
+    if match and match.group(2) not in schema and strict:
+        raise RuntimeError('Unknown command %s' % command)
+
+    _count('other')
+    executed.append(command)
+    return None
+
+
+def eval1(command):
+    return eval(command)
+
+
+def evalN(command):
+    value = eval(command)
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def load_schema(path):
+    '''Loads a schema snapshot written by record_schema.py.'''
+    with open(path) as schema_file:
+        snapshot = json.load(schema_file)
+    schema.clear()
+    for name, command in snapshot['commands'].items():
+        schema[str(name)] = _strings(command)
+
+
+def _strings(value):
+    # json gives unicode, MODO's python API gives str
+    if isinstance(value, dict):
+        return dict((_strings(key), _strings(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [_strings(item) for item in value]
+    if isinstance(value, type(u'')):
+        return value.encode('utf-8')
+    return value
+
+
+def load_configs(configs_path):
+    '''Loads message tables and user value defaults from a kit's Configs.'''
+    import xml.etree.ElementTree as ElementTree
+
+    messages_path = os.path.join(configs_path, 'messages.cfg')
+    if os.path.exists(messages_path):
+        for table in ElementTree.parse(messages_path).getroot().iter('hash'):
+            if table.get('type') != 'Table':
+                continue
+            table_name = table.get('key').split('.')[0]
+            for message in table:
+                if message.get('type') == 'T':
+                    messages.setdefault((table_name, message.get('key')), message.text or '')
+
+    preferences_path = os.path.join(configs_path, 'preferences.cfg')
+    if os.path.exists(preferences_path):
+        for element in ElementTree.parse(preferences_path).getroot().iter('hash'):
+            name = element.get('key')
+            if element.get('type') == 'Definition':
+                value_type = element.find('atom')
+                user_value_types[name] = value_type.text if value_type is not None else 'string'
+        for element in ElementTree.parse(preferences_path).getroot().iter('hash'):
+            if element.get('type') == 'RawValue':
+                _user_value(element.get('key'), element.text or '')
+
+
+# lx.service and lx.object
+import lx_service as service
+import lx_object as object
@@ -0,0 +1,182 @@
+# python
+'''
+Stand-in for `lx.object`: wrappers around python servers, ValueArray, and
+the command and attributes objects returned by `lx.service.Command()`.
+'''
+import lx
+
+
+class _Wrapper(object):
+    '''
+    Base for lx.object wrappers around python server objects. Forwards
+    `Method(...)` to the server's `<prefix>_Method(...)`, the way MODO calls
+    into lxifc implementations.
+    '''
+    _prefix = None
+
+    def __init__(self, impl=None):
+        if isinstance(impl, _Wrapper):
+            impl = impl._impl
+        self._impl = impl
+
+    def __getattr__(self, name):
+        return getattr(self._impl, '%s_%s' % (self._prefix, name))
+
+    def test(self):
+        return self._impl is not None
+
+    def set(self, impl):
+        self.__init__(impl)
+
+
+class Tree(_Wrapper):
+    _prefix = 'tree'
+
+
+class TreeView(_Wrapper):
+    _prefix = 'treeview'
+
+
+class StringTag(_Wrapper):
+    _prefix = 'stag'
+
+
+class _ServerAttributes(_Wrapper):
+    _prefix = 'attr'
+
+
+def Attributes(impl=None):
+    '''Attributes of a spawned command, or a wrapper around a server.'''
+    if isinstance(impl, Command):
+        return impl.attributes
+    return _ServerAttributes(impl)
+
+
+def _passthrough(impl=None):
+    return impl
+
+
+# Objects MODO hands to servers; the stand-in passes its own through
+CommandEvent = _passthrough
+TreeListener = _passthrough
+
+
+class AddDropAction(object):
+    def __init__(self):
+        self.actions = []
+
+    def set(self, impl):
+        self.actions = impl.actions if isinstance(impl, AddDropAction) else self.actions
+
+    def AddAction(self, action, name):
+        self.actions.append((action, name))
+
+
+class ValueArray(object):
+    '''
+    List of values. `set()` shares the values of another array, as wrapping
+    the same COM object does in MODO.
+    '''
+    def __init__(self, values=None):
+        self.values = values if values is not None else []
+
+    def set(self, other):
+        self.values = other.values if isinstance(other, ValueArray) else list(other)
+
+    def test(self):
+        return True
+
+    def Count(self):
+        return len(self.values)
+
+    def AddString(self, value):
+        self.values.append(str(value))
+
+    def AddInt(self, value):
+        self.values.append(int(value))
+
+    def AddFloat(self, value):
+        self.values.append(float(value))
+
+    def AddValue(self, value):
+        self.values.append(value)
+
+    def GetString(self, index):
+        return str(self.values[index])
+
+    def GetInt(self, index):
+        return int(self.values[index])
+
+    def GetFloat(self, index):
+        return float(self.values[index])
+
+
+class _CommandAttributes(object):
+    '''Argument attributes of a spawned command.'''
+    def __init__(self, command):
+        self.command = command
+
+    def Count(self):
+        return len(self.command.args)
+
+    def Name(self, index):
+        return self.command.args[index]['argName']
+
+    def Type(self, index):
+        return self.command.args[index]['argType']
+
+    def TypeName(self, index):
+        return self.command.args[index]['argTypeName']
+
+    def GetString(self, index):
+        value = self.command.values[index]
+        if value is None:
+            raise LookupError('Argument %d is not set' % index)
+        return value
+
+    def GetInt(self, index):
+        value = self.GetString(index)
+        return int({'true': 1, 'false': 0, 'on': 1, 'off': 0}.get(value.lower(), value))
+
+    def GetFlt(self, index):
+        return float(self.GetString(index))
+
+    def Hints(self, index):
+        return [tuple(hint) for hint in self.command.args[index].get('argHints', [])]
+
+
+class Command(object):
+    '''
+    A command spawned from the schema, with the argument values parsed from
+    its string. `Command(other)` returns the command itself, as wrapping
+    does in MODO.
+    '''
+    def __new__(cls, name=None, values=None):
+        if isinstance(name, Command):
+            return name
+        return super(Command, cls).__new__(cls)
+
+    def __init__(self, name=None, values=None):
+        if isinstance(name, Command):
+            return
+        self.name = name
+        self.args = lx.command_schema(name)['args']
+        self.values = values if values is not None else [None] * len(self.args)
+        self.attributes = _CommandAttributes(self)
+
+    def test(self):
+        return True
+
+    def Name(self):
+        return self.name
+
+    def ArgFlags(self, index):
+        flags = 0
+        for flag in self.args[index].get('argFlags', []):
+            flags |= getattr(lx.symbol, 'fCMDARG_' + flag.upper())
+        if self.values[index] is not None:
+            flags |= lx.symbol.fCMDARG_VALUE_SET
+        return flags
+
+    def PostExecBehaviorFlags(self):
+        return 0
@@ -0,0 +1,114 @@
+# python
+'''
+Stand-in for `lx.service`. Undo records its actions on `undo_stack`,
+Listener keeps `listeners`, and Platform queues idle visitors on
+`idle_visitors`; the headless package steps through them.
+'''
+import re
+import lx
+
+undo_stack = []
+redo_stack = []
+listeners = []
+idle_visitors = []
+
+
+class Undo(object):
+    def State(self):
+        return lx.symbol.iUNDO_ACTIVE
+
+    def Apply(self, undo):
+        '''Performs an action and adds it to the undo stack.'''
+        undo.undo_Forward()
+        self.Record(undo)
+
+    def Record(self, undo):
+        '''Adds an action that has already been performed.'''
+        undo_stack.append(undo)
+        del redo_stack[:]
+
+
+class Listener(object):
+    def AddListener(self, listener):
+        listeners.append(listener)
+
+    def RemoveListener(self, listener):
+        if listener in listeners:
+            listeners.remove(listener)
+
+
+class Platform(object):
+    def DoWhenUserIsIdle(self, visitor, flags):
+        idle_visitors.append(visitor)
+
+    def IsHeadless(self):
+        return True
+
+
+class Host(object):
+    def NumServers(self, class_name):
+        if class_name == 'command':
+            return len(set(lx.schema) | set(lx.servers))
+        return len(lx.servers)
+
+
+class _Notifier(object):
+    '''A spawned notifier: forwards clients to the blessed server.'''
+    def __init__(self, server):
+        self.server = server
+
+    def AddClient(self, client):
+        if self.server is not None:
+            self.server.noti_AddClient(client)
+
+    def RemoveClient(self, client):
+        if self.server is not None:
+            self.server.noti_RemoveClient(client)
+
+
+class NotifySys(object):
+    _spawned = {}
+
+    def Spawn(self, name, args):
+        if name not in self._spawned:
+            server = lx.servers.get(name)
+            self._spawned[name] = _Notifier(server() if server is not None else None)
+        return self._spawned[name]
+
+
+class Command(object):
+    def Spawn(self, flags, name):
+        '''Spawns a command without argument values.'''
+        if lx.command_schema(name) is None:
+            raise LookupError('Unknown command %s' % name)
+        return lx.object.Command(name)
+
+    def SpawnFromString(self, string):
+        '''Spawns a command with the argument values of a command string.
+        Returns (exec flags, query index, command) like MODO.'''
+        match = re.match(r'^([!?+]*)(\S+)(.*)$', string.strip(), re.S)
+        if match is None or lx.command_schema(match.group(2)) is None:
+            raise LookupError('Unknown command %s' % string)
+
+        command = lx.object.Command(match.group(2))
+        names = [arg['argName'] for arg in command.args]
+        position = 0
+        for name, value in lx.split_args(match.group(3)):
+            if name is not None:
+                if name not in names:
+                    raise LookupError('Unknown argument %s' % name)
+                index = names.index(name)
+            else:
+                index = position
+            if index >= len(names):
+                raise LookupError('Too many arguments: %s' % string)
+            if value != '?':
+                command.values[index] = value
+            position = index + 1
+        return 0, -1, command
+
+    def ExecFlagsAsPrefixString(self, flags):
+        return ''
+
+    def CreateQueryObject(self, type_name):
+        return lx.object.ValueArray()
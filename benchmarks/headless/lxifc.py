@@ -0,0 +1,45 @@
+# python
+'''
+Stand-in for `lxifc`: empty base classes for the interfaces Replay's
+servers implement.
+'''
+
+
+class TreeView(object):
+    pass
+
+
+class Tree(object):
+    pass
+
+
+class ListenerPort(object):
+    pass
+
+
+class Attributes(object):
+    pass
+
+
+class Drop(object):
+    pass
+
+
+class Notifier(object):
+    pass
+
+
+class Undo(object):
+    pass
+
+
+class UIValueHints(object):
+    pass
+
+
+class Visitor(object):
+    pass
+
+
+class CmdSysListener(object):
+    pass
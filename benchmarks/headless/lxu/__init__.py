@@ -0,0 +1,5 @@
+# python
+'''
+Stand-in for `lxu`. Only `lxu.command` is provided.
+'''
+import command
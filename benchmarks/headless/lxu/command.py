@@ -0,0 +1,70 @@
+# python
+'''
+Stand-in for `lxu.command`: BasicCommand keeps its arguments' values so
+that `lx.eval()` can set them and commands can read them back.
+'''
+from .. import lx
+
+
+class _Argument(object):
+    __slots__ = ('name', 'datatype', 'flags', 'value')
+
+    def __init__(self, name, datatype):
+        self.name = name
+        self.datatype = datatype
+        self.flags = 0
+        self.value = None
+
+
+class BasicCommand(object):
+    def __init__(self):
+        self._headless_args = []
+
+    def dyna_Add(self, name, datatype):
+        self._headless_args.append(_Argument(name, datatype))
+
+    def basic_SetFlags(self, index, flags):
+        self._headless_args[index].flags = flags
+
+    def dyna_IsSet(self, index):
+        return self._headless_args[index].value is not None
+
+    def dyna_String(self, index, default=''):
+        value = self._headless_args[index].value
+        return default if value is None else str(value)
+
+    def dyna_Int(self, index, default=0):
+        value = self._headless_args[index].value
+        if value is None:
+            return default
+        if isinstance(value, basestring):
+            value = {'true': 1, 'false': 0, 'on': 1, 'off': 0}.get(value.lower(), value)
+        return int(value)
+
+    def dyna_Float(self, index, default=0.0):
+        value = self._headless_args[index].value
+        return default if value is None else float(value)
+
+    def dyna_Bool(self, index, default=False):
+        return bool(self.dyna_Int(index, int(default)))
+
+    def attr_SetString(self, index, value):
+        self._headless_args[index].value = str(value)
+
+    def attr_SetInt(self, index, value):
+        self._headless_args[index].value = int(value)
+
+    def attr_SetFlt(self, index, value):
+        self._headless_args[index].value = float(value)
+
+    def basic_Enable(self, msg):
+        return True
+
+    def basic_Execute(self, msg, flags):
+        pass
+
+    def cmd_Flags(self):
+        return 0
+
+    def cmd_Query(self, index, vaQuery):
+        return lx.result.OK
@@ -0,0 +1,204 @@
+# python
+'''
+Stub mesh with the accessors commander.MeshEditor uses: Polygon, Point and
+Edge, StringTag through the polygon accessor, and mark modes from
+`MeshService.ModeCompose()`. IDs differ from indices, as they do in MODO.
+
+Usage:
+    mesh = headless.mesh.grid(islands=4, width=100, height=100)
+    editor = replay.commander.MeshEditorClass()
+    mesh.attach(editor)
+    editor.get_selected_polys()
+'''
+import random
+
+import lx
+
+_POLY_ID = 0x10000000
+_POINT_ID = 0x20000000
+
+
+class MeshService(object):
+    def ModeCompose(self, set_marks, clear_marks):
+        return (frozenset((set_marks or '').split()), frozenset((clear_marks or '').split()))
+
+
+class _Accessor(object):
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.index = -1
+        # Every call into the accessor, the way each one crosses into MODO
+        self.calls = 0
+
+    def test(self):
+        return True
+
+
+class Polygon(_Accessor):
+    def SelectByIndex(self, index):
+        self.calls += 1
+        self.index = index
+
+    def Select(self, polygon_id):
+        self.calls += 1
+        self.index = (polygon_id - _POLY_ID) // 8
+
+    def ID(self):
+        self.calls += 1
+        return _POLY_ID + self.index * 8
+
+    def Index(self):
+        self.calls += 1
+        return self.index
+
+    def VertexCount(self):
+        self.calls += 1
+        return len(self.mesh.polygons[self.index])
+
+    def VertexByIndex(self, index):
+        self.calls += 1
+        return _POINT_ID + self.mesh.polygons[self.index][index] * 8
+
+    def TestMarks(self, mode):
+        self.calls += 1
+        return self.mesh.test_marks(self.index, mode)
+
+    def SetMarks(self, mode):
+        self.calls += 1
+        self.mesh.marks[self.index] = (self.mesh.marks[self.index] | mode[0]) - mode[1]
+
+    def Enumerate(self, mode, visitor, monitor):
+        self.calls += 1
+        for index in range(len(self.mesh.polygons)):
+            self.index = index
+            if self.mesh.test_marks(index, mode):
+                visitor.vis_Evaluate()
+
+    def stag_Get(self, tag_type):
+        self.calls += 1
+        return self.mesh.tags[self.index].get(tag_type)
+
+
+class Point(_Accessor):
+    def Select(self, point_id):
+        self.calls += 1
+        self.index = (point_id - _POINT_ID) // 8
+
+    def PolygonCount(self):
+        self.calls += 1
+        return len(self.mesh.point_polygons[self.index])
+
+    def PolygonByIndex(self, index):
+        self.calls += 1
+        return _POLY_ID + self.mesh.point_polygons[self.index][index] * 8
+
+
+class Edge(_Accessor):
+    def __init__(self, mesh):
+        _Accessor.__init__(self, mesh)
+        self.polygons = []
+
+    def SelectEndpoints(self, point_a, point_b):
+        self.calls += 1
+        a = (point_a - _POINT_ID) // 8
+        b = (point_b - _POINT_ID) // 8
+        self.polygons = sorted(set(self.mesh.point_polygons[a]) & set(self.mesh.point_polygons[b]))
+
+    def test(self):
+        return bool(self.polygons)
+
+    def PolygonCount(self):
+        self.calls += 1
+        return len(self.polygons)
+
+    def PolygonByIndex(self, index):
+        self.calls += 1
+        return _POLY_ID + self.polygons[index] * 8
+
+
+class Mesh(object):
+    '''
+    A mesh from point index lists.
+
+    Args:
+        polygons (list): point indices of each polygon
+        marks (list): set of mark names of each polygon, e.g. {'select'}
+        tags (list): dict of tag type to tag string of each polygon
+
+    Returns:
+        Mesh
+    '''
+    def __init__(self, polygons, marks=None, tags=None):
+        self.polygons = polygons
+        self.marks = marks or [frozenset() for polygon in polygons]
+        self.tags = tags or [{} for polygon in polygons]
+
+        points = 1 + max(max(polygon) for polygon in polygons) if polygons else 0
+        self.point_polygons = [[] for i in range(points)]
+        for index, polygon in enumerate(polygons):
+            for point in polygon:
+                self.point_polygons[point].append(index)
+
+    def test(self):
+        return True
+
+    def test_marks(self, index, mode):
+        marks = self.marks[index]
+        return mode[0] <= marks and not (mode[1] & marks)
+
+    def PolygonCount(self):
+        return len(self.polygons)
+
+    def PointCount(self):
+        return len(self.point_polygons)
+
+    def attach(self, editor):
+        '''Sets the mesh and accessors of a MeshEditorClass, as its
+        mesh_edit() does for each layer.'''
+        editor.mesh = self
+        editor.mesh_svc = MeshService()
+        editor.polygon_accessor = Polygon(self)
+        editor.point_accessor = Point(self)
+        editor.edge_accessor = Edge(self)
+        editor.snapshot = None
+
+    def calls(self, editor):
+        '''Accessor calls made through an editor's accessors.'''
+        return sum(accessor.calls for accessor in (editor.polygon_accessor, editor.point_accessor, editor.edge_accessor))
+
+
+def grid(islands=1, width=10, height=10, selected=0.01, hidden=0.005, materials=4, seed=0):
+    '''
+    Returns a mesh of separate quad grids.
+
+    Args:
+        islands (int): number of grids
+        width (int): quads across each grid
+        height (int): quads down each grid
+        selected (float): share of selected polygons
+        hidden (float): share of hidden polygons
+        materials (int): number of material tags, in bands across each grid
+        seed (int): random seed
+
+    Returns:
+        Mesh
+    '''
+    rng = random.Random(seed)
+    polygons = []
+    marks = []
+    tags = []
+    for island in range(islands):
+        base = island * (width + 1) * (height + 1)
+        for y in range(height):
+            for x in range(width):
+                a = base + y * (width + 1) + x
+                polygons.append((a, a + 1, a + width + 2, a + width + 1))
+
+                polygon_marks = set()
+                if rng.random() < selected:
+                    polygon_marks.add(lx.symbol.sMARK_SELECT)
+                if rng.random() < hidden:
+                    polygon_marks.add(lx.symbol.sMARK_HIDE)
+                marks.append(frozenset(polygon_marks))
+                tags.append({lx.symbol.i_POLYTAG_MATERIAL: 'material%d' % (x * materials // width)})
+    return Mesh(polygons, marks, tags)
@@ -0,0 +1,29 @@
+# python
+'''
+Stand-in for the `modo` module. Dialogs return the answers set in
+`dialogs.answers` and are recorded in `dialogs.shown`.
+'''
+import types
+
+dialogs = types.ModuleType('modo.dialogs')
+
+# Answers by dialog function name. customFile returning None is a cancel.
+dialogs.answers = {
+    'yesNo': 'no',
+    'customFile': None,
+}
+
+# (function name, args) for every dialog shown, in order
+dialogs.shown = []
+
+
+def _dialog(name):
+    def show(*args, **kwargs):
+        dialogs.shown.append((name, args))
+        return dialogs.answers.get(name)
+    show.__name__ = name
+    return show
+
+
+for _name in ('alert', 'yesNo', 'yesNoCancel', 'okCancel', 'customFile', 'fileOpen', 'fileSave', 'dirBrowse'):
+    setattr(dialogs, _name, _dialog(_name))
@@ -0,0 +1,74 @@
+# python
+'''
+Records the commandservice schema snapshot used by the headless stand-in.
+Run inside MODO:
+
+    @{kit_mecco_replay:benchmarks/headless/record_schema.py} [output path] [command ...]
+
+By default the commands already in schema.json are recorded again, and the
+snapshot is written over schema.json. Pass command names to record others.
+'''
+import os
+import json
+
+import lx
+
+_flag_names = ('optional', 'query', 'hidden', 'variable', 'reqforvariable')
+_columns = ('argNames', 'argUsernames', 'argTypes', 'argTypeNames', 'argDescs', 'argExamples')
+
+
+def query(term, command):
+    return lx.evalN('query commandservice command.%s ? {%s}' % (term, command))
+
+
+def arg_flags(command):
+    '''Names of the fCMDARG flags set on each argument of a command.'''
+    spawned = lx.service.Command().Spawn(0, command)
+    flags = []
+    for index in range(lx.object.Attributes(spawned).Count()):
+        value = spawned.ArgFlags(index)
+        flags.append([name for name in _flag_names if value & getattr(lx.symbol, 'fCMDARG_' + name.upper())])
+    return flags
+
+
+def record(command):
+    columns = [query(term, command) for term in _columns]
+    args = []
+    for index, flags in enumerate(arg_flags(command)):
+        arg = {'argFlags': flags}
+        for term, values in zip(_columns, columns):
+            arg[term[:-1]] = values[index] if index < len(values) else ''
+        args.append(arg)
+
+    return {
+        'username': lx.eval('query commandservice command.username ? {%s}' % command),
+        'buttonName': lx.eval('query commandservice command.buttonName ? {%s}' % command),
+        'args': args,
+    }
+
+
+def main(args):
+    default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.json')
+    path = args[0] if args else default_path
+
+    snapshot = {'comment': '', 'commands': {}}
+    if os.path.exists(default_path):
+        with open(default_path) as schema_file:
+            snapshot = json.load(schema_file)
+
+    names = args[1:] or sorted(snapshot['commands'])
+    commands = {}
+    for name in names:
+        try:
+            commands[name] = record(name)
+        except Exception:
+            lx.out('record_schema: skipping unknown command %s' % name)
+
+    snapshot['commands'] = commands
+    with open(path, 'w') as schema_file:
+        json.dump(snapshot, schema_file, sort_keys=True, indent=2, separators=(',', ': '))
+        schema_file.write('\n')
+    lx.out('record_schema: %d commands written to %s' % (len(commands), path))
+
+
+main(list(lx.args()))
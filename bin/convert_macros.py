@@ -0,0 +1,230 @@
+# python
+'''
+Converts macro files between LXM, Python and JSON outside of MODO, the way
+`replay.fileOpen` and `replay.fileExport` do inside it.
+
+Macros are opened with `Macro().parse()` (LXMParser for LXM, PythonParser
+for Python, `Macro.parse_json()` for JSON) and written with
+`Macro().render()`. Command schemas are answered by the headless stand-in
+in benchmarks/headless, from its schema snapshot.
+
+Files are converted in a pool of processes, one per CPU by default, and
+reported as each one finishes. Files whose output is newer than the source
+are skipped unless --force is given. A file that fails to parse is reported
+with its LXMError line number and the others carry on.
+
+Usage:
+    python bin/convert_macros.py SOURCE [SOURCE ...] --to lxm|py|json
+        [--output DIR] [--from lxm,py,json] [--jobs N] [--force]
+        [--schema PATH] [--quiet]
+'''
+import argparse
+import os
+import sys
+import time
+
+_kit = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Macro formats by file extension
+formats = {
+    '.lxm': 'lxm',
+    '.py': 'py',
+    '.json': 'json'
+}
+
+
+def scan(sources, from_formats):
+    '''
+    Walks files and directory trees for macro files
+
+    Args:
+        sources (list): file and directory paths
+        from_formats (set): formats to convert
+
+    Returns:
+        list: (source root, file path) tuples, in walk order
+    '''
+    files = []
+    for source in sources:
+        source = os.path.normpath(source)
+        if os.path.isfile(source):
+            files.append((os.path.dirname(source), source))
+            continue
+        for root, dir_names, file_names in os.walk(source):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if formats.get(os.path.splitext(file_name)[1].lower()) in from_formats:
+                    files.append((source, os.path.join(root, file_name)))
+    return files
+
+
+def output_path(source_root, path, output, to_format):
+    '''
+    Returns the path a file converts to: the same relative path under
+    `output`, or next to the file without an output directory.
+    '''
+    name = os.path.splitext(os.path.relpath(path, source_root))[0] + '.' + to_format
+    return os.path.join(output or source_root, name)
+
+
+def is_unchanged(path, destination):
+    '''Whether the destination exists and is newer than the source.'''
+    try:
+        return os.path.getmtime(destination) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+
+def init_worker(schema_path):
+    '''
+    Installs the headless stand-in and blesses the macro, once per process.
+
+    Args:
+        schema_path (str): schema snapshot, or None for the default
+
+    Returns:
+        None
+    '''
+    sys.path.insert(0, os.path.join(_kit, 'benchmarks'))
+    import headless
+    headless.install(schema_path)
+    headless.bless_macro()
+
+
+def convert_file(task):
+    '''
+    Converts one macro file. Runs in the pool, so it only returns plain data.
+
+    Args:
+        task (tuple): source path, destination path, format to write
+
+    Returns:
+        dict: path, destination, lines, seconds and error, None on success
+    '''
+    import replay
+
+    path, destination, to_format = task
+    result = {'path': path, 'destination': destination, 'lines': 0, 'error': None}
+    start = time.time()
+
+    # Rendered next to the destination and then moved over it, so that a
+    # failed conversion never leaves half a file behind
+    temp_path = destination + '.converting'
+    try:
+        with open(path, 'r') as source_file:
+            result['lines'] = sum(1 for line in source_file)
+
+        directory = os.path.dirname(destination)
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Made by another process in the meantime
+                if not os.path.isdir(directory):
+                    raise
+
+        macro = replay.Macro()
+        macro.parse('open', path)
+        macro.render(to_format, temp_path)
+        if os.name == 'nt' and os.path.exists(destination):
+            os.remove(destination)
+        os.rename(temp_path, destination)
+    except replay.LXMError as error:
+        result['error'] = '%s:%s: %s' % (path, error.line, error.message)
+    except Exception as error:
+        result['error'] = '%s: %s' % (path, str(error) or error.__class__.__name__)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    result['seconds'] = time.time() - start
+    return result
+
+
+def convert(tasks, jobs=None, schema_path=None):
+    '''
+    Converts files in a process pool, yielding results as they finish.
+
+    Args:
+        tasks (list): (source path, destination path, format) tuples
+        jobs (int): number of processes. Default: one per CPU. Use 1 to
+            convert in this process.
+        schema_path (str): schema snapshot, or None for the default
+
+    Yields:
+        dict: convert_file() results, in the order they finish
+    '''
+    if jobs == 1 or len(tasks) < 2:
+        init_worker(schema_path)
+        for task in tasks:
+            yield convert_file(task)
+        return
+
+    import multiprocessing
+    jobs = jobs or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(jobs, init_worker, (schema_path,))
+    try:
+        chunk_size = max(1, min(16, len(tasks) // (jobs * 4)))
+        for result in pool.imap_unordered(convert_file, tasks, chunk_size):
+            yield result
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('sources', nargs='+', metavar='SOURCE', help='macro files or directories')
+    parser.add_argument('--to', required=True, choices=sorted(set(formats.values())), help='format to write')
+    parser.add_argument('--output', help='directory for the converted tree, next to the sources by default')
+    parser.add_argument('--from', dest='from_formats', default='lxm,py,json', help='formats to convert')
+    parser.add_argument('--jobs', type=int, default=None, help='processes, one per CPU by default')
+    parser.add_argument('--force', action='store_true', help='convert files whose output is up to date')
+    parser.add_argument('--schema', help='schema snapshot, benchmarks/headless/schema.json by default')
+    parser.add_argument('--quiet', action='store_true', help='only report errors and the totals')
+    options = parser.parse_args()
+
+    from_formats = set(name.strip() for name in options.from_formats.split(','))
+    unknown = from_formats - set(formats.values())
+    if unknown:
+        parser.error('unknown formats: %s' % ', '.join(sorted(unknown)))
+
+    start = time.time()
+    tasks = []
+    skipped = 0
+    for source_root, path in scan(options.sources, from_formats):
+        destination = output_path(source_root, path, options.output, options.to)
+        if os.path.abspath(destination) == os.path.abspath(path):
+            # Already in the target format, written in place
+            skipped += 1
+        elif not options.force and is_unchanged(path, destination):
+            skipped += 1
+        else:
+            tasks.append((path, destination, options.to))
+
+    converted = 0
+    failed = 0
+    lines = 0
+    for result in convert(tasks, options.jobs, options.schema):
+        if result['error']:
+            failed += 1
+            sys.stderr.write('error: %s\n' % result['error'])
+            continue
+        converted += 1
+        lines += result['lines']
+        if not options.quiet:
+            sys.stdout.write('%s -> %s (%d lines, %.3fs)\n' % (
+                result['path'], result['destination'], result['lines'], result['seconds']))
+            sys.stdout.flush()
+
+    seconds = max(time.time() - start, 1e-6)
+    print('%d converted, %d unchanged, %d failed in %.2fs: %.1f files/s, %.0f lines/s' % (
+        converted, skipped, failed, seconds, converted / seconds, lines / seconds))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# python
+'''
+Compares macro files command by command, or merges the changes made to two
+copies of a macro, outside of MODO, as `replay.fileDiff` does inside it.
+
+Commands are matched by command and argument values, however the arguments
+are written, and blocks by their contents; names, comments and colors are
+not compared. Differences are listed as '-' deleted, '+' inserted, '~'
+changed and '>' moved, with their positions. The exit status is 1 if the
+macros differ, as with diff.
+
+With --merge, the changes OURS and THEIRS made to BASE are merged and the
+result written as LXM, to stdout by default. Conflicts keep both sides
+between comment lines, and make the exit status 1.
+
+Usage:
+    python bin/diff_macros.py OLD NEW [--context] [--schema PATH]
+    python bin/diff_macros.py --merge BASE OURS THEIRS [--output PATH] [--schema PATH]
+'''
+import argparse
+import os
+import sys
+
+_kit = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('paths', nargs='+', metavar='PATH', help='OLD NEW, or BASE OURS THEIRS with --merge')
+    parser.add_argument('--merge', action='store_true', help='merge OURS and THEIRS changes to BASE')
+    parser.add_argument('--output', help='merged macro, stdout by default')
+    parser.add_argument('--context', action='store_true', help='list the equal commands too')
+    parser.add_argument('--schema', help='schema snapshot, benchmarks/headless/schema.json by default')
+    options = parser.parse_args()
+    if len(options.paths) != (3 if options.merge else 2):
+        parser.error('expected %s' % ('BASE OURS THEIRS' if options.merge else 'OLD NEW'))
+
+    sys.path.insert(0, os.path.join(_kit, 'benchmarks'))
+    import headless
+    headless.install(options.schema)
+    macro = headless.bless_macro()
+    import replay
+
+    try:
+        nodes = [macro.read_nodes(path) for path in options.paths]
+    except Exception as error:
+        sys.stderr.write('error: %s\n' % error)
+        return 2
+
+    if not options.merge:
+        lines = replay.format_diff(replay.tree_diff(*nodes), options.context)
+        for line in lines:
+            print(line)
+        return 1 if any(not line.startswith(' ') for line in lines) else 0
+
+    merged = replay.merge3(*nodes)
+    lxm = macro.shebang(True, '\n') + '\n'.join(replay.render_merge(merged)) + '\n'
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            output_file.write(lxm)
+    else:
+        sys.stdout.write(lxm)
+
+    count = replay.conflicts(merged)
+    if count:
+        sys.stderr.write('%d conflicts\n' % count)
+    return 1 if count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# python
+'''
+Checks macro files against MODO's command schemas outside of MODO, as
+`replay.play` does before playing the open macro.
+
+Reports unknown commands, unknown or repeated argument names, more arguments
+than a command takes and values that don't suit their argument's type, as
+`path:line: command: message`. Command schemas are answered by the headless
+stand-in in benchmarks/headless, from its schema snapshot, so commands
+missing from the snapshot are reported as unknown.
+
+Files are checked in a pool of processes, one per CPU by default. The exit
+status is 1 if any problem is found or a file can't be read.
+
+Usage:
+    python bin/validate_macros.py SOURCE [SOURCE ...] [--from lxm,py,json]
+        [--suppressed] [--jobs N] [--schema PATH] [--quiet]
+'''
+import argparse
+import os
+import sys
+import time
+
+from convert_macros import formats, scan
+
+_kit = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def init_worker(schema_path):
+    '''
+    Installs the headless stand-in, once per process.
+
+    Args:
+        schema_path (str): schema snapshot, or None for the default
+
+    Returns:
+        None
+    '''
+    sys.path.insert(0, os.path.join(_kit, 'benchmarks'))
+    import headless
+    headless.install(schema_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('sources', nargs='+', metavar='SOURCE', help='macro files or directories')
+    parser.add_argument('--from', dest='from_formats', default='lxm,py,json', help='formats to check')
+    parser.add_argument('--suppressed', action='store_true', help='check suppressed commands too')
+    parser.add_argument('--jobs', type=int, default=None, help='processes, one per CPU by default')
+    parser.add_argument('--schema', help='schema snapshot, benchmarks/headless/schema.json by default')
+    parser.add_argument('--quiet', action='store_true', help='only report the totals')
+    options = parser.parse_args()
+
+    from_formats = set(name.strip() for name in options.from_formats.split(','))
+    unknown = from_formats - set(formats.values())
+    if unknown:
+        parser.error('unknown formats: %s' % ', '.join(sorted(unknown)))
+
+    init_worker(options.schema)
+    import replay
+
+    start = time.time()
+    paths = [path for source_root, path in scan(options.sources, from_formats)]
+    validator = replay.MacroValidator(options.suppressed)
+    results = validator.validate_files(paths, options.jobs, init_worker, (options.schema,))
+
+    issues = 0
+    failed = 0
+    lines = 0
+    for result in results:
+        if result['error']:
+            failed += 1
+            sys.stderr.write('error: %s: %s\n' % (result['path'], result['error']))
+            continue
+        lines += result['lines']
+        issues += len(result['issues'])
+        if not options.quiet:
+            for path, line, command, message in result['issues']:
+                sys.stdout.write('%s:%s: %s: %s\n' % (path, line or '', command, message))
+
+    seconds = max(time.time() - start, 1e-6)
+    print('%d problems in %d files, %d failed in %.2fs: %.0f lines/s' % (
+        issues, len(results), failed, seconds, lines / seconds))
+    return 1 if issues or failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
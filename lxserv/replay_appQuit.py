@@ -18,7 +18,7 @@ class CmdListener(lxifc.CmdSysListener):
             cmd = lx.object.Command(cmd)
             # lx.out("'%s' will fire shortly" % cmd.Name())
             if cmd.Name() == "app.quit":
-                lx.eval('replay.fileClose')
+                lx.eval('replay.docClose all:true')
 
     def cmdsysevent_ExecutePost(self,cmd,isSandboxed,isPostCmd):
         # if self.armed:
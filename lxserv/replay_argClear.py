@@ -29,7 +29,7 @@ class CommandClass(replay.commander.CommanderClass):
 class UndoArgClear(lxifc.Undo):
     def __init__(self, paths):
         self.m_paths = paths
-        self.m_cleared_values = list()
+        self.m_delta = None
 
     def finalize_command(self, macro):
         """Does common command finalizing operations"""
@@ -41,30 +41,25 @@ class UndoArgClear(lxifc.Undo):
 
     def undo_Forward(self):
         macro = replay.Macro()
-        del self.m_cleared_values[:]
-
-        # Save values in m_cleared_values and clear them
-        for path in self.m_paths:
-            child = macro.node_for_path(path)
-            self.m_cleared_values.append((child.value, child.parent.markedAsString(path[-1])))
-            child.value = None
-            child.parent.markArgumentAsString(path[-1], False)
 
+        # Record cleared values and string marks on first run
+        if self.m_delta is None:
+            changes = list()
+            for path in self.m_paths:
+                child = macro.node_for_path(path)
+                command = child.parent
+                changes.append((child, 'value', child.value, None))
+                changes.append((command, command.string_mark_setter(path[-1]), command.markedAsString(path[-1]), False))
+            self.m_delta = replay.UndoJournal().record(replay.SetDelta(changes))
+
+        self.m_delta.apply()
         self.finalize_command(macro)
 
     def undo_Reverse(self):
         macro = replay.Macro()
 
-        assert(len(self.m_paths) == len(self.m_cleared_values))
         # Restore cleared values
-        for idx in range(0, len(self.m_paths)):
-            path = self.m_paths[idx]
-            value = self.m_cleared_values[idx][0]
-            asString = self.m_cleared_values[idx][1]
-            child = macro.node_for_path(path)
-            child.value = value
-            child.parent.markArgumentAsString(path[-1], asString)
-
+        self.m_delta.revert()
         self.finalize_command(macro)
 
 
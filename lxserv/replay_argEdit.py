@@ -41,31 +41,15 @@ class ArgEditClass(replay.commander.CommanderClass):
         # selection state changes and tree updates.
         return [("replay.notifier", "")]
         
-    def selected_args(self):
-        for node in replay.Macro().selected_commands:
-            for arg in node.args:
-                yield arg
-                
-        for arg in replay.Macro().selected_args:        
-            yield arg
-
     def args_by_argName(self, argName):
         """Returns a list of argument nodes in the current selection with a given
-        `argName` property. Probably not as fast as it should be."""
-        arg_nodes = set()
-        for arg in self.selected_args():
-            if arg.argName == argName:
-                arg_nodes.add(arg)
-        return arg_nodes
+        `argName` property. Looked up in the selection's argument index."""
+        return replay.Macro().argument_index.args(argName)
 
     def commands_by_argName(self, argName):
-        """Returns a list of argument nodes in the current selection with a given
-        `argName` property. Probably not as fast as it should be."""
-        commands = list()
-        for arg in self.selected_args():
-            if arg.argName == argName:
-                commands.append((arg.parent, arg.index))
-        return commands
+        """Returns a list of (command, argIndex) tuples in the current selection
+        with a given `argName` property. Looked up in the selection's argument index."""
+        return replay.Macro().argument_index.commands(argName)
 
     def commander_execute(self, msg, flags):
         """Fires whenever the value is updated in the form. Stores changes in the
@@ -75,12 +59,9 @@ class ArgEditClass(replay.commander.CommanderClass):
             asString = self.asString()
             argValue = self.commander_args()['value']
             
-            paths = list()
+            args = [command.args[argIndex] for command, argIndex in self.commands_by_argName(argName)]
+            paths = replay.Macro().paths_for_nodes(args)
 
-            for command, argIndex in self.commands_by_argName(argName):
-                arg = command.args[argIndex]
-                paths.append(arg.path)
-                
             argEdit = UndoArgEdit(asString, argValue, paths)
                 
             undo_svc = lx.service.Undo()
@@ -243,55 +224,16 @@ class ArgEditClass(replay.commander.CommanderClass):
         be straightforward, but no. This is MODO."""
 
         argName = self.commander_args()['argName']
-        asString = self.asString()
 
-        types = set()
+        # Type info is cached per selection, shared by every field of the form
+        arg_info = replay.Macro().argument_index.arg_info(argName, self.asString())
 
-        # Loop over all command args with name argName
-        for command, argIndex in self.commands_by_argName(argName):
-            arg = command.args[argIndex]
-            # Get type coming from meta
+        # Nasty bug: if we edit a color, we must reset the color
+        # else crash.
+        if arg_info[0] == lx.symbol.sTYPE_COLOR:
+            replay.Macro().reset_color_on_select = True
 
-            hints = None
-            default = None
-            argTypeName = None
-
-            if asString or command.markedAsString(argIndex):
-                argTypeName = lx.symbol.sTYPE_STRING
-                default = command.args[argIndex].value
-                hints = None
-            else:
-                attrs = command.attributes()
-                argTypeName = attrs.arg(argIndex).type_name(lx.symbol.sTYPE_STRING)
-                default = attrs.arg(argIndex).value_as_string(command.args[argIndex].value)
-                hints_ = attrs.arg(argIndex).hints(None)
-                if hints_ is None:
-                    hints = None
-                else:
-                    hints = list()
-                    for idx, name in hints_:
-                        if idx >= 0:
-                            hints.append((idx, name))
-
-            if argTypeName:
-                types.add((argTypeName, None if hints is None else tuple(hints), default))
-
-            # If we have more than one type no need to continue. Return 'string'
-            if len(types) > 1:
-                break;
-
-        if len(types) == 1:
-            # If all argument types are identical return it
-            arg_info = list(types)[0]
-            # Nasty bug: if we edit a color, we must reset the color
-            # else crash.
-            if arg_info[0] == lx.symbol.sTYPE_COLOR:
-                replay.Macro().reset_color_on_select = True
-
-            return arg_info
-        else:
-            # If args doesn't have type or have many use string
-            return (lx.symbol.sTYPE_STRING, None, "")
+        return arg_info
 
     def basic_Enable(self, msg):
         return bool(replay.Macro().selected_descendants)
@@ -306,7 +248,7 @@ class UndoArgEdit(lxifc.Undo):
         self.m_asString = asString
         self.m_argValue = argValue
         self.m_paths = paths
-        self.m_storedValues = list()
+        self.m_delta = None
 
     def finalize_command(self, macro):
         """Does common command finalizing operations"""
@@ -317,7 +259,7 @@ class UndoArgEdit(lxifc.Undo):
         notifier.Notify(lx.symbol.fCMDNOTIFY_VALUE)
         
     def store_in_arg_value(self, command, argIndex, argValue):
-        attrs = command.attributes()
+        attrs = replay.Macro().argument_index.attributes(command)
         argTypeName = attrs.arg(argIndex).type_name()
         if argTypeName == lx.symbol.sTYPE_INTEGER:
             hints = attrs.arg(argIndex).hints()
@@ -329,38 +271,26 @@ class UndoArgEdit(lxifc.Undo):
 
     def undo_Forward(self):
         macro = replay.Macro()
-        
-        del self.m_storedValues[:]
 
-        for path in self.m_paths:
-            arg = macro.node_for_path(path)
-            command = arg.parent
-            if self.m_asString:
-                self.m_storedValues.append((arg.value, command.markedAsString(path[-1])))
-                
-                arg.value = self.m_argValue
-                command.markArgumentAsString(path[-1])
-            else:
-                self.m_storedValues.append(arg.value)
-                arg.value = self.store_in_arg_value(command, path[-1], self.m_argValue)
+        # Record old and new values on first run
+        if self.m_delta is None:
+            changes = list()
+            for path, arg in zip(self.m_paths, macro.nodes_for_paths(self.m_paths)):
+                command = arg.parent
+                if self.m_asString:
+                    changes.append((arg, 'value', arg.value, self.m_argValue))
+                    changes.append((command, command.string_mark_setter(path[-1]), command.markedAsString(path[-1]), True))
+                else:
+                    changes.append((arg, 'value', arg.value, self.store_in_arg_value(command, path[-1], self.m_argValue)))
+            self.m_delta = replay.UndoJournal().record(replay.SetDelta(changes))
 
+        self.m_delta.apply()
         self.finalize_command(macro)
 
     def undo_Reverse(self):
         macro = replay.Macro()
 
-        for idx in range(len(self.m_paths)):
-            path = self.m_paths[idx]
-            arg = macro.node_for_path(path)
-            command = arg.parent
-            if self.m_asString:
-                val, asString = self.m_storedValues[idx]
-                arg.value = val
-                command.markArgumentAsString(path[-1], asString)
-            else:
-                val = self.m_storedValues[idx]
-                arg.value = val
-
+        self.m_delta.revert()
         self.finalize_command(macro)
 
 lx.bless(ArgEditClass, 'replay.argEdit')
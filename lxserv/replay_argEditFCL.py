@@ -29,33 +29,15 @@ class CommandClass(replay.commander.CommanderClass):
     def commander_notifiers(self):
         return [("replay.notifier", "")]
 
-    def remove_duplicates(self, seq):
-        """Removes duplicate list items while maintaining list order."""
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
-
     def list_commands(self):
-        nodes = replay.Macro().selected_commands
-        
         asString = self.commander_args().get('asString', False)
 
-        # Collect args of selected commands
-        args = []
-        for node in nodes:
-            command_obj = node.attributes()
-            for arg in node.args:
-                if not command_obj.arg(arg.index).is_hidden(True):
-                    args.append(arg.argName)
-                    
-        # Collect selected args
-        for arg in replay.Macro().selected_args:
-            command_obj = arg.parent.attributes()
-            if not command_obj.arg(arg.index).is_hidden(True):
-                args.append(arg.argName)
+        # Args of selected commands and selected args, minus hidden ones. The
+        # index is shared with `replay.argEdit`, so the form builds it once.
+        args = replay.Macro().argument_index.arg_names()
 
         commands_list = []
-        for arg in self.remove_duplicates(args):
+        for arg in args:
             commands_list.append('replay.argEdit%s %s ?' % ("AsString" if asString else "", arg))
 
         return commands_list                
@@ -11,9 +11,13 @@ class CommandClass(replay.commander.CommanderClass):
     """Deletes the currently-selected command from the `Macro()` object."""
     def commander_execute(self, msg, flags):
 
-        lxm = replay.Macro().render_LXM_selected()
+        macro = replay.Macro()
+        lxm = macro.render_LXM_selected()
         pyperclip.copy(lxm)
 
+        # Keep the structured lines so that pasting them back needs no parsing
+        replay.Clipboard().store(lxm, macro.render_json_selected())
+
     def basic_Enable(self, msg):
         if lx.eval('replay.record query:?'):
             return False
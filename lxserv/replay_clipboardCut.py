@@ -12,8 +12,10 @@ class CommandClass(replay.commander.CommanderClass):
     def commander_execute(self, msg, flags):
 
         # Copy selection
-        lxm = replay.Macro().render_LXM_selected()
+        macro = replay.Macro()
+        lxm = macro.render_LXM_selected()
         pyperclip.copy(lxm)
+        replay.Clipboard().store(lxm, macro.render_json_selected())
 
         lx.eval("replay.lineDelete")
 
@@ -50,7 +50,7 @@ class UndoPaste(lxifc.Undo):
         self.m_lxm = lxm
         self.m_path = path
         self.m_old_primary_path = old_primary
-        self.m_added_nodes = list()
+        self.m_delta = None
 
     def finalize_command(self):
         """Does common command finalizing operations"""
@@ -64,16 +64,27 @@ class UndoPaste(lxifc.Undo):
     def undo_Forward(self):
         macro = replay.Macro()
 
-        self.m_added_nodes = macro.parse_and_insert_string(self.m_lxm, list(self.m_path))
+        # Parse once. Redo puts the same nodes back instead of parsing again.
+        if self.m_delta is None:
+            # Lines copied from Replay are built from the clipboard's json.
+            # Only text from elsewhere needs parsing.
+            commands_json = replay.Clipboard().commands_json(self.m_lxm)
+            if commands_json is not None:
+                nodes = macro.insert_json(commands_json, list(self.m_path), notify=False)
+            else:
+                nodes = macro.parse_and_insert_string(self.m_lxm, list(self.m_path), notify=False)
+            self.m_delta = replay.UndoJournal().record(replay.InsertDelta(nodes))
+            self.m_lxm = None
+        else:
+            self.m_delta.apply()
         macro.select(self.m_path)
 
         self.finalize_command()
 
     def undo_Reverse(self):
-        for node in self.m_added_nodes:
-            node.delete()
-        
         macro = replay.Macro()
+        self.m_delta.revert()
+
         if self.m_old_primary_path is not None:
             macro.select(self.m_old_primary_path)
 
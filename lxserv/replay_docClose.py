@@ -0,0 +1,45 @@
+# python
+
+import lx, modo, replay
+
+"""A simple example of a blessed MODO command using the commander module.
+https://github.com/adamohern/commander for details"""
+
+
+class CommandClass(replay.commander.CommanderClass):
+    """Closes the shown macro, prompting to save changes as `replay.fileClose`
+    does, and shows the next open one."""
+
+    def commander_arguments(self):
+        return [
+            {
+                'name': 'all',
+                'datatype': 'boolean',
+                'default': False,
+                'flags': ['optional']
+            }
+        ]
+
+    def commander_execute(self, msg, flags):
+        close_all = self.commander_arg_value(0, False)
+
+        documents = replay.MacroDocuments()
+        count = len(documents.documents) if close_all else 1
+        for i in range(count):
+            # Prompts to save and clears the shown macro
+            lx.eval('replay.fileClose')
+            if replay.Macro().unsaved_changes:
+                # The save was cancelled
+                return
+            documents.close()
+
+        replay.Macro().rebuild_view()
+
+        notifier = replay.Notifier()
+        notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
+
+    def basic_Enable(self, msg):
+        return True
+
+
+lx.bless(CommandClass, 'replay.docClose')
@@ -0,0 +1,31 @@
+# python
+
+import lx, modo, replay
+
+"""A simple example of a blessed MODO command using the commander module.
+https://github.com/adamohern/commander for details"""
+
+
+class CommandClass(replay.commander.CommanderClass):
+    """Opens an empty macro next to the open ones and shows it."""
+
+    def commander_execute(self, msg, flags):
+
+        # Stop recording
+        lx.eval('replay.record stop')
+
+        # Open the replay palette
+        lx.eval('layout.createOrClose ReplayPalette {ReplayPalette} true {Replay Palette} width:400 height:600 persistent:true style:palette')
+
+        macro = replay.Macro()
+        replay.MacroDocuments().new()
+        macro.rebuild_view()
+
+        notifier = replay.Notifier()
+        notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
+
+    def basic_Enable(self, msg):
+        return True
+
+
+lx.bless(CommandClass, 'replay.docNew')
@@ -0,0 +1,61 @@
+# python
+
+import lx, modo, replay
+from replay import message as message
+
+"""A simple example of a blessed MODO command using the commander module.
+https://github.com/adamohern/commander for details"""
+
+
+class CommandClass(replay.commander.CommanderClass):
+    """Lists the open macros and shows the one picked. The macros stay as they
+    are while hidden, so nothing is read again."""
+
+    def commander_arguments(self):
+        return [
+            {
+                'name': 'document',
+                'label': 'Macro',
+                'datatype': 'string',
+                'values_list_type': 'popup',
+                'values_list': self.list_documents,
+                'flags': ['query']
+            }
+        ]
+
+    def commander_notifiers(self):
+        return [("replay.notifier", "")]
+
+    def commander_execute(self, msg, flags):
+        index = self.commander_arg_value(0)
+        if index is None:
+            return
+
+        documents = replay.MacroDocuments()
+        index = int(index)
+        if index == documents.active:
+            return
+
+        # Stop recording
+        lx.eval('replay.record stop')
+
+        macro = replay.Macro()
+        # Hack to fix crash bug.
+        macro.select_event_treeview()
+
+        documents.switch(index)
+        macro.rebuild_view()
+
+        notifier = replay.Notifier()
+        notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
+
+    def commander_query(self, arg_index):
+        if arg_index == 0:
+            return str(replay.MacroDocuments().active)
+
+    def list_documents(self):
+        titles = replay.MacroDocuments().titles(message("MECCO_REPLAY", "DOC_UNTITLED"))
+        return [(str(index), title) for index, title in enumerate(titles)]
+
+
+lx.bless(CommandClass, 'replay.docSelect')
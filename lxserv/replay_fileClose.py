@@ -49,10 +49,13 @@ class CommandClass(replay.commander.CommanderClass):
         # No more file path
         macro.file_path = None
         macro.file_format = None
+        macro.file_stat = None
         macro.unsaved_changes = False
 
         # Clear current macro
         macro.clear()
+        # Undo steps refer to the nodes of the closed macro
+        replay.UndoJournal().clear()
         # Rebuild treeview
         macro.rebuild_view()
 
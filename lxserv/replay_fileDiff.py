@@ -0,0 +1,101 @@
+# python
+
+import lx, modo, replay
+from replay import message as message
+
+"""A simple example of a blessed MODO command using the commander module.
+https://github.com/adamohern/commander for details"""
+
+
+class CommandClass(replay.commander.CommanderClass):
+    """Compares the current `Macro()` with a macro file, command by command.
+    Differences are listed in the event log and the lines that differ from
+    the file are selected. Names, comments and colors are not compared.
+
+    Given a `base` file as well, merges the changes made to the file since
+    `base` into the current macro instead. Lines both changed differently are
+    kept from both sides, between comment lines marking the conflict."""
+
+    # Last path picked in the dialog. The alias it starts from is resolved when
+    # the dialog first opens, not while the kit loads.
+    _path = None
+    _alias = 'scripts:'
+
+    def commander_arguments(self):
+        return [
+            {
+                'name': 'path',
+                'datatype': 'string',
+                'flags': ['optional']
+            }, {
+                'name': 'base',
+                'datatype': 'string',
+                'flags': ['optional']
+            }
+        ]
+
+    def commander_execute(self, msg, flags):
+
+        # Stop recording
+        lx.eval('replay.record stop')
+
+        macro = replay.Macro()
+
+        input_path = self.commander_arg_value(0)
+        base_path = self.commander_arg_value(1)
+
+        # Get the path from the user, if not given as argument:
+        if not input_path:
+            input_path = modo.dialogs.customFile(
+                dtype = 'fileOpen',
+                title = message("MECCO_REPLAY", "DIFF_DIALOG_TITLE"),
+                names = macro.import_format_names,
+                unames = macro.import_format_unames,
+                patterns = macro.import_format_patterns,
+                path = self._path or lx.eval('query platformservice alias ? {%s}' % self._alias)
+            )
+            if input_path is None:
+                return
+            self.__class__._path = input_path
+
+        try:
+            theirs = macro.read_nodes(input_path)
+            base = macro.read_nodes(base_path) if base_path else None
+        except Exception as err:
+            modo.dialogs.alert(message("MECCO_REPLAY", "OPEN_FILE_FAIL"), message("MECCO_REPLAY", "OPEN_FILE_FAIL_MSG", str(err)), dtype='warning')
+            return
+
+        if base is None:
+            entries = replay.tree_diff(theirs, macro.children)
+            lines = replay.format_diff(entries)
+            differences = sum(1 for line in lines if not line.startswith(' '))
+            lx.out(message("MECCO_REPLAY", "DIFF_MSG", differences, input_path))
+            for line in lines:
+                lx.out(line)
+
+            macro.root.deselect_descendants()
+            for node in replay.changed_nodes(entries):
+                node.selected = True
+        else:
+            merged = replay.merge3(base, list(macro.children), theirs)
+            lxm = macro.shebang(True, '\n') + '\n'.join(replay.render_merge(merged)) + '\n'
+
+            macro.root.deselect_descendants()
+            macro.clear()
+            macro.parse_and_insert_string(lxm, [0], notify=False)
+            macro.unsaved_changes = True
+            # Undo steps refer to the nodes of the previous macro
+            replay.UndoJournal().clear()
+            lx.out(message("MECCO_REPLAY", "MERGE_MSG", replay.conflicts(merged), input_path))
+
+        macro.rebuild_view()
+        notifier = replay.Notifier()
+        notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
+
+    def basic_Enable(self, msg):
+        if lx.eval('replay.record query:?'):
+            return False
+        return True
+
+
+lx.bless(CommandClass, 'replay.fileDiff')
@@ -11,16 +11,19 @@ class CommandClass(replay.commander.CommanderClass):
     export methods. Accepts optional format and destination arguments. If either
     of these is not provided, a `modo.dialogs.customFile()` will be thrown."""
 
-    _path = lx.eval('query platformservice alias ? {scripts:untitled}')
+    # Last path picked in the dialog. The alias it starts from is resolved when
+    # the dialog first opens, not while the kit loads.
+    _path = None
+    _alias = 'scripts:untitled'
 
     def commander_arguments(self):
         return [
             {
                 'name': 'format',
                 'datatype': 'string',
-                'default': replay.Macro().export_format_names,
+                'default': self.export_format_names(),
                 'values_list_type': 'popup',
-                'values_list': replay.Macro().export_format_names,
+                'values_list': self.export_format_names,
                 'flags': ['optional']
             }, {
                 'name': 'destination',
@@ -29,6 +32,10 @@ class CommandClass(replay.commander.CommanderClass):
             }
         ]
 
+    def export_format_names(self):
+        """Export formats, looked up when the popup is queried."""
+        return replay.Macro().export_format_names
+
     def commander_execute(self, msg, flags):
         """Saves the current Macro() object to the destination stored in its
         `file_path` property. If `file_path` is `None`, prompt for a destination. Unlike
@@ -49,7 +56,7 @@ class CommandClass(replay.commander.CommanderClass):
                 names = macro.export_format_names,
                 unames = macro.export_format_unames,
                 ext = macro.export_format_extensions,
-                path = self._path
+                path = self._path or lx.eval('query platformservice alias ? {%s}' % self._alias)
             )
             if file_path is None:
                 return
@@ -11,7 +11,10 @@ class CommandClass(replay.commander.CommanderClass):
     """Reads a file from disk and parses it into the `Macro()` object's built-in
     parse methods."""
 
-    _path = lx.eval('query platformservice alias ? {scripts:}')
+    # Last path picked in the dialog. The alias it starts from is resolved when
+    # the dialog first opens, not while the kit loads.
+    _path = None
+    _alias = 'scripts:'
 
     def commander_arguments(self):
         return [
@@ -40,7 +43,7 @@ class CommandClass(replay.commander.CommanderClass):
                 names = macro.import_format_names,
                 unames = macro.import_format_unames,
                 patterns = macro.import_format_patterns,
-                path = self._path
+                path = self._path or lx.eval('query platformservice alias ? {%s}' % self._alias)
             )
             if input_path is None:
                 return
@@ -9,9 +9,13 @@ https://github.com/adamohern/commander for details"""
 
 class CommandClass(replay.commander.CommanderClass):
     """Reads a file from disk and parses it into the `Macro()` object's built-in
-    parse methods."""
+    parse methods. The file opens in a new document next to the open macros,
+    or in its own if it is already open."""
 
-    _path = lx.eval('query platformservice alias ? {scripts:}')
+    # Last path picked in the dialog. The alias it starts from is resolved when
+    # the dialog first opens, not while the kit loads.
+    _path = None
+    _alias = 'scripts:'
 
     def commander_arguments(self):
         return [
@@ -50,19 +54,50 @@ class CommandClass(replay.commander.CommanderClass):
                 names = macro.import_format_names,
                 unames = macro.import_format_unames,
                 patterns = macro.import_format_patterns,
-                path = self._path
+                path = self._path or lx.eval('query platformservice alias ? {%s}' % self._alias)
             )
             if input_path is None:
                 return
             self.__class__._path = input_path
 
+        documents = replay.MacroDocuments()
+
+        # A file that is open and unchanged on disk is only shown again
+        index = documents.find(input_path, unchanged=True)
+        if index is not None:
+            documents.switch(index)
+            lx.eval('replay.fileOpenAddRecent {%s}' % input_path)
+            macro.rebuild_view()
+            replay.Notifier().Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
+            return
+
+        # A file changed since it was opened is read again in its document,
+        # if its changes may be lost; any other file gets a new document,
+        # unless the shown macro is empty
+        index = documents.find(input_path)
+        added = False
+        if index is not None:
+            documents.switch(index)
+            if macro.unsaved_changes and modo.dialogs.yesNo(message("MECCO_REPLAY", "RELOAD_DIALOG_TITLE"), message("MECCO_REPLAY", "RELOAD_DIALOG_MSG")) != 'yes':
+                macro.rebuild_view()
+                replay.Notifier().Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
+                return
+        elif macro.file_path is not None or not macro.is_empty:
+            documents.new()
+            added = True
+
         # Parse the file in replay.Macro() and rebuild the view:
         try:
             macro.parse('open', input_path)
+            macro.unsaved_changes = False
+            # Undo steps refer to the nodes of the previous macro
+            replay.UndoJournal().clear()
             # If successfully parsed add to recently-opened
             lx.eval('replay.fileOpenAddRecent {%s}' % input_path)
         except Exception as err:
             lx.out("Error ", str(err))
+            if added:
+                documents.close()
             modo.dialogs.alert(message("MECCO_REPLAY", "OPEN_FILE_FAIL"), message("MECCO_REPLAY", "OPEN_FILE_FAIL_MSG", str(err)), dtype='warning')
 
         finally:
@@ -19,25 +19,9 @@ class CommandClass(replay.commander.CommanderClass):
                }
            ]
 
-    def remove_duplicates(self, seq):
-        """Removes duplicate list items while maintaining list order."""
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x.lower() in seen or seen_add(x.lower()))]
-
     def commander_execute(self, msg, flags):
         path = self.commander_args()['path']
-
-        existing_paths = lx.eval('user.value mecco_replay_recent_files ?')
-        paths_list = existing_paths.split(';')
-
-        paths = [path] + paths_list
-        paths = self.remove_duplicates(paths)
-        paths = paths[:10]
-
-        paths_concat = ';'.join(paths)
-
-        lx.eval('user.value mecco_replay_recent_files {%s}' % paths_concat)
+        replay.RecentFiles().add(path)
 
 
 lx.bless(CommandClass, 'replay.fileOpenAddRecent')
@@ -29,16 +29,8 @@ class CommandClass(replay.commander.CommanderClass):
         lx.eval('replay.fileOpen {%s}' % path)
 
     def list_commands(self):
-        existing_paths = lx.eval('user.value mecco_replay_recent_files ?')
-
-        if not existing_paths:
-            return []
-
-        paths_list = existing_paths.split(';')
-        paths_list = [n for n in paths_list if n]
-
         commands_list = []
-        for path in paths_list:
+        for path in replay.RecentFiles().paths:
             commands_list.append((path, os.path.basename(path)))
 
         return commands_list
@@ -32,6 +32,8 @@ class CommandClass(replay.commander.CommanderClass):
 
             # Reload saved data
             macro.parse('open', macro.file_path)
+            # Undo steps refer to the nodes of the previous macro
+            replay.UndoJournal().clear()
 
             # Rebuild treeview
             macro.rebuild_view()
@@ -7,12 +7,6 @@ from replay import message as message
 https://github.com/adamohern/commander for details"""
 
 
-def is_valid_script(path):
-    if os.path.isfile(path) and os.path.splitext(path)[1].lower() in ['.py', '.lxm', '.pl']:
-        return True
-    return False
-
-
 class CommandClass(replay.commander.CommanderClass):
     """Lists recently-opened macro files stored in a custom user value."""
 
@@ -39,6 +33,8 @@ class CommandClass(replay.commander.CommanderClass):
         path = self.commander_arg_value(1)
 
         if not path:
+            # (Refresh) lists the folder again right away
+            replay.DirectoryCache().refresh(directory)
             notifier = replay.Notifier()
             notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
             return
@@ -52,8 +48,8 @@ class CommandClass(replay.commander.CommanderClass):
         path = lx.eval('query platformservice alias ? {%s}' % self.commander_arg_value(0))
 
         commands_list = []
-        for sub in [f for f in os.listdir(path) if is_valid_script(os.path.join(path, f))]:
-            commands_list.append((os.path.join(path, sub), os.path.basename(sub)))
+        for entry in replay.DirectoryCache().entries(path):
+            commands_list.append((entry.path, entry.name))
 
         commands_list.append(('', '(%s)' % message("MECCO_REPLAY", "REFRESH")))
 
@@ -11,7 +11,10 @@ class CommandClass(replay.commander.CommanderClass):
     `file_path` property. If `file_path` is `None`, prompt for a destination. Unlike
     `replay.fileExport`, this command only supports saving to the LXM format."""
 
-    _path = lx.eval('query platformservice alias ? {scripts:untitled}')
+    # Last path picked in the dialog. The alias it starts from is resolved when
+    # the dialog first opens, not while the kit loads.
+    _path = None
+    _alias = 'scripts:untitled'
 
     def commander_arguments(self):
         return [
@@ -46,7 +49,7 @@ class CommandClass(replay.commander.CommanderClass):
                     names = ('LXM',),
                     unames = ('LXM file',),
                     ext=('LXM',),
-                    path = self._path
+                    path = self._path or lx.eval('query platformservice alias ? {%s}' % self._alias)
                 )
                 if file_path is None:
                     return
@@ -55,6 +58,8 @@ class CommandClass(replay.commander.CommanderClass):
             macro.file_path = file_path
 
         macro.render(file_format, file_path)
+        macro.update_file_stat()
+        macro.unsaved_changes = False
 
         # Add to recently-opened
         lx.eval('replay.fileOpenAddRecent {%s}' % file_path)
@@ -0,0 +1,37 @@
+# python
+
+import lx, replay
+from replay import message as message
+
+"""A simple example of a blessed MODO command using the commander module.
+https://github.com/adamohern/commander for details"""
+
+
+class CommandClass(replay.commander.CommanderClass):
+    """Brings the macro library's catalog of a folder up to date. Only new and
+    changed files are read. Defaults to the scripts folder."""
+
+    def commander_arguments(self):
+        return [
+            {
+                'name': 'path',
+                'datatype': 'string',
+                'flags': ['optional']
+            }
+        ]
+
+    def commander_execute(self, msg, flags):
+        path = self.commander_args()['path'] or 'scripts:'
+        path = lx.eval('query platformservice alias ? {%s}' % path)
+
+        # MODO's executable can't host a process pool, so read files here.
+        read, dropped = replay.MacroLibrary().update([path], processes=1)
+        lx.out(message("MECCO_REPLAY", "LIBRARY_INDEX_MSG", read, dropped))
+
+    def cmd_Flags(self):
+        """Set command flags. This method can be overridden if special flags
+        are needed."""
+        return lx.symbol.fCMD_UI | lx.symbol.fCMD_QUIET
+
+
+lx.bless(CommandClass, 'replay.libraryIndex')
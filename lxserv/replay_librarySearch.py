@@ -0,0 +1,52 @@
+# python
+
+import lx, modo, replay
+from replay import message as message
+
+"""A simple example of a blessed MODO command using the commander module.
+https://github.com/adamohern/commander for details"""
+
+
+class CommandClass(replay.commander.CommanderClass):
+    """Searches the macro library for commands by name, button name, comment,
+    block name or argument value, and lists the matches in the event log.
+    Run replay.libraryIndex first to catalog a folder."""
+
+    def commander_arguments(self):
+        return [
+            {
+                'name': 'text',
+                'datatype': 'string'
+            }, {
+                'name': 'field',
+                'datatype': 'string',
+                'default': 'any',
+                'values_list_type': 'popup',
+                'values_list': ['any'] + sorted(replay.MacroLibrary.search_columns),
+                'flags': ['optional']
+            }
+        ]
+
+    def commander_execute(self, msg, flags):
+        args = self.commander_args()
+        text = args['text']
+        try:
+            matches = replay.MacroLibrary().search(text, args['field'] or 'any')
+        except Exception as err:
+            modo.dialogs.alert(message("MECCO_REPLAY", "LIBRARY_SEARCH_FAIL"), message("MECCO_REPLAY", "LIBRARY_SEARCH_FAIL_MSG", str(err)), dtype='warning')
+            return
+
+        lx.out(message("MECCO_REPLAY", "LIBRARY_SEARCH_MSG", len(matches), text))
+        for match in matches:
+            lx.out('%s:%d %s%s' % (
+                match.path, match.position + 1, match.command,
+                ' "%s"' % match.name if match.name else ''
+            ))
+
+    def cmd_Flags(self):
+        """Set command flags. This method can be overridden if special flags
+        are needed."""
+        return lx.symbol.fCMD_UI | lx.symbol.fCMD_QUIET
+
+
+lx.bless(CommandClass, 'replay.librarySearch')
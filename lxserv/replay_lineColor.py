@@ -44,8 +44,10 @@ class CommandClass(replay.commander.CommanderClass):
 
         # Add actions needed to undo and redo this command
         actionList = ColorActionList()
-        for line in replay.Macro().selected_descendants:
-            actionList.append(line.path, line.row_color, color_name)
+        macro = replay.Macro()
+        lines = macro.selected_descendants
+        for path, line in zip(macro.paths_for_nodes(lines), lines):
+            actionList.append(path, line.row_color, color_name)
 
         # Register Undo object performing operation and apply it
         undo_svc = lx.service.Undo()
@@ -56,10 +58,11 @@ class CommandClass(replay.commander.CommanderClass):
         if lx.eval('replay.record query:?'):
             return False
 
-        if len(replay.Macro().selected_descendants) == 0:
+        selected = replay.Macro().selected_descendants
+        if len(selected) == 0:
             return False
 
-        for command in replay.Macro().selected_descendants:
+        for command in selected:
             if not command.can_change_color():
                 return False
 
@@ -73,29 +76,18 @@ class ColorActionList:
         """Add action in action list"""
         self.m_actions.append((path, prev_color, new_color))
 
-    def iter_redo(self):
-        """iterate actions for redo"""
-        for path, prev_color, new_color in self.m_actions:
-            yield (path, new_color)
-
-    def iter_undo(self):
-        """iterate actions for undo"""
-        for path, prev_color, new_color in self.m_actions:
-            yield (path, prev_color)
+    def iter_changes(self):
+        """iterate (path, previous, new) actions"""
+        for action in self.m_actions:
+            yield action
 
 class UndoLineColor(lxifc.Undo):
     def __init__(self, actionList):
         self.m_actionList = actionList
+        self.m_delta = None
 
-    def apply(self, actions):
-        """Change colors for each item in actions"""
-        macro = replay.Macro()
-
-        # Change color of selected nodes
-        for path, color in actions:
-            macro.node_for_path(path).row_color = color
-
-        # Rebuild view
+    def finalize_command(self, macro):
+        """Does common command finalizing operations"""
         macro.rebuild_view()
         replay.Macro().unsaved_changes = True
 
@@ -103,10 +95,25 @@ class UndoLineColor(lxifc.Undo):
         notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
 
     def undo_Forward(self):
-        self.apply(self.m_actionList.iter_redo())
+        macro = replay.Macro()
+
+        # Resolve paths to nodes on first run
+        if self.m_delta is None:
+            actions = list(self.m_actionList.iter_changes())
+            nodes = macro.nodes_for_paths([path for path, prev, new in actions])
+            changes = list()
+            for node, (path, prev_color, new_color) in zip(nodes, actions):
+                changes.append((node, 'row_color', prev_color, new_color))
+            self.m_delta = replay.UndoJournal().record(replay.SetDelta(changes))
+
+        self.m_delta.apply()
+        self.finalize_command(macro)
 
     def undo_Reverse(self):
-        self.apply(self.m_actionList.iter_undo())
+        macro = replay.Macro()
+
+        self.m_delta.revert()
+        self.finalize_command(macro)
 
 
 lx.bless(CommandClass, 'replay.lineColor')
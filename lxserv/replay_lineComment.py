@@ -31,9 +31,7 @@ class CommandClass(replay.commander.CommanderClass):
             return
 
         # Collect list of selected command paths
-        paths = list()
-        for sel in selecteds:
-            paths.append(sel.path)
+        paths = macro.paths_for_nodes(selecteds)
 
         # Register Undo object performing operation and apply it
         undo_svc = lx.service.Undo()
@@ -44,10 +42,11 @@ class CommandClass(replay.commander.CommanderClass):
         if lx.eval('replay.record query:?'):
             return False
 
-        if len(replay.Macro().selected_descendants) == 0:
+        selected = replay.Macro().selected_descendants
+        if len(selected) == 0:
             return False
 
-        for command in replay.Macro().selected_descendants:
+        for command in selected:
             if not command.can_add_command():
                 return False
 
@@ -58,7 +57,7 @@ class UndoInsertComment(lxifc.Undo):
     def __init__(self, paths, comment):
         self.m_paths = paths
         self.m_comment = comment
-        self.m_line_counts_before = [-1]*len(self.m_paths)
+        self.m_delta = None
 
     def finalize_command(self, macro):
         """Does common command finalizing operations"""
@@ -71,29 +70,22 @@ class UndoInsertComment(lxifc.Undo):
     def undo_Forward(self):
         macro = replay.Macro()
 
-        # Iterate all selected paths and add comment for each
-        for path_idx in xrange(0, len(self.m_paths)):
-            # path - path of command to modify
-            path = self.m_paths[path_idx]
-            # Store line count of old comment for restoring in undo
-            self.m_line_counts_before[path_idx] = len(macro.node_for_path(path).user_comment_before)
-            # Add # before each line in comment and append it
-            for line in self.m_comment.split('\n'):
-                macro.node_for_path(path).user_comment_before.append(line)
+        # Append each line of the comment to every selected path
+        if self.m_delta is None:
+            lines = self.m_comment.split('\n')
+            changes = list()
+            for node in macro.nodes_for_paths(self.m_paths):
+                comment = list(node.user_comment_before)
+                changes.append((node, 'user_comment_before', comment, comment + lines))
+            self.m_delta = replay.UndoJournal().record(replay.SetDelta(changes))
 
+        self.m_delta.apply()
         self.finalize_command(macro)
 
     def undo_Reverse(self):
         macro = replay.Macro()
-        # Iterate all selected indices and remove previously added comments
-        for path_idx in xrange(0, len(self.m_paths)):
-            # Get path of selected item
-            path = self.m_paths[path_idx]
-            # Get count of lines in comment before adding new ones
-            line_count_before = self.m_line_counts_before[path_idx]
-            # Cat comment to restore previous state
-            macro.node_for_path(path).user_comment_before = macro.node_for_path(path).user_comment_before[:line_count_before]
 
+        self.m_delta.revert()
         self.finalize_command(macro)
 
 lx.bless(CommandClass, 'replay.lineComment')
@@ -36,10 +36,7 @@ class CommandClass(replay.commander.CommanderClass):
 class UndoLineDelete(lxifc.Undo):
     def __init__(self, paths):
         self.m_paths = paths
-        # Need to delete paths sorted in reverse order to not invalidate other paths
-        # Default list comparision working in our case
-        self.m_paths.sort(reverse=True)
-        self.m_deleted_commands = list()
+        self.m_delta = None
 
     def finalize_command(self, macro):
         """Does common command finalizing operations"""
@@ -51,27 +48,22 @@ class UndoLineDelete(lxifc.Undo):
 
     def undo_Forward(self):
         macro = replay.Macro()
-        del self.m_deleted_commands[:]
 
-        # delete selected paths and store them in json form to be able to undo
-        for path in self.m_paths:
-            child = macro.node_for_path(path)
-            self.m_deleted_commands.append((path, child.render_json()))
-            child.delete()
+        # Deleted subtrees are kept as they are by the delta, to be put
+        # back as they were on undo
+        if self.m_delta is None:
+            nodes = [macro.node_for_path(path) for path in self.m_paths]
+            self.m_delta = replay.UndoJournal().record(replay.RemoveDelta(nodes))
 
+        self.m_delta.apply()
         self.finalize_command(macro)
 
     def undo_Reverse(self):
         macro = replay.Macro()
 
-        # Sort paths in ascending order for undo operation
-        # Default list comparision working in our case
-        self.m_deleted_commands.sort(key=lambda x: x[0])
-
-        # Restore deleted commands
-        for removed_path, json in self.m_deleted_commands:
-            macro.add_json_command_or_block(json, path = removed_path)
-            macro.node_for_path(removed_path).selected = True
+        if self.m_delta.revert():
+            for node in self.m_delta.nodes:
+                node.selected = True
 
         self.finalize_command(macro)
 
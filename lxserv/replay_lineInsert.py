@@ -29,8 +29,19 @@ class LineInsertClass(replay.commander.CommanderClass):
         return 'sPresetText'
 
     def list_commands(self):
-        return lx.eval('query commandservice commands ?')
-        
+        """Lists the commands matching the command name typed so far, or all
+        commands if nothing matches."""
+        catalog = replay.CommandCatalog()
+
+        typed = self.commander_arg_value(0, '') or ''
+        words = typed.split()
+        if words:
+            matches = catalog.match(words[0].lstrip('!+?'))
+            if matches:
+                return matches
+
+        return catalog.names
+
     def cmd_Flags(self):
         return lx.symbol.fCMD_UI | lx.symbol.fCMD_UNDO
 
@@ -107,7 +118,7 @@ class UndoLineInsert(lxifc.Undo):
         self.m_script = script
         self.m_buttonName = buttonName
         self.m_path = path
-        self.m_added_commands = []
+        self.m_delta = None
         self.m_selection = []
         self.m_primary = None
 
@@ -120,15 +131,19 @@ class UndoLineInsert(lxifc.Undo):
 
     def undo_Forward(self):
         macro = replay.Macro()
-        
-        del self.m_added_commands[:]
-            
+
         path = list(self.m_path)
-        for line in self.m_script.split('\n'):
-            self.m_added_commands.append(macro.add_command(command = line, path = path, ButtonName = self.m_buttonName))
-            macro.unsaved_changes = True
-            path[-1] += 1
-            
+        if self.m_delta is None:
+            added_commands = list()
+            for line in self.m_script.split('\n'):
+                added_commands.append(macro.add_command(command = line, path = path, ButtonName = self.m_buttonName))
+                path[-1] += 1
+            self.m_delta = replay.UndoJournal().record(replay.InsertDelta(added_commands))
+        else:
+            self.m_delta.apply()
+            path[-1] += len(self.m_delta.nodes)
+        macro.unsaved_changes = True
+
         self.m_selection = macro.root.selected_descendants
         
         self.m_primary = macro.primary
@@ -141,8 +156,7 @@ class UndoLineInsert(lxifc.Undo):
     def undo_Reverse(self):
         macro = replay.Macro()
 
-        for command in self.m_added_commands:
-            command.delete()
+        self.m_delta.revert()
             
         macro.root.deselect_descendants()
 
@@ -49,8 +49,10 @@ class CommandClass(replay.commander.CommanderClass):
 
         # Add actions needed to undo and redo this command
         actionList = PrefixActionList()
-        for line in replay.Macro().selected_descendants:
-            actionList.append(line.path, line.prefix, prefix)
+        macro = replay.Macro()
+        lines = macro.selected_descendants
+        for path, line in zip(macro.paths_for_nodes(lines), lines):
+            actionList.append(path, line.prefix, prefix)
 
         # Register Undo object performing operation and apply it
         undo_svc = lx.service.Undo()
@@ -70,29 +72,18 @@ class PrefixActionList:
         """Add action in action list"""
         self.m_actions.append((path, prev_prefix, new_prefix))
 
-    def iter_redo(self):
-        """iterate actions for redo"""
-        for path, prev_prefix, new_prefix in self.m_actions:
-            yield (path, new_prefix)
-
-    def iter_undo(self):
-        """iterate actions for undo"""
-        for path, prev_prefix, new_prefix in self.m_actions:
-            yield (path, prev_prefix)
+    def iter_changes(self):
+        """iterate (path, previous, new) actions"""
+        for action in self.m_actions:
+            yield action
 
 class UndoLinePrefix(lxifc.Undo):
     def __init__(self, actionList):
         self.m_actionList = actionList
+        self.m_delta = None
 
-    def apply(self, actions):
-        """Change prefix for each item in actions"""
-        macro = replay.Macro()
-
-        # Change prefix of selected nodes
-        for path, prefix in actions:
-            macro.node_for_path(path).prefix = prefix
-
-        # Rebuild view
+    def finalize_command(self, macro):
+        """Does common command finalizing operations"""
         macro.rebuild_view()
         replay.Macro().unsaved_changes = True
 
@@ -100,10 +91,25 @@ class UndoLinePrefix(lxifc.Undo):
         notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
 
     def undo_Forward(self):
-        self.apply(self.m_actionList.iter_redo())
+        macro = replay.Macro()
+
+        # Resolve paths to nodes on first run
+        if self.m_delta is None:
+            actions = list(self.m_actionList.iter_changes())
+            nodes = macro.nodes_for_paths([path for path, prev, new in actions])
+            changes = list()
+            for node, (path, prev_prefix, new_prefix) in zip(nodes, actions):
+                changes.append((node, 'prefix', prev_prefix, new_prefix))
+            self.m_delta = replay.UndoJournal().record(replay.SetDelta(changes))
+
+        self.m_delta.apply()
+        self.finalize_command(macro)
 
     def undo_Reverse(self):
-        self.apply(self.m_actionList.iter_undo())
+        macro = replay.Macro()
+
+        self.m_delta.revert()
+        self.finalize_command(macro)
 
 
 lx.bless(CommandClass, 'replay.linePrefix')
@@ -110,36 +110,25 @@ class CommandClass(replay.commander.CommanderClass):
 
 class MoveActionList:
     """ Contains list of source and target indices
-        Provides generators for undo and redo operations"""
+        Provides a generator for the first run of the operation"""
     def __init__(self):
         self.m_actions = list()
 
     def append(self, from_idx, to_idx):
         self.m_actions.append((from_idx, to_idx))
 
-    def iter_redo(self):
-        """Iterates indiex pairs for redo"""
+    def iter_moves(self):
+        """Iterates index pairs in the order they apply"""
         for action in self.m_actions:
             yield action
 
-    def iter_undo(self):
-        """Iterates indiex pairs for undo"""
-        for from_idx, to_idx in reversed(self.m_actions):
-            yield (to_idx, from_idx)
-
 class UndoReorder(lxifc.Undo):
     def __init__(self, actionList):
         self.m_actionList = actionList
+        self.m_delta = None
 
-    def reorder(self, indices):
-        """Reorder indices of marco.children for each index pair in indices"""
-        macro = replay.Macro()
-
-        # change indices
-        for from_idx, to_idx in indices:
-            macro.children[from_idx].index = to_idx
-
-        # Rebuild view
+    def finalize_command(self, macro):
+        """Does common command finalizing operations"""
         macro.rebuild_view()
         replay.Macro().unsaved_changes = True
 
@@ -147,10 +136,27 @@ class UndoReorder(lxifc.Undo):
         notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
 
     def undo_Forward(self):
-        self.reorder(self.m_actionList.iter_redo())
+        macro = replay.Macro()
+
+        if self.m_delta is None:
+            # Each index pair refers to the order left by the previous move,
+            # so the first run moves and records the nodes one at a time
+            moves = list()
+            for from_idx, to_idx in self.m_actionList.iter_moves():
+                node = macro.children[from_idx]
+                node.index = to_idx
+                moves.append((node, from_idx, to_idx))
+            self.m_delta = replay.UndoJournal().record(replay.MoveDelta(moves))
+        else:
+            self.m_delta.apply()
+
+        self.finalize_command(macro)
 
     def undo_Reverse(self):
-        self.reorder(self.m_actionList.iter_undo())
+        macro = replay.Macro()
+
+        self.m_delta.revert()
+        self.finalize_command(macro)
 
 
 lx.bless(CommandClass, 'replay.lineReorder')
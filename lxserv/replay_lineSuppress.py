@@ -12,9 +12,8 @@ class CommandClass(replay.commander.CommanderClass):
 
     def commander_execute(self, msg, flags):
         # Collect selected paths
-        paths = list()
-        for line in replay.Macro().selected_descendants:
-            paths.append(line.path)
+        macro = replay.Macro()
+        paths = macro.paths_for_nodes(macro.selected_descendants)
 
         # Register Undo object performing operation and apply it
         undo_svc = lx.service.Undo()
@@ -25,10 +24,11 @@ class CommandClass(replay.commander.CommanderClass):
         if lx.eval('replay.record query:?'):
             return False
 
-        if len(replay.Macro().selected_descendants) == 0:
+        selected = replay.Macro().selected_descendants
+        if len(selected) == 0:
             return False
 
-        for command in replay.Macro().selected_descendants:
+        for command in selected:
             if not command.can_change_suppress():
                 return False
 
@@ -37,16 +37,10 @@ class CommandClass(replay.commander.CommanderClass):
 class UndoLineSuppress(lxifc.Undo):
     def __init__(self, paths):
         self.m_paths = paths
+        self.m_delta = None
 
-    def toggle(self):
-        """Toggle suppress for each item in paths"""
-        macro = replay.Macro()
-
-        # Toggle suppress flag of selected nodes
-        for path in self.m_paths:
-            macro.node_for_path(path).direct_suppress = False if macro.node_for_path(path).direct_suppress else True
-
-        # Rebuild view
+    def finalize_command(self, macro):
+        """Does common command finalizing operations"""
         macro.rebuild_view()
         replay.Macro().unsaved_changes = True
 
@@ -54,10 +48,23 @@ class UndoLineSuppress(lxifc.Undo):
         notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
 
     def undo_Forward(self):
-        self.toggle()
+        macro = replay.Macro()
+
+        # Toggle suppress flag of selected nodes
+        if self.m_delta is None:
+            changes = list()
+            for node in macro.nodes_for_paths(self.m_paths):
+                changes.append((node, 'direct_suppress', node.direct_suppress, not node.direct_suppress))
+            self.m_delta = replay.UndoJournal().record(replay.SetDelta(changes))
+
+        self.m_delta.apply()
+        self.finalize_command(macro)
 
     def undo_Reverse(self):
-        self.toggle()
+        macro = replay.Macro()
+
+        self.m_delta.revert()
+        self.finalize_command(macro)
 
 
 lx.bless(CommandClass, 'replay.lineSuppress')
@@ -2,18 +2,53 @@
 
 import os
 import lx, modo, replay
+from replay import message as message
 
 """A simple example of a blessed MODO command using the commander module.
 https://github.com/adamohern/commander for details"""
 
 
 class CommandClass(replay.commander.CommanderClass):
-    "Fires the `Macro().run()` method."
+    """Fires the `Macro().run()` method.
+
+    Unless `validate` is false, the macro's commands are first checked against
+    their schemas. Problems are listed in the event log, the lines with
+    problems are selected and the macro only plays if the user agrees."""
+
+    def commander_arguments(self):
+        return [
+            {
+                'name': 'validate',
+                'datatype': 'boolean',
+                'default': 'true',
+                'flags': ['optional']
+            }
+        ]
+
     def commander_execute(self, msg, flags):
+        macro = replay.Macro()
+
+        if self.commander_arg_value(0, True):
+            found = replay.MacroValidator().validate_nodes(macro.children)
+            if found:
+                lx.out(message("MECCO_REPLAY", "VALIDATE_MSG", len(found)))
+                for node, issue in found:
+                    lx.out('%s: %s' % (issue.command, issue.message))
+
+                macro.root.deselect_descendants()
+                for node, issue in found:
+                    node.selected = True
+                macro.rebuild_view()
+                notifier = replay.Notifier()
+                notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
+
+                if modo.dialogs.yesNo(message("MECCO_REPLAY", "VALIDATE_DIALOG_TITLE"), message("MECCO_REPLAY", "VALIDATE_DIALOG_MSG", len(found))) != 'yes':
+                    return
+
         file_path = lx.eval('query platformservice alias ? {kit_mecco_replay:}')
         file_path = os.path.join(file_path, "Replay_TempFile.LXM")
         file_format = "lxm"
-        replay.Macro().render(file_format, file_path)
+        macro.render(file_format, file_path)
         lx.eval('@{%s}' % file_path)
 
     def basic_Enable(self, msg):
@@ -46,6 +46,7 @@ class UndoToBlock(lxifc.Undo):
         self.m_paths.sort()
         self.m_target_path = target_path
         self.m_name = name
+        self.m_delta = None
         
     def finalize_command(self, macro):
         """Does common command finalizing operations"""
@@ -58,48 +59,40 @@ class UndoToBlock(lxifc.Undo):
     def undo_Forward(self):
         macro = replay.Macro()
         
+        if self.m_delta is not None:
+            self.m_delta.apply()
+            self.finalize_command(macro)
+            return
+
         nodes = list()
         # Collectiong nodes since paths will be invalidated during move
         for path in self.m_paths:
             nodes.append(macro.node_for_path(path))
-            
-        target_node = macro.add_block(name = self.m_name, comment=[], meta = [], suppress=False, path = self.m_target_path)
-        
-        # Storing new paths after creating target_node for undo
-        del self.m_paths[:]
-        for node in nodes:
-            self.m_paths.append(node.path)
-            
-        idx = 0
-        for node in nodes:
-            node.path = target_node.path + [idx]
-            idx += 1
-            
-        self.m_target_path = target_node.path
+
+        # The block takes the place of the target node, less the selected
+        # nodes above it that move into the block
+        parent = macro.node_for_path(self.m_target_path[:-1])
+        index = self.m_target_path[-1]
+        index -= len([node for node in nodes if node.parent is parent and node.index < index])
+
+        target_node = macro.create_child_node(type='block', name = self.m_name, comment=[], meta = [], suppress=False, parent = parent)
+
+        # Remove the nodes, insert the block, then move the nodes into it
+        remove = replay.RemoveDelta(nodes)
+        remove.apply()
+        macro.insert_children(parent, index, [target_node], notify=False)
+        insert_block = replay.InsertDelta([target_node])
+        macro.insert_children(target_node, 0, nodes, notify=False)
+        insert_nodes = replay.InsertDelta(nodes)
+
+        self.m_delta = replay.UndoJournal().record(replay.CompositeDelta([remove, insert_block, insert_nodes]))
 
         self.finalize_command(macro)
 
     def undo_Reverse(self):
         macro = replay.Macro()
         
-        target_node = macro.node_for_path(self.m_target_path)
-        
-        nodes = list()
-        
-        # Each move will validate next index
-        for path in self.m_paths:
-            child = target_node.children[0]
-            nodes.append(child)
-            child.path = path
-            
-        self.m_target_path = target_node.path
-        target_node.delete()
-        
-        # Restoring initial paths for redo
-        del self.m_paths[:]
-        for node in nodes:
-            self.m_paths.append(node.path)
-
+        self.m_delta.revert()
         self.finalize_command(macro)
 
 
@@ -34,23 +34,24 @@ class CommandClass(replay.commander.CommanderClass):
 
 class UndoStep(lxifc.Undo):
     def __init__(self):
-        # Indices to save for undo operation
-        self.m_prev_path = []
-        self.m_next_path = []
+        # Selection change to replay on redo and revert on undo
+        self.m_delta = None
 
     def undo_Forward(self):
         macro = replay.Macro()
-        undo_svc = lx.service.Undo()
 
-        if undo_svc.State() != lx.symbol.iUNDO_INVALID:
-            # Execute primary command and store indices for undo
-            self.m_prev_path, self.m_next_path = macro.run_next_line()
+        if self.m_delta is None:
+            # Execute primary command and record the selection move for undo
+            prev_path, next_path = macro.run_next_line()
+            self.m_delta = replay.UndoJournal().record(replay.SetDelta([
+                (macro.node_for_path(next_path), 'selected', False, True),
+                (macro.node_for_path(prev_path), 'selected', True, False)
+            ]))
         else:
             # This means undo_Forward is executing second time and user doing redo
             # operations. In this case since redo of executed operation will do actual
             # job we only need to move primary node one step down.
-            macro.node_for_path(self.m_next_path).selected = True
-            macro.node_for_path(self.m_prev_path).selected = False
+            self.m_delta.apply()
         macro.refresh_view()
 
         notifier = replay.Notifier()
@@ -60,8 +61,7 @@ class UndoStep(lxifc.Undo):
         macro = replay.Macro()
         # Undo of executed operation will revert the modifications
         # so we only need to move primary node one step up
-        macro.node_for_path(self.m_prev_path).selected = True
-        macro.node_for_path(self.m_next_path).selected = False
+        self.m_delta.revert()
 
         macro.refresh_view()
         notifier = replay.Notifier()
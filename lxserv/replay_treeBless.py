@@ -1,6 +1,6 @@
 # python
 
-from replay import Macro
+from replay import Macro, MessageCache
 
 
 # In order to be available in the GUI, a treeview needs to be "blessed" (same as
@@ -85,3 +85,9 @@ Macro().bless(
     #                         ]
     notifiers = []
 )
+
+
+# Message lookups are cached. Load Replay's own table while MODO starts up,
+# rather than on the first label or dialog that needs it.
+
+MessageCache().preload('MECCO_REPLAY')
@@ -0,0 +1,195 @@
+# python
+'''
+The ArgumentIndex module contains the ArgumentIndex class, which indexes the
+arguments of the current selection by argName for the argument editor
+'''
+import lx
+
+
+class ArgumentIndex(object):
+    '''
+    Selection-scoped index of command arguments, shared by `replay.argEdit`,
+    `replay.argEditAsString` and `replay.argEditFCL`.
+
+    Maps every argName in the selection to the (command, argIndex) pairs that
+    use it. Command attributes are spawned at most once per command, and hidden
+    flags and type info are cached on first use, so that a form with many
+    fields over a large selection does not rescan the selection per field.
+
+    An index is only valid for the selection it was built from. Get it from
+    `Macro().argument_index`, which rebuilds it after any selection, tree or
+    argument change.
+
+    Args:
+        commands (list): selected MacroCommand nodes, all of whose args are indexed
+        args (list): selected MacroCommandArg nodes
+
+    Returns:
+        ArgumentIndex
+    '''
+    def __init__(self, commands, args):
+        self._arg_names = []
+        self._entries = {}
+        self._attributes = {}
+        self._hidden = {}
+        self._arg_info = {}
+
+        seen = set()
+        for command in commands:
+            for argIndex in range(len(command.arg_names)):
+                self._add(command, argIndex, seen)
+
+        for arg in args:
+            self._add(arg.parent, arg.index, seen)
+
+    def _add(self, command, argIndex, seen):
+        '''
+        Adds one argument to the index, ignoring arguments already indexed.
+
+        Args:
+            command (MacroCommand): command owning the argument
+            argIndex (int): index of the argument
+            seen (set): (id, argIndex) of arguments already indexed
+
+        Returns:
+            None
+        '''
+        key = (id(command), argIndex)
+        if key in seen:
+            return
+        seen.add(key)
+
+        argName = command.arg_names[argIndex]
+        if argName not in self._entries:
+            self._entries[argName] = []
+            self._arg_names.append(argName)
+        self._entries[argName].append((command, argIndex))
+
+    def attributes(self, command):
+        '''
+        Returns the CommandAttributes of a command, spawning it only once.
+
+        Args:
+            command (MacroCommand): command
+
+        Returns:
+            CommandAttributes: attributes of the command's rendered LXM
+        '''
+        attributes = self._attributes.get(id(command))
+        if attributes is None:
+            attributes = command.attributes()
+            self._attributes[id(command)] = attributes
+        return attributes
+
+    def is_hidden(self, command, argIndex):
+        '''
+        Whether an argument is flagged as hidden. Arguments whose flags cannot
+        be read are treated as hidden.
+
+        Args:
+            command (MacroCommand): command owning the argument
+            argIndex (int): index of the argument
+
+        Returns:
+            bool: hidden flag
+        '''
+        key = (id(command), argIndex)
+        if key not in self._hidden:
+            self._hidden[key] = bool(self.attributes(command).arg(argIndex).is_hidden(True))
+        return self._hidden[key]
+
+    def arg_names(self, include_hidden=False):
+        '''
+        Returns the argNames in the selection, in selection order.
+
+        Args:
+            include_hidden (bool): also list argNames that are hidden in every command
+
+        Returns:
+            list: argNames
+        '''
+        if include_hidden:
+            return list(self._arg_names)
+
+        names = []
+        for argName in self._arg_names:
+            for command, argIndex in self._entries[argName]:
+                if not self.is_hidden(command, argIndex):
+                    names.append(argName)
+                    break
+        return names
+
+    def commands(self, argName):
+        '''
+        Returns the (command, argIndex) pairs for an argName.
+
+        Args:
+            argName (str): argument name
+
+        Returns:
+            list: (MacroCommand, int) tuples
+        '''
+        return self._entries.get(argName, [])
+
+    def args(self, argName):
+        '''
+        Returns the argument nodes for an argName.
+
+        Args:
+            argName (str): argument name
+
+        Returns:
+            list: MacroCommandArg nodes
+        '''
+        return [command.args[argIndex] for command, argIndex in self.commands(argName)]
+
+    def arg_info(self, argName, asString):
+        '''
+        Returns the datatype, hints and default value shared by every argument
+        with a given argName. Falls back to a plain string if they differ.
+
+        Args:
+            argName (str): argument name
+            asString (bool): edit the values as strings
+
+        Returns:
+            tuple: (datatype, hints, default)
+        '''
+        key = (argName, asString)
+        if key in self._arg_info:
+            return self._arg_info[key]
+
+        types = set()
+
+        for command, argIndex in self.commands(argName):
+            value = command.arg_value(argIndex)
+
+            if asString or command.markedAsString(argIndex):
+                argTypeName = lx.symbol.sTYPE_STRING
+                default = value
+                hints = None
+            else:
+                arg = self.attributes(command).arg(argIndex)
+                argTypeName = arg.type_name(lx.symbol.sTYPE_STRING)
+                default = arg.value_as_string(value)
+                hints_ = arg.hints(None)
+                if hints_ is None:
+                    hints = None
+                else:
+                    hints = tuple((idx, name) for idx, name in hints_ if idx >= 0)
+
+            if argTypeName:
+                types.add((argTypeName, hints, default))
+
+            # If we have more than one type no need to continue.
+            if len(types) > 1:
+                break
+
+        if len(types) == 1:
+            arg_info = list(types)[0]
+        else:
+            # If args doesn't have type or have many use string
+            arg_info = (lx.symbol.sTYPE_STRING, None, "")
+
+        self._arg_info[key] = arg_info
+        return arg_info
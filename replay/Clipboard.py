@@ -0,0 +1,88 @@
+# python
+'''
+The Clipboard module contains the Clipboard class, which keeps a structured
+copy of the lines Replay puts on the system clipboard
+'''
+import hashlib
+
+
+class Clipboard(object):
+    '''
+    Persistent in-process clipboard for copy, cut and paste of macro lines.
+
+    Copying puts LXM text on the system clipboard so that it can be pasted
+    anywhere, and also keeps the copied lines here as json dicts, along with a
+    hash of that text. When the text on the system clipboard still matches
+    the hash at paste time, the lines are built from the json without parsing
+    the text. Otherwise the clipboard came from elsewhere and the text is
+    parsed as usual.
+
+    Args:
+        None
+
+    Returns:
+        Clipboard
+    '''
+    _commands_json = None
+    _text_hash = None
+
+    @staticmethod
+    def text_hash(text):
+        '''
+        Hashes clipboard text. Line endings and trailing whitespace are
+        ignored, since the system clipboard may convert them.
+
+        Args:
+            text (str): clipboard text
+
+        Returns:
+            str: hex digest
+        '''
+        text = '\n'.join(line.rstrip() for line in text.strip().splitlines())
+        if isinstance(text, unicode):
+            text = text.encode('utf-8')
+        return hashlib.sha1(text).hexdigest()
+
+    def store(self, text, commands_json):
+        '''
+        Keeps the json form of the lines put on the system clipboard as text
+
+        Args:
+            text (str): LXM text put on the system clipboard
+            commands_json (list): the same lines as json dicts
+
+        Returns:
+            None
+        '''
+        self.__class__._commands_json = commands_json
+        self.__class__._text_hash = self.text_hash(text)
+
+    def clear(self):
+        '''
+        Forgets the stored lines
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self.__class__._commands_json = None
+        self.__class__._text_hash = None
+
+    def commands_json(self, text):
+        '''
+        Returns the stored lines if they match the text on the system clipboard
+
+        Args:
+            text (str): current system clipboard text
+
+        Returns:
+            list: stored json dicts, or None if the text came from elsewhere.
+            Nodes built from them only read them, so they are not copied.
+        '''
+        if self.__class__._commands_json is None:
+            return None
+        if self.text_hash(text) != self.__class__._text_hash:
+            return None
+        return self.__class__._commands_json
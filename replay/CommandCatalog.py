@@ -0,0 +1,196 @@
+# python
+'''
+The CommandCatalog module contains the CommandCatalog class, which caches the
+names of the commands known to modo for validation and completion
+'''
+import re
+import lx
+
+
+class CommandCatalog(object):
+    '''
+    Persistent catalog of modo command names.
+
+    The names are fetched from the commandservice once and kept in a set, for
+    validity checks, and in a prefix trie over the sorted names, for
+    completion. The catalog is only fetched again when the number of command
+    servers registered with modo changes, i.e. when a plugin adds commands.
+
+    Like `Macro()`, the catalog works entirely with class variables.
+
+    Args:
+        None
+
+    Returns:
+        CommandCatalog
+    '''
+    _names = None
+    _sorted_names = []
+    _trie = {}
+    _server_count = None
+
+    # Bumped whenever the names are fetched, so that caches derived from the
+    # command set can tell when to drop their entries
+    _generation = 0
+
+    def server_count(self):
+        '''
+        Returns the number of command servers registered with modo. Cheap
+        enough to check on every popup query.
+
+        Args:
+            None
+
+        Returns:
+            int: server count, or None if it can't be queried
+        '''
+        try:
+            return lx.service.Host().NumServers('command')
+        except:
+            return None
+
+    def refresh(self):
+        '''
+        Fetches the command names from modo and rebuilds the trie
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        names = sorted(set(lx.eval('query commandservice commands ?') or []))
+
+        # Each trie node maps characters to child nodes. The None key holds
+        # the [start, end) range of the sorted names sharing the node's prefix.
+        trie = {None: [0, len(names)]}
+        for index, name in enumerate(names):
+            node = trie
+            for char in name:
+                child = node.get(char)
+                if child is None:
+                    child = node[char] = {None: [index, index + 1]}
+                else:
+                    child[None][1] = index + 1
+                node = child
+
+        cls = self.__class__
+        cls._sorted_names = names
+        cls._names = frozenset(names)
+        cls._trie = trie
+        cls._server_count = self.server_count()
+        cls._generation += 1
+
+    def update(self):
+        '''
+        Fetches the names on first use, or again if modo's command set has
+        changed since
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        if self.__class__._names is None or self.server_count() != self.__class__._server_count:
+            self.refresh()
+
+    def is_valid(self, name):
+        '''
+        Checks whether a command exists. Known names are answered from the
+        cache; modo is only asked again for names the cache doesn't know.
+
+        Args:
+            name (str): command name, e.g. "item.name"
+
+        Returns:
+            bool: True if modo knows the command
+        '''
+        if self.__class__._names is None:
+            self.refresh()
+        if name in self.__class__._names:
+            return True
+
+        self.update()
+        return name in self.__class__._names
+
+    def complete(self, prefix):
+        '''
+        Returns the command names starting with a prefix
+
+        Args:
+            prefix (str): start of a command name
+
+        Returns:
+            list: matching names, sorted
+        '''
+        self.update()
+        node = self.__class__._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        start, end = node[None]
+        return self.__class__._sorted_names[start:end]
+
+    def fuzzy(self, query):
+        '''
+        Returns the command names containing the characters of a query in
+        order, e.g. "itnm" matches "item.name". Closer matches come first.
+
+        Args:
+            query (str): characters to look for, case insensitive
+
+        Returns:
+            list: matching names, best first
+        '''
+        self.update()
+        pattern = re.compile('.*?'.join(re.escape(char) for char in query), re.IGNORECASE)
+
+        scored = list()
+        for name in self.__class__._sorted_names:
+            match = pattern.search(name)
+            if match is not None:
+                scored.append(((match.start(), match.end() - match.start(), len(name)), name))
+
+        scored.sort()
+        return [name for score, name in scored]
+
+    def match(self, query):
+        '''
+        Returns the command names matching what has been typed so far: prefix
+        matches first, then fuzzy matches.
+
+        Args:
+            query (str): typed text
+
+        Returns:
+            list: matching names
+        '''
+        prefixed = self.complete(query)
+        if not query:
+            return prefixed
+
+        found = set(prefixed)
+        return prefixed + [name for name in self.fuzzy(query) if name not in found]
+
+    def names():
+        doc = '''
+        list: every command name, sorted
+        '''
+        def fget(self):
+            self.update()
+            return self.__class__._sorted_names
+        return locals()
+
+    names = property(**names())
+
+    def generation():
+        doc = '''
+        int: number of times the names have been fetched
+        '''
+        def fget(self):
+            return self.__class__._generation
+        return locals()
+
+    generation = property(**generation())
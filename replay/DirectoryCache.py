@@ -0,0 +1,288 @@
+# python
+'''
+The DirectoryCache module contains the DirectoryCache class, which keeps
+listings of script folders for popups, and the ScriptEntry class for the
+files in them
+'''
+import os
+import stat
+import threading
+import time
+import Queue
+
+
+class ScriptEntry(object):
+    '''
+    A script file found in a listed directory
+
+    Args:
+        path (str): full path of the file
+        size (int): file size in bytes
+        mtime (float): modification time
+
+    Returns:
+        ScriptEntry
+    '''
+    __slots__ = ('path', 'name', 'size', 'mtime', 'format')
+
+    # Script formats by file extension
+    formats = {
+        '.lxm': 'lxm',
+        '.py': 'py',
+        '.pl': 'pl'
+    }
+
+    def __init__(self, path, size, mtime):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.size = size
+        self.mtime = mtime
+        self.format = self.format_for_path(path)
+
+    @classmethod
+    def format_for_path(cls, path):
+        '''
+        Detects the script format of a file from its extension
+
+        Args:
+            path (str): file path
+
+        Returns:
+            str: 'lxm', 'py' or 'pl', or None if the file isn't a script
+        '''
+        return cls.formats.get(os.path.splitext(path)[1].lower())
+
+
+class DirectoryCache(object):
+    '''
+    Persistent cache of the scripts in directories shown in popups.
+
+    Popups query their lists on every notifier tick, so listing a directory
+    there each time is slow on large or network folders. The first query of
+    a directory lists it once; later queries return the cached entries at
+    once and, at most every `interval` seconds, ask a background thread to
+    check the directory. The thread lists it again if its mtime has changed,
+    and otherwise re-stats the cached entries, pruning files that are gone.
+
+    Like `Macro()`, the cache works entirely with class variables.
+
+    Args:
+        None
+
+    Returns:
+        DirectoryCache
+    '''
+    # directory: (directory mtime, entries, time of last check)
+    _listings = {}
+    _lock = threading.Lock()
+    _queue = Queue.Queue()
+    _queued = set()
+    _thread = None
+
+    # Seconds between background checks of a directory
+    interval = 5.0
+
+    def entries(self, directory):
+        '''
+        Returns the scripts in a directory, sorted by name. Only the first
+        query of a directory touches the file system on the calling thread.
+
+        Args:
+            directory (str): directory path
+
+        Returns:
+            list: ScriptEntry objects
+        '''
+        cls = self.__class__
+        with cls._lock:
+            listing = cls._listings.get(directory)
+
+        if listing is None:
+            return self.refresh(directory)
+
+        mtime, entries, checked = listing
+        if time.time() - checked > self.interval:
+            self.queue_check(directory)
+        return entries
+
+    def refresh(self, directory):
+        '''
+        Lists a directory on the calling thread and caches the result
+
+        Args:
+            directory (str): directory path
+
+        Returns:
+            list: ScriptEntry objects
+        '''
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            self.forget(directory)
+            return []
+
+        with self.__class__._lock:
+            listing = self.__class__._listings.get(directory)
+        entries = self.scan(directory, listing[1] if listing else [])
+
+        with self.__class__._lock:
+            self.__class__._listings[directory] = (mtime, entries, time.time())
+        return entries
+
+    def forget(self, directory):
+        '''
+        Drops the cached listing of a directory
+
+        Args:
+            directory (str): directory path
+
+        Returns:
+            None
+        '''
+        with self.__class__._lock:
+            self.__class__._listings.pop(directory, None)
+
+    def clear(self):
+        '''
+        Drops every cached listing
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        with self.__class__._lock:
+            self.__class__._listings.clear()
+
+    def scan(self, directory, previous):
+        '''
+        Lists the scripts in a directory. Entries of files whose mtime and
+        size haven't changed are reused.
+
+        Args:
+            directory (str): directory path
+            previous (list): ScriptEntry objects from the last listing
+
+        Returns:
+            list: ScriptEntry objects, sorted by name
+        '''
+        known = dict((entry.path, entry) for entry in previous)
+
+        entries = list()
+        for name in sorted(os.listdir(directory)):
+            if ScriptEntry.format_for_path(name) is None:
+                continue
+
+            path = os.path.join(directory, name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(info.st_mode):
+                continue
+
+            entry = known.get(path)
+            if entry is None or entry.mtime != info.st_mtime or entry.size != info.st_size:
+                entry = ScriptEntry(path, info.st_size, info.st_mtime)
+            entries.append(entry)
+
+        return entries
+
+    def prune(self, entries):
+        '''
+        Re-stats cached entries, dropping files that are gone and updating
+        the metadata of files that have changed
+
+        Args:
+            entries (list): ScriptEntry objects
+
+        Returns:
+            list: ScriptEntry objects that still exist
+        '''
+        kept = list()
+        for entry in entries:
+            try:
+                info = os.stat(entry.path)
+            except OSError:
+                continue
+            if entry.mtime != info.st_mtime or entry.size != info.st_size:
+                entry = ScriptEntry(entry.path, info.st_size, info.st_mtime)
+            kept.append(entry)
+        return kept
+
+    def check(self, directory):
+        '''
+        Brings the cached listing of a directory up to date. Runs on the
+        background thread.
+
+        Args:
+            directory (str): directory path
+
+        Returns:
+            None
+        '''
+        with self.__class__._lock:
+            listing = self.__class__._listings.get(directory)
+        if listing is None:
+            return
+
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            self.forget(directory)
+            return
+
+        if mtime != listing[0]:
+            entries = self.scan(directory, listing[1])
+        else:
+            entries = self.prune(listing[1])
+
+        with self.__class__._lock:
+            self.__class__._listings[directory] = (mtime, entries, time.time())
+
+    def queue_check(self, directory):
+        '''
+        Asks the background thread to check a directory, starting the thread
+        if needed. A directory is only queued once at a time.
+
+        Args:
+            directory (str): directory path
+
+        Returns:
+            None
+        '''
+        cls = self.__class__
+        with cls._lock:
+            if directory in cls._queued:
+                return
+            cls._queued.add(directory)
+
+            if cls._thread is None or not cls._thread.is_alive():
+                cls._thread = threading.Thread(target=self.work, name='replay.DirectoryCache')
+                cls._thread.daemon = True
+                cls._thread.start()
+
+        cls._queue.put(directory)
+
+    def work(self):
+        '''
+        Background thread loop. Checks queued directories until the
+        application exits.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        cls = self.__class__
+        while True:
+            directory = cls._queue.get()
+            try:
+                self.check(directory)
+            except Exception:
+                pass
+            finally:
+                with cls._lock:
+                    cls._queued.discard(directory)
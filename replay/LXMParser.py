@@ -366,7 +366,7 @@ class LXMParser(object):
             None
         '''
         if self.type == "LXM":
-            self.builder.buildCommand(line, self.in_suppress)
+            self.buildCommand(line)
         else:
             store_lx_eval = None
             cmd = None
@@ -385,7 +385,24 @@ class LXMParser(object):
                 lx.eval = store_lx_eval
 
             if cmd is not None:
-                self.builder.buildCommand(cmd, self.in_suppress)
+                self.buildCommand(cmd)
+
+    def buildCommand(self, command):
+        '''
+        Passes a command to the builder, reporting its errors at its line
+
+        Args:
+            command (str): modo command string
+
+        Returns:
+            None
+        '''
+        try:
+            self.builder.buildCommand(command, self.in_suppress)
+        except LXMError:
+            raise
+        except Exception as err:
+            raise LXMError(line=self.line_index, message=str(err) or err.__class__.__name__)
 
     def commentsToSkip(self):
         '''
@@ -9,7 +9,11 @@ from MacroCommandArg import MacroCommandArg
 from MacroBlockCommand import MacroBlockCommand
 from Notifier import Notifier
 from LXMParser import LXMParser
+from PythonParser import PythonParser
 from CommandAttributes import CommandAttributes
+from CommandCatalog import CommandCatalog
+from ArgumentIndex import ArgumentIndex
+from MacroDiff import node_key, cache_keys, diff
 
 class Macro(lumberjack.Lumberjack):
     '''
@@ -49,6 +53,9 @@ class Macro(lumberjack.Lumberjack):
     '''
     _file_path = None
     _file_format = None
+    # (mtime, size) of the file when it was last read or written, see
+    # `MacroDocuments.find()`
+    _file_stat = None
 
     # export formats in (file extension, user name of format, file pattern)
     _import_formats = {
@@ -71,6 +78,10 @@ class Macro(lumberjack.Lumberjack):
     # If a color has been modified, we'll need to reset (see `replay.argEdit`)
     _reset_color_on_select = False
 
+    # Argument index of the current selection (see `replay.argEdit`). Built on
+    # demand, dropped whenever the selection, the tree or its values change.
+    _argument_index = None
+
     def __init__(self):
         super(self.__class__, self).__init__()
 
@@ -138,6 +149,19 @@ class Macro(lumberjack.Lumberjack):
 
     file_format = property(**file_format())
 
+    def file_stat():
+        doc = '''
+        tuple: modification time and size of the macro file when it was last
+        read or written, or None if the macro has no file
+        '''
+        def fget(self):
+            return self.__class__._file_stat
+        def fset(self, value):
+            self.__class__._file_stat = value
+        return locals()
+
+    file_stat = property(**file_stat())
+
     def unsaved_changes():
         doc = '''
         dict: local context
@@ -197,6 +221,32 @@ class Macro(lumberjack.Lumberjack):
 
     selected_args = property(**selected_args())
 
+    def argument_index():
+        doc = '''
+        ArgumentIndex: local context
+        Gets the argument index of the current selection, building it if the
+        selection has changed since it was last used.
+        '''
+        def fget(self):
+            if self.__class__._argument_index is None:
+                self.__class__._argument_index = ArgumentIndex(self.selected_commands, self.selected_args)
+            return self.__class__._argument_index
+        return locals()
+
+    argument_index = property(**argument_index())
+
+    def invalidate_argument_index(self):
+        '''
+        Drops the argument index so that the next use rebuilds it
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self.__class__._argument_index = None
+
     @property
     def import_format_names(self):
         '''list: names of import formats'''
@@ -334,6 +384,7 @@ class Macro(lumberjack.Lumberjack):
         Returns:
             None
         '''
+        self.invalidate_argument_index()
         self.unsaved_changes = True
         notifier = Notifier()
         notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
@@ -348,9 +399,38 @@ class Macro(lumberjack.Lumberjack):
         Returns:
             None
         '''
+        self.invalidate_argument_index()
         notifier = Notifier()
         notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
 
+    def rebuild_view(self):
+        '''
+        Rebuilds the treeview after a structural change. Also drops the
+        argument index, since the nodes it refers to may have changed.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self.invalidate_argument_index()
+        super(Macro, self).rebuild_view()
+
+    def refresh_view(self):
+        '''
+        Refreshes the treeview after a value change. Also drops the argument
+        index, since its type info and defaults depend on the values.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self.invalidate_argument_index()
+        super(Macro, self).refresh_view()
+
     def select(self, index):
         '''
         Selects child node its index in children
@@ -368,13 +448,75 @@ class Macro(lumberjack.Lumberjack):
             self.node_for_path(index).selected = True
                 
     def merge_with_build_in(self, file_path):
+        '''
+        Reconciles the commands inserted while recording with MODO's built-in
+        recorder with its own recording of the session, saved to file_path.
+        The two are compared by command and argument values and only the
+        inserted nodes that differ are replaced, so the others keep their
+        names, colors and selection.
+
+        If the inserted nodes are no longer side by side in one parent, e.g.
+        some were moved or deleted while recording, they are all replaced
+        by the recording instead.
+
+        Args:
+            file_path (str): recorded LXM file
+
+        Returns:
+            None
+        '''
         if len(self.insertions) == 0:
             return;
-        primary_path = self.insertions[0].path[0:1]
-        for inserted in self.insertions:
-            inserted.delete()
-        
-        self._parse_and_insert(file_path, path=primary_path, receiver=self)        
+
+        insertions = self.insertions
+        first = insertions[0]
+        siblings = first.parent.children if first.parent is not None else []
+        start = next((index for index, node in enumerate(siblings) if node is first), None)
+        contiguous = start is not None and len(siblings) - start >= len(insertions) and \
+            all(siblings[start + i] is node for i, node in enumerate(insertions))
+
+        if not contiguous:
+            primary_path = first.path[0:1]
+            cache = Macro.TmpCommandCache()
+            self._parse_and_insert(file_path, path=primary_path, receiver=cache)
+            self.remove_nodes(insertions, notify=False)
+            self.insert_cache(cache)
+            return
+
+        cache = Macro.TmpCommandCache()
+        self._parse_and_insert(file_path, path=first.path, receiver=cache)
+
+        # Recorded nodes are only built where they differ
+        items = cache_keys(cache.child_args)
+        recorded = [None] * len(items)
+
+        def build(index):
+            if recorded[index] is None:
+                key, start_args, end_args = items[index]
+                item_cache = Macro.TmpCommandCache()
+                item_cache.child_args = cache.child_args[start_args:end_args]
+                recorded[index] = self.create_nodes(item_cache)[0]
+            return recorded[index]
+
+        recorded_keys = [key if key is not None else node_key(build(index)) for index, (key, start_args, end_args) in enumerate(items)]
+
+        merged = []
+        removed = []
+        for tag, i1, i2, j1, j2 in diff([node_key(node) for node in insertions], recorded_keys):
+            if tag == 'equal':
+                merged.extend(insertions[i1:i2])
+            else:
+                removed.extend(insertions[i1:i2])
+                merged.extend(build(index) for index in xrange(j1, j2))
+
+        parent = first.parent
+        self.remove_nodes(removed, notify=False)
+        for node in merged:
+            node.parent = parent
+        parent.children[start:start + len(insertions) - len(removed)] = merged
+
+        self.path_event()
+        self.rebuild_view()
 
     _track_insertions = False
     _insertions = []
@@ -425,12 +567,13 @@ class Macro(lumberjack.Lumberjack):
                 \**kwargs: child args
 
             Returns:
-                None
+                dict: the stored child args
             '''
             tmp = dict(kwargs)
             # Need to remove receiver before deepcopy
             tmp.pop('receiver', None)
             self.child_args.append(copy.deepcopy(tmp))
+            return self.child_args[-1]
 
         def children_create_args(self):
             '''
@@ -445,27 +588,102 @@ class Macro(lumberjack.Lumberjack):
             for args in self.child_args:
                 yield args
 
-    def parse_and_insert_string(self, string, path):
+    def parse_and_insert_string(self, string, path, notify=True):
         '''
         Parse a string and append parsed string to children
 
         Args:
             string (str): command string
             path (str): filepath to macro
+            notify (bool): fire path event and rebuild the view
 
         Returns:
-            nodes (list): list of child nodes
+            nodes (list): list of inserted top-level nodes
         '''
         cache = Macro.TmpCommandCache()
 
         self.parse_LXM_string(string, receiver=cache, path=path)
 
+        return self.insert_cache(cache, notify)
+
+    def insert_cache(self, cache, notify=True):
+        '''
+        Builds the nodes collected in a TmpCommandCache and inserts them into
+        the tree in one go, at the path of the first parsed node.
+
+        Args:
+            cache (TmpCommandCache): parsed child args
+            notify (bool): fire path event and rebuild the view
+
+        Returns:
+            list: inserted top-level nodes
+        '''
+        nodes = self.create_nodes(cache)
+        if nodes:
+            path = cache.child_args[0]['path']
+            self.insert_children(self.node_for_path(path[:-1]), path[-1], nodes, notify)
+        return nodes
+
+    def create_nodes(self, cache):
+        '''
+        Builds the nodes collected in a TmpCommandCache without adding them to
+        the tree. Nodes nested in blocks are added to their block; the
+        top-level nodes are returned, ready for insert_children().
+
+        Args:
+            cache (TmpCommandCache): parsed child args
+
+        Returns:
+            list: top-level nodes, in order
+        '''
         nodes = []
+        # Last block built at each nesting level, relative to the top level
+        blocks = []
+        top_level = None
+
         for kwargs in cache.children_create_args():
-            nodes.append(self.add_child(**kwargs))
+            kwargs = dict(kwargs)
+            path = kwargs.pop('path')
+            kwargs.pop('index', None)
+
+            if top_level is None:
+                top_level = len(path)
+                top_parent = self.node_for_path(path[:-1])
+            depth = len(path) - top_level
+
+            kwargs['parent'] = blocks[depth - 1] if depth > 0 else top_parent
+            node = self.create_child_node(**kwargs)
+            if depth > 0:
+                kwargs['parent'].children.append(node)
+            else:
+                nodes.append(node)
+
+            if isinstance(node, MacroBlockCommand):
+                del blocks[depth:]
+                blocks.append(node)
 
         return nodes
 
+    def read_nodes(self, input_path):
+        '''
+        Parses a macro file into nodes that are not added to the tree, e.g.
+        to compare it with the open macro. The open macro is left as it is.
+
+        Args:
+            input_path (str): macro file path
+
+        Returns:
+            list: top-level nodes, in order
+        '''
+        cache = Macro.TmpCommandCache()
+        file_format = self.file_format
+        try:
+            self._parse_and_insert(input_path, path=[0], receiver=cache)
+        finally:
+            # The parser sets the format of the macro it parses into
+            self.file_format = file_format
+        return self.create_nodes(cache)
+
     def parse(self, mode, input_path):
         '''
         Parse a macro file specified by input_path according to parse mode
@@ -490,16 +708,30 @@ class Macro(lumberjack.Lumberjack):
             self.root.deselect_descendants()
             self.root.delete_descendants()
 
-        for kwargs in cache.children_create_args():
-            self.add_child(**kwargs)
+        self.insert_cache(cache, notify=False)
 
         # Store file path and extension
         if mode == 'open':
             self.file_path = input_path
             self.file_format = format_name
+            self.update_file_stat()
             if len(self.children) != 0:
                 self.select(0)
 
+    def update_file_stat(self):
+        '''
+        Records the modification time and size of the macro file, once it
+        has been read or written, for `MacroDocuments.find()`
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        info = os.stat(self.file_path)
+        self.file_stat = (info.st_mtime, info.st_size)
+
     def parse_and_insert(self, input_path, **kwargs):
         '''
         Parse macro fule specified by input_path and insert
@@ -543,7 +775,7 @@ class Macro(lumberjack.Lumberjack):
                 break
 
         if format_name == "py":
-            self.parse_LXM(input_path, **kwargs)
+            self.parse_Python(input_path, **kwargs)
         elif format_name == 'json':
             self.parse_json(input_path, **kwargs)
         else:
@@ -578,6 +810,9 @@ class Macro(lumberjack.Lumberjack):
             self.kwargs = kwargs
             self.comments = []
             self.meta = []
+            # Last command or block added at each nesting level, which keeps
+            # the comments no command follows
+            self.last = [None]
 
         def buildType(self, type):
             '''
@@ -605,8 +840,16 @@ class Macro(lumberjack.Lumberjack):
             Returns:
                 None
             '''
+            # Commands are built once the file is read, so unknown ones are
+            # caught here, where the parser can report their line
+            full_command = re.search(r'[!?+]*(\S+)', line)
+            if full_command is None:
+                raise Exception("Wrong command")
+            if not CommandCatalog().is_valid(full_command.group(1)):
+                raise Exception("Invalid command %s" % full_command.group(1))
+
             self.kwargs['path'] = self.path
-            self.macro.add_command(command=line, comment=self.comments, meta = self.meta, suppress=suppress, **self.kwargs)
+            self.last[-1] = self.macro.add_command(command=line, comment=self.comments, meta = self.meta, suppress=suppress, **self.kwargs)
             self.path[-1] += 1
 
             self.comments = []
@@ -624,11 +867,12 @@ class Macro(lumberjack.Lumberjack):
                 None
             '''
             self.kwargs['path'] = self.path
-            self.macro.add_block(
+            self.last[-1] = self.macro.add_block(
                 name=block[-1][0], comment=self.comments, meta=self.meta,
                 suppress=suppress, **self.kwargs
             )
             self.path.append(0)
+            self.last.append(None)
 
             self.comments = []
             self.meta = []
@@ -643,12 +887,34 @@ class Macro(lumberjack.Lumberjack):
             Returns:
                 None
             '''
+            self.buildEnd()
             del self.path[-1]
             self.path[-1] += 1
+            self.last.pop()
 
             self.comments = []
             self.meta = []
 
+        def buildEnd(self):
+            '''
+            Keeps the comments read after the last command of the macro or of
+            a block, which no command follows, as comments after that command
+
+            Args:
+                None
+
+            Returns:
+                None
+            '''
+            last = self.last[-1]
+            if self.comments and last is not None:
+                if isinstance(last, dict):
+                    # Not built yet, see TmpCommandCache
+                    last['comment_after'] = self.comments
+                else:
+                    last.user_comment_after = self.comments
+            self.comments = []
+
         def buildMeta(self, name, value):
             '''
             Append name and its assosciated metadata to self.meta
@@ -693,6 +959,25 @@ class Macro(lumberjack.Lumberjack):
         parser = LXMParser()
         builder = Macro.MacroTreeBuilder(self, **kwargs)
         parser.parse(input_path, builder)
+        builder.buildEnd()
+
+    def parse_Python(self, input_path, **kwargs):
+        '''
+        Parse a python macro and store its commands in the commands property.
+        Statements other than lx calls with literal arguments are kept as
+        comments.
+
+        Args:
+            input_path (str): macro file path
+            \**kwargs: MacroBuilder kwargs
+
+        Returns:
+            None
+        '''
+        parser = PythonParser()
+        builder = Macro.MacroTreeBuilder(self, **kwargs)
+        parser.parse(input_path, builder)
+        builder.buildEnd()
 
     def parse_LXM_string(self, string, **kwargs):
         '''
@@ -708,6 +993,7 @@ class Macro(lumberjack.Lumberjack):
         parser = LXMParser()
         builder = Macro.MacroTreeBuilder(self, **kwargs)
         parser.parseString(string, builder)
+        builder.buildEnd()
 
     def parse_json(self, input_path, **kwargs):
         '''
@@ -758,6 +1044,74 @@ class Macro(lumberjack.Lumberjack):
         else:
             self.add_block(block_json=cmdJson, **kwargs)
 
+    def create_json_node(self, cmdJson, parent):
+        '''
+        Builds a command or block from json without adding it to the tree
+
+        Args:
+            cmdJson (dict): json command
+            parent (TreeNode): parent the node will be inserted into
+
+        Returns:
+            MacroCommand or MacroBlockCommand: new node
+        '''
+        if 'command' in cmdJson:
+            return self.create_child_node(type='command', command_json=cmdJson, parent=parent)
+        else:
+            return self.create_child_node(type='block', block_json=cmdJson, parent=parent)
+
+    def insert_json(self, commands_json, path, notify=True):
+        '''
+        Builds commands and blocks from json dicts and inserts them into the
+        tree in one go. No parsing is involved.
+
+        Args:
+            commands_json (list): json dicts as rendered by `render_json()`
+            path (list): path of the first inserted node
+            notify (bool): fire path event and rebuild the view
+
+        Returns:
+            list: inserted nodes
+        '''
+        parent = self.node_for_path(path[:-1])
+        nodes = [self.create_json_node(command_json, parent) for command_json in commands_json]
+        return self.insert_children(parent, path[-1], nodes, notify)
+
+    def batch_edit(self, changes, notify=True):
+        '''
+        Sets properties on many nodes in one go. Suppress flags are stored
+        first and the suppress display is then updated once per affected
+        subtree, rather than once per node. The view is rebuilt and the
+        notifier fired once at the end.
+
+        Args:
+            changes (list): (node, attr, value) tuples, in the order they
+                apply. attr is either a property name or a function taking
+                the node and the value to set.
+            notify (bool): rebuild the view and fire the notifier
+
+        Returns:
+            None
+        '''
+        suppressed = list()
+        for node, attr, value in changes:
+            if callable(attr):
+                attr(node, value)
+            elif attr == 'direct_suppress':
+                node._suppress = value
+                suppressed.append(node)
+            else:
+                setattr(node, attr, value)
+
+        for node in self.top_level_nodes(suppressed):
+            node.update_suppress_for_node_and_descendants()
+
+        if notify:
+            self.unsaved_changes = True
+            self.rebuild_view()
+            notifier = Notifier()
+            notifier.Notify(lx.symbol.fCMDNOTIFY_CHANGE_ALL)
+
     def run(self):
         '''
         Runs the macro.
@@ -905,6 +1259,22 @@ class Macro(lumberjack.Lumberjack):
 
         return res
 
+    def render_json_selected(self):
+        '''
+        Renders the selected commands as json dicts, in the order and shape
+        `render_LXM_selected()` renders them.
+
+        Args:
+            None
+
+        Returns:
+            list: json dicts
+        '''
+        res = []
+        for command in self.commands:
+            res.extend(command.render_json_if_selected())
+        return res
+
     def render_Python(self, output_path):
         '''
         Generates a Python string for export.
@@ -21,17 +21,19 @@ class MacroBaseCommand(lumberjack.TreeNode):
     _suppress = False
     _temporary = False
     _user_comment_before = []
+    _user_comment_after = []
 
     def __init__(self, **kwargs):
         super(MacroBaseCommand, self).__init__(**kwargs)
 
         self._user_comment_before = []
+        self._user_comment_after = []
 
         # Create default enable value object and set formatting
         self.columns['enable'] = lumberjack.TreeValue()
         # self.columns['enable'].icon_resource = 'MIMG_CHECKMARK'
         self.columns['enable'].display_value = ''
-        self.columns['enable'].color.special_by_name('gray')
+        self.columns['enable'].color = lumberjack.Color.by_name('gray')
 
         # Create default dialogs value object and set formatting
         self.columns['prefix'] = lumberjack.TreeValue()
@@ -39,8 +41,8 @@ class MacroBaseCommand(lumberjack.TreeNode):
         # Create default name value object
         self.columns['name'] = lumberjack.TreeValue()
         if kwargs['temporary']:
-            self.columns['name'].font.set_italic()
-            self.columns['name'].color.special_by_name('gray')
+            self.columns['name'].font = lumberjack.Font.italic()
+            self.columns['name'].color = lumberjack.Color.by_name('gray')
             
         self._temporary = kwargs['temporary']
 
@@ -52,6 +54,8 @@ class MacroBaseCommand(lumberjack.TreeNode):
         self.user_comment_before = []
         if bool(kwargs.get('comment')):
             self.user_comment_before = kwargs.get('comment')
+        if bool(kwargs.get('comment_after')):
+            self.user_comment_after = kwargs.get('comment_after')
 
     def draggable(self):
         '''
@@ -200,36 +204,45 @@ class MacroBaseCommand(lumberjack.TreeNode):
         '''
         return True
 
-    def update_suppress_for_node_and_descendants(self):
+    def update_suppress_for_node_and_descendants(self, parent_suppress=None):
         '''
         Updates supression status for node and its children
 
         Args:
-            None
+            parent_suppress (bool): suppression state of the parent, if already
+                known. Passed down to descendants so that they don't each walk
+                back up the tree.
 
         Returns:
             None
         '''
+        suppress = None
         if hasattr(self, 'suppress'):
-            if not self.suppress:
+            if parent_suppress is None:
+                suppress = self.suppress
+            else:
+                suppress = self._suppress or parent_suppress
+
+            if not suppress:
                 # If not suppressed, display a checkmark and store True
                 self.columns['enable'].value = True
                 self.columns['enable'].display_value = ''
                 # self.columns['enable'].icon_resource = 'MIMG_CHECKMARK'
                 if not self._temporary:
-                    self.columns['name'].color.special_by_name('default')
-                    self.columns['prefix'].color.special_by_name('default')
-            elif self.suppress:
+                    self.columns['name'].color = lumberjack.Color.by_name('default')
+                    self.columns['prefix'].color = lumberjack.Color.by_name('default')
+            else:
                 # If it is suppressed, display nothing and store False
                 self.columns['enable'].value = False
                 self.columns['enable'].display_value = '#'
                 # self.columns['enable'].icon_resource = None
-                self.columns['name'].color.special_by_name('gray')
-                self.columns['prefix'].color.special_by_name('gray')
+                self.columns['name'].color = lumberjack.Color.by_name('gray')
+                self.columns['prefix'].color = lumberjack.Color.by_name('gray')
 
-        for child in self.children:
+        # Children that aren't built yet pick up their state when they are.
+        for child in self.loaded_children:
             if hasattr(child, 'suppress'):
-                child.update_suppress_for_node_and_descendants()
+                child.update_suppress_for_node_and_descendants(suppress)
 
     def direct_suppress():
         doc = '''
@@ -311,6 +324,18 @@ class MacroBaseCommand(lumberjack.TreeNode):
             res.append("# " + comment)
         return res
 
+    def render_comments_after(self):
+        '''
+        Renders the comments after the command
+
+        Args:
+            None
+
+        Returns:
+            list: commented lines
+        '''
+        return ["# " + comment for comment in self._user_comment_after]
+
     def comment_before():
         doc = '''
         dict: local context
@@ -351,3 +376,16 @@ class MacroBaseCommand(lumberjack.TreeNode):
         return locals()
 
     user_comment_before = property(**user_comment_before())
+
+    def user_comment_after():
+        doc = '''
+        list: comment lines after the command, kept for comments that no
+        command follows, at the end of a macro or of a block
+        '''
+        def fget(self):
+            return self._user_comment_after
+        def fset(self, value):
+            self._user_comment_after = value
+        return locals()
+
+    user_comment_after = property(**user_comment_after())
@@ -17,6 +17,9 @@ class MacroBlockCommand(MacroBaseCommand):
     '''
     Container class for multiple commands.  Stores MacroCommands as children.
 
+    The block body is built lazily: the command strings or json dicts it was
+    created from are kept in `_pending_children` until the children are needed.
+
     Args:
         \**kwargs: varkwargs
 
@@ -43,7 +46,7 @@ class MacroBlockCommand(MacroBaseCommand):
 
     def add_commands(self, **kwargs):
         '''
-        Add MacroCommands as children
+        Add MacroCommands as children. They are built on demand.
 
         Args:
             \**kwargs: varkwargs
@@ -51,10 +54,37 @@ class MacroBlockCommand(MacroBaseCommand):
         Returns:
             dict: local context
         '''
-        idx = 0
-        for cmd in kwargs.get('block'):
-            self.children.append(MacroCommand(parent=self, command=cmd, temporary=self._temporary, index=idx))
-            idx = idx + 1
+        self._pending_children = list(kwargs.get('block'))
+
+    def build_children(self, pending):
+        '''
+        Builds child nodes from the stored command strings or json dicts.
+
+        Args:
+            pending (list): LXM command strings or json command dicts
+
+        Returns:
+            None
+        '''
+        for command in pending:
+            self._children.append(self.build_child(command))
+
+    def build_child(self, command):
+        '''
+        Builds a single child node
+
+        Args:
+            command (str or dict): LXM command string or json command dict
+
+        Returns:
+            MacroCommand or MacroBlockCommand: new node
+        '''
+        if not isinstance(command, dict):
+            return MacroCommand(parent=self, command=command, temporary=self._temporary)
+        elif 'command' in command:
+            return MacroCommand(parent=self, command_json=command, temporary=self._temporary)
+        else:
+            return MacroBlockCommand(parent=self, block_json=command, temporary=self._temporary)
 
     def name():
         doc = '''
@@ -101,6 +131,7 @@ class MacroBlockCommand(MacroBaseCommand):
                     res.append(("# " if self.direct_suppress else "") + (' '*4 if ident else '') + line)
 
         res.append(("# " if self.direct_suppress else "") + "# Command Block End: %s" % self.name)
+        res.extend(self.render_comments_after())
         return res
 
     def render_LXM_if_selected(self):
@@ -124,6 +155,30 @@ class MacroBlockCommand(MacroBaseCommand):
 
             return res
 
+    def render_json_if_selected(self):
+        '''
+        Render selected commands as json dicts. Selected commands of an
+        unselected, suppressed block are rendered suppressed.
+
+        Args:
+            None
+
+        Returns:
+            list: json dicts
+        '''
+        if self.selected:
+            return [self.render_json()]
+        else:
+            res = []
+            for command in self.children:
+                for command_json in command.render_json_if_selected():
+                    if self.direct_suppress:
+                        key = 'command' if 'command' in command_json else 'command block'
+                        command_json[key]['suppress'] = True
+                    res.append(command_json)
+
+            return res
+
     def render_LXM(self):
         '''
         Renders LXM with "render_LXM" as renderName
@@ -164,11 +219,15 @@ class MacroBlockCommand(MacroBaseCommand):
             command = command.render_json()
             commands.append(command)
 
-        return {"command block" : {"name" : self.name, "suppress": self.direct_suppress, "comment" : self.comment_before, "commands": commands}}
+        block_json = {"command block" : {"name" : self.name, "suppress": self.direct_suppress, "comment" : self.comment_before, "commands": commands}}
+        if self.user_comment_after:
+            block_json["command block"]["comment after"] = self.user_comment_after
+        return block_json
 
     def parse_json(self, json_struct, **kwargs):
         '''
-        Parses json command structure
+        Parses json command structure. Nested commands are kept as json until
+        the block body is needed, unless the controller tracks insertions.
 
         Args:
             json_struct (dict): json command structure
@@ -176,32 +235,20 @@ class MacroBlockCommand(MacroBaseCommand):
 
         Returns:
             None
-
-        .. todo::
-            - method expects type, command_json, block_json and path to be in
-              kwargs, so those should be declared explicitly
-            - Arman: Command doesn't expect them. It just make sure that they are not in kwargs
         '''
         attributes = json_struct['command block']
         self.name = attributes['name']
         self.direct_suppress = attributes['suppress']
         self.comment_before = attributes['comment']
+        self.user_comment_after = list(attributes.get('comment after', []))
+
+        self._pending_children = list(attributes['commands'])
 
-        kwargs.pop('type', None)
-        kwargs.pop('command_json', None)
-        kwargs.pop('block_json', None)
-        kwargs.pop('path', None)
-        kwargs.pop('temporary', None)
-
-        index = 0
-        for command in attributes['commands']:
-            kwargs['index'] = index
-            kwargs['parent'] = self
-            if 'command' in command:
-                self._controller.add_command(command_json = command, **kwargs)
-            else:
-                self._controller.add_block(block_json = command, **kwargs)
-            index += 1
+        # Commands inserted while recording are merged with the built-in
+        # recording later, so they are built now and listed as insertions
+        if self._controller is not None and self._controller.track_insertions:
+            self.materialize_children()
+            self._controller.insertions.extend(self._children)
 
     def run(self):
         '''
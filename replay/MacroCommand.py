@@ -11,6 +11,7 @@ import lumberjack
 from MacroCommandArg import MacroCommandArg
 from MacroBaseCommand import MacroBaseCommand
 from CommandAttributes import CommandAttributes
+from CommandCatalog import CommandCatalog
 
 
 class MacroCommand(MacroBaseCommand):
@@ -22,6 +23,9 @@ class MacroCommand(MacroBaseCommand):
     rendered, but the command will be ignored. This way you can add comment-only
     lines.
 
+    Argument nodes are built lazily: until the tree view or an edit asks for
+    them, argument values are kept as a plain list in `_pending_children`.
+
     Args:
         \**kwargs (object, optional): varkwargs
 
@@ -30,13 +34,27 @@ class MacroCommand(MacroBaseCommand):
     '''
     _args = {}
 
+    # Argument schema per command name, shared by all instances, and the
+    # CommandCatalog generation it was queried in. See command_schema().
+    _command_schemas = {}
+    _schemas_generation = None
+
+    _schema_terms = [
+        'argNames',
+        'argUsernames',
+        'argTypes',
+        'argTypeNames',
+        'argDescs',
+        'argExamples'
+    ]
+
     def __init__(self, **kwargs):
         super(self.__class__, self).__init__(**kwargs)
 
         # Create default command value object and set formatting
         self.columns['command'] = lumberjack.TreeValue()
         # 4113 is a special gray color for grayed out text in modo
-        self.columns['command'].color.special_by_name('gray')
+        self.columns['command'].color = lumberjack.Color.by_name('gray')
         self.columns['command'].input_region = 'MacroCommandCommand'
 
         self.columns['enable'].input_region = 'MacroCommandEnable'
@@ -52,9 +70,6 @@ class MacroCommand(MacroBaseCommand):
         elif bool(kwargs.get('command_json')):
             self.parse_json(kwargs.get('command_json'))
 
-        if self.markedStringArgs is not None:
-            for idx in self.markedStringArgs:
-                self.args[idx].asString = True
 
     def markArgumentAsString(self, index, value=True):
         '''
@@ -74,10 +89,29 @@ class MacroCommand(MacroBaseCommand):
                 if index not in self.markedStringArgs:
                     self.markedStringArgs += [index]
         else:
-            if self.markedStringArgs is not None:
+            if self.markedStringArgs is not None and index in self.markedStringArgs:
                 self.markedStringArgs.remove(index)
+                if not self.markedStringArgs:
+                    self.markedStringArgs = None
+
+        if self._pending_children is None:
+            self._children[index].asString = value
+
+    @staticmethod
+    def string_mark_setter(index):
+        '''
+        Returns a function that sets the asString mark of an argument on a
+        given command. Used to record asString changes in a `SetDelta`.
+
+        Args:
+            index (int): argument index
 
-        self.args[index].asString = value
+        Returns:
+            function: setter taking a MacroCommand and a bool
+        '''
+        def fset(command, value):
+            command.markArgumentAsString(index, value)
+        return fset
 
     def markedAsString(self, index):
         '''
@@ -132,11 +166,11 @@ class MacroCommand(MacroBaseCommand):
             else:
                 return None
         def fset(self, value):
-            if not value in lx.eval('query commandservice commands ?'):
+            if not CommandCatalog().is_valid(value):
                 raise Exception("Invalid command %s" % value)
             self.columns['command'].value = value
             self.retrieve_args()
-            self.columns['name'].value = self.meta['name'] if 'name' in self.meta else self.command_meta()['username']
+            self.columns['name'].value = self.meta['name'] if 'name' in self.meta else self.command_schema(value)['username']
         return locals()
 
     command = property(**command())
@@ -149,7 +183,7 @@ class MacroCommand(MacroBaseCommand):
         def fget(self):
             return self.columns.get('name').value
         def fset(self, value):
-            if value == self.command_meta()['username']:
+            if value == self.command_schema(self.command)['username']:
                 self._meta.pop('name', None)
             else:
                 self._meta['name'] = value
@@ -220,7 +254,7 @@ class MacroCommand(MacroBaseCommand):
         doc = '''
         dict: local context
         The MacroCommand node's arguments, which should all be of class
-        MacroCommandArg.
+        MacroCommandArg. Accessing them builds the argument nodes.
         '''
         def fget(self):
             return self.children
@@ -276,6 +310,7 @@ class MacroCommand(MacroBaseCommand):
         # Retrive command, prefix and comment
         # Comment need to be assigned first to get button name meta before command assignment
         self.comment_before = command_json["comment"]
+        self.user_comment_after = list(command_json.get("comment after", []))
         self.command = command_json["name"]
         self.direct_suppress = command_json["suppress"]
         self.prefix = command_json["prefix"]
@@ -285,12 +320,13 @@ class MacroCommand(MacroBaseCommand):
         json_args = command_json["args"]
 
         # Assign arg values
-        for arg in self.args:
-            json_arg = next((x for x in json_args if x['argName'] == arg.argName))
+        for index, arg_name in enumerate(self.arg_names):
+            json_arg = next((x for x in json_args if x['argName'] == arg_name), None)
             if json_arg is not None:
-                arg.value = None if json_arg['value'] is None else json_arg['value']
+                self.set_arg_value(index, json_arg['value'])
 
-    def get_next_arg_name(self, args_string):
+    @staticmethod
+    def get_next_arg_name(args_string):
         '''
         Gets next argument name
 
@@ -330,7 +366,8 @@ class MacroCommand(MacroBaseCommand):
 
         return result, args_string_left
 
-    def get_next_arg_value(self, args_string):
+    @staticmethod
+    def get_next_arg_value(args_string):
         '''
         Gets next argument value
 
@@ -375,21 +412,38 @@ class MacroCommand(MacroBaseCommand):
         Returns:
             None
         '''
+        for arg_number, arg_value in self.split_args(self.arg_names, args_string):
+            # Set the value of the argument:
+            self.set_arg_value(arg_number, arg_value)
+
+    @classmethod
+    def split_args(cls, arg_names, args_string):
+        '''
+        Splits a string containing arguments into values, without a node.
+
+        Args:
+            arg_names (list): names of the command's arguments
+            args_string (str): modo argument string
+
+        Returns:
+            list: (argument index, value string) tuples, in order
+        '''
+        result = []
         arg_counter = 0
 
-        while args_string and arg_counter < len(self.args):
+        while args_string and arg_counter < len(arg_names):
 
             # Get the next argument's name (if given) and value:
-            arg_name, args_string = self.get_next_arg_name(args_string)
-            arg_value, args_string = self.get_next_arg_value(args_string)
+            arg_name, args_string = cls.get_next_arg_name(args_string)
+            arg_value, args_string = cls.get_next_arg_value(args_string)
             if not arg_value: break
 
             # Get the argument number:
             if arg_name:
 
                 # Check if the name of the argument is correct:
-                if arg_name in [self.args[i].argName for i in range(len(self.args))]:
-                    arg_number = [self.args[i].argName for i in range(len(self.args))].index(arg_name)
+                if arg_name in arg_names:
+                    arg_number = arg_names.index(arg_name)
                 else:
                     raise Exception("Wrong argument name.")
 
@@ -397,17 +451,20 @@ class MacroCommand(MacroBaseCommand):
 
                 arg_number = arg_counter
 
-            # Set the value of the argument:
-            self.args[arg_number].value = arg_value
+            result.append((arg_number, arg_value))
 
             # Increase the argument counter, and check if it's not out of bounds:
-            if arg_counter == len(self.args):
+            if arg_counter == len(arg_names):
                 raise Exception("Error in parsing: too many arguments detected.")
             arg_counter += 1
 
+        return result
+
     def retrieve_args(self):
         '''
-        Retrieves a list of arguments and datatypes from modo's commandservice.
+        Resets the argument list for the current command. Only the argument
+        values are stored; MacroCommandArg nodes are built on demand by
+        build_children().
         See http://sdk.luxology.com/wiki/Commandservice#command.argNames
 
         Args:
@@ -419,20 +476,122 @@ class MacroCommand(MacroBaseCommand):
         if not self.command:
             raise Exception("Command string not set.")
 
-        # Names of the arguments for the current command.
-        argNames = lx.evalN("query commandservice command.argNames ? {%s}" % self.command)
+        self._children = []
+        self._pending_children = [None] * len(self.arg_names)
 
-        # No arguments to add
-        if not argNames:
-            return
+    def build_children(self, pending):
+        '''
+        Builds MacroCommandArg nodes from the stored argument values.
 
-        # Populate the list.
-        for n in range(len(argNames)):
-            self.args.append(MacroCommandArg(
+        Args:
+            pending (list): argument values
+
+        Returns:
+            None
+        '''
+        for n in range(len(pending)):
+            arg = MacroCommandArg(
                 parent=self,
                 arg_index=n,
                 controller=self._controller
-            ))
+            )
+            arg.value = pending[n]
+            self._children.append(arg)
+
+        if self.markedStringArgs is not None:
+            for idx in self.markedStringArgs:
+                self._children[idx].asString = True
+
+    @classmethod
+    def command_schema(cls, command):
+        '''
+        Returns the argument schema and username of a command. Queried from
+        modo's commandservice once per command and cached until modo's command
+        set changes.
+
+        Args:
+            command (str): modo command name, e.g. "item.name"
+
+        Returns:
+            dict: lists keyed by commandservice query term (argNames,
+            argUsernames, argTypes, argTypeNames, argDescs, argExamples),
+            plus 'username'
+        '''
+        # A plugin may have redefined commands since the schemas were queried
+        generation = CommandCatalog().generation
+        if cls._schemas_generation != generation:
+            cls._command_schemas.clear()
+            cls._schemas_generation = generation
+
+        schema = cls._command_schemas.get(command)
+        if schema is None:
+            schema = {}
+            # Note the use of `lx.evalN` as opposed to the normal `lx.eval`. We need to be certain
+            # that we always receive a list in response, even if the list length is 1.
+            for term in cls._schema_terms:
+                schema[term] = lx.evalN('query commandservice command.%s ? {%s}' % (term, command))
+            schema['username'] = lx.eval('query commandservice command.username ? {%s}' % command)
+            cls._command_schemas[command] = schema
+        return schema
+
+    def arg_names():
+        doc = '''
+        list: names of the command's arguments, in order
+        '''
+        def fget(self):
+            if not self.command:
+                return []
+            return self.command_schema(self.command)['argNames']
+        return locals()
+
+    arg_names = property(**arg_names())
+
+    def arg_meta(self, index):
+        '''
+        Returns commandservice metadata for an argument
+
+        Args:
+            index (int): argument index
+
+        Returns:
+            dict: argName, argUsername, argType, argTypeName, argDesc, argExample
+        '''
+        schema = self.command_schema(self.command)
+        meta = {}
+        for term in self._schema_terms:
+            # Remove the last character from the term to make it singular (argNames becomes argName)
+            meta[term[:-1]] = schema[term][index]
+        return meta
+
+    def arg_value(self, index):
+        '''
+        Gets an argument value without building argument nodes
+
+        Args:
+            index (int): argument index
+
+        Returns:
+            str or None: argument value
+        '''
+        if self._pending_children is not None:
+            return self._pending_children[index]
+        return self._children[index].value
+
+    def set_arg_value(self, index, value):
+        '''
+        Sets an argument value without building argument nodes
+
+        Args:
+            index (int): argument index
+            value (object): argument value
+
+        Returns:
+            None
+        '''
+        if self._pending_children is not None:
+            self._pending_children[index] = MacroCommandArg.convert_string_to_value(value)
+        else:
+            self._children[index].value = value
 
 
     def command_meta(self):
@@ -485,6 +644,7 @@ class MacroCommand(MacroBaseCommand):
             res.append("# replay suppress:")
 
         res.append(("# " if self.direct_suppress else "") + self.render_LXM_without_comment())
+        res.extend(self.render_comments_after())
         return res
 
     def render_LXM_if_selected(self):
@@ -502,6 +662,21 @@ class MacroCommand(MacroBaseCommand):
         else:
             return []
 
+    def render_json_if_selected(self):
+        '''
+        Renders selected nodes as a list of json dicts
+
+        Args:
+            None
+
+        Returns:
+            list: json dicts
+        '''
+        if self.selected:
+            return [self.render_json()]
+        else:
+            return []
+
     def render_LXM_without_comment(self):
         '''
         Construct modo command string from stored internal parts without comments
@@ -518,16 +693,20 @@ class MacroCommand(MacroBaseCommand):
         )
 
         def wrap_quote(value):
-            if re.search(r"\W", value):
+            # Values with double quotes in them can only be wrapped in braces
+            if '"' in value:
+                return "{{{0}}}".format(value)
+            elif re.search(r"\W", value):
                 return "\"{0}\"".format(value)
             else:
                 return value
 
-        for arg in self.args:
-            if arg.value is not None:
+        for index, arg_name in enumerate(self.arg_names):
+            value = self.arg_value(index)
+            if value is not None:
                 result += " {name}:{value}".format(
-                    name=arg.argName,
-                    value=wrap_quote(str(arg.value))
+                    name=arg_name,
+                    value=wrap_quote(str(value))
                 )
         return result
 
@@ -551,6 +730,7 @@ class MacroCommand(MacroBaseCommand):
                 )
             )
         )
+        res.extend(self.render_comments_after())
         return res
 
     def render_json(self):
@@ -569,18 +749,13 @@ class MacroCommand(MacroBaseCommand):
         )
 
         args_list = list()
-        for arg in self.args:
-            arg_dict = dict()
-            arg_dict['value'] = arg.value
-            arg_dict['argName'] = arg.argName
-            arg_dict['argUsername'] = arg.argUsername
-            arg_dict['argType'] = arg.argType
-            arg_dict['argTypeName'] = arg.argTypeName
-            arg_dict['argDesc'] = arg.argDesc
-            arg_dict['argExample'] = arg.argExample
+        for index in range(len(self.arg_names)):
+            arg_dict = self.arg_meta(index)
+            arg_dict['value'] = self.arg_value(index)
+            arg_dict['argUsername'] = MacroCommandArg.username_markup(arg_dict['argUsername'], arg_dict['argName'])
             args_list.append(arg_dict)
 
-        return {
+        command_json = {
             "command": {
                 "name": self.command,
                 "prefix": self.prefix,
@@ -589,6 +764,9 @@ class MacroCommand(MacroBaseCommand):
                 "args": args_list
             }
         }
+        if self.user_comment_after:
+            command_json["command"]["comment after"] = self.user_comment_after
+        return command_json
 
     def run(self):
         '''
@@ -55,7 +55,7 @@ class MacroCommandArg(lumberjack.TreeNode):
         # and the argument's username (nice name) as a `display_value`
         self.columns['name'] = lumberjack.TreeValue()
         self.columns['name'].input_region = 'MacroCommandArg'
-        self.columns['name'].color.special_by_name('gray')
+        self.columns['name'].color = lumberjack.Color.by_name('gray')
 
         # Query argument metadata
         self.retreive_arg_meta()
@@ -183,9 +183,9 @@ class MacroCommandArg(lumberjack.TreeNode):
             self.columns['command'].value = self.convert_string_to_value(value)
 
             if self.columns['command'].value is None:
-                self.columns['name'].color.special_by_name('gray')
+                self.columns['name'].color = lumberjack.Color.by_name('gray')
             else:
-                self.columns['name'].color.special_by_name('default')
+                self.columns['name'].color = lumberjack.Color.by_name('default')
         return locals()
 
     value = property(**value())
@@ -341,35 +341,37 @@ class MacroCommandArg(lumberjack.TreeNode):
             return
 
         # Names of the arguments for the current command.
-        if not lx.evalN("query commandservice command.argNames ? {%s}" % base_command):
+        if not self.parent.arg_names:
             raise Exception("Parent command has no args. Why do I exist? (Big Questions In Life)")
             return
 
+        # The parent caches the commandservice schema per command,
+        # so building many arguments doesn't query modo again.
+        meta = self.parent.arg_meta(arg_index)
+
         # Unlike other metadata, we store these two directly inside the value objects for the columns.
-        values_list = lx.evalN("query commandservice command.argNames ? {%s}" % base_command)
-        self.argName = values_list[arg_index]
-
-        values_list = lx.evalN("query commandservice command.argUsernames ? {%s}" % base_command)
-        self.argUsername = "%s \x03(c:4113)(%s)" % (values_list[arg_index], self.argName)
-
-        # These are the ones I care about for now. If there are others later, we can add them.
-        query_terms = [
-            'argTypes',
-            'argTypeNames',
-            'argDescs',
-            'argExamples'
-        ]
-
-        # The list of query_terms is arbitrary. I'm just grabbing everything I think is important.
-        for term in query_terms:
-            # Remove the last character from the term to make it singular (argNames becomes argName)
-            property_name = term[:-1]
-            # Get the full list of values (for all args)
-            # Note the use of `lx.evalN` as opposed to the normal `lx.eval`. We need to be certain
-            # that we always receive a list in response, even if the list length is 1.
-            values_list = lx.evalN('query commandservice command.%s ? {%s}' % (term, base_command))
-            # Run the query.
-            setattr(self, property_name, values_list[arg_index])
+        self.argName = meta['argName']
+        self.argUsername = self.username_markup(meta['argUsername'], self.argName)
+
+        self.argType = meta['argType']
+        self.argTypeName = meta['argTypeName']
+        self.argDesc = meta['argDesc']
+        self.argExample = meta['argExample']
+
+    @staticmethod
+    def username_markup(username, arg_name):
+        '''
+        Formats an argument username for display, followed by the grayed out
+        internal argument name.
+
+        Args:
+            username (str): argument username
+            arg_name (str): argument name
+
+        Returns:
+            str: display string
+        '''
+        return "%s \x03(c:4113)(%s)" % (username, arg_name)
 
     def parse_string(self, command_string):
         '''
@@ -412,7 +414,8 @@ class MacroCommandArg(lumberjack.TreeNode):
         self._args[arg_number]['argValues'] = arg_value
 
 
-    def convert_string_to_value(self, arg_value):
+    @staticmethod
+    def convert_string_to_value(arg_value):
         '''
         Convenience method for converting strings to argument values
 
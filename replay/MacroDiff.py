@@ -0,0 +1,507 @@
+# python
+'''
+The MacroDiff module compares sequences of macro nodes: node_key reduces a
+command or block to a comparable key, command_key and cache_keys give the
+same keys for parsed commands before their nodes are built, and diff lists
+the edits between two sequences of keys. tree_diff and merge3 build on them
+to compare two macros and merge the changes of two macros to a third.
+'''
+import re
+from collections import namedtuple
+from MacroCommand import MacroCommand
+from MacroCommandArg import MacroCommandArg
+from MacroBlockCommand import MacroBlockCommand
+
+
+def node_key(node):
+    '''
+    Comparable key of a command or block: its prefix, command and argument
+    values, so that commands compare equal however their arguments were
+    written. Names, comments and colors are not part of the key.
+
+    Args:
+        node (MacroBaseCommand): command or block
+
+    Returns:
+        tuple: hashable key
+    '''
+    if isinstance(node, MacroBlockCommand):
+        return ('block', bool(node.direct_suppress), tuple(node_key(child) for child in node.children))
+    values = tuple(MacroCommandArg.convert_string_to_value(node.arg_value(index)) for index in xrange(len(node.arg_names)))
+    return ('command', bool(node.direct_suppress), node.prefix or '', node.command, values)
+
+
+def command_key(command, suppress=False):
+    '''
+    Key of a modo command string, as node_key gives it for the MacroCommand
+    parsed from it, without building the node.
+
+    Args:
+        command (str): modo command string
+        suppress (bool): whether the command is suppressed
+
+    Returns:
+        tuple: hashable key
+    '''
+    full_command = re.search(r'([!?+]*)(\S+)', command)
+    if full_command is None:
+        raise Exception("Wrong command")
+
+    name = full_command.group(2)
+    arg_names = MacroCommand.command_schema(name)['argNames']
+    values = [None] * len(arg_names)
+    for index, value in MacroCommand.split_args(arg_names, command[len(full_command.group(0)):]):
+        values[index] = MacroCommandArg.convert_string_to_value(value)
+    return ('command', bool(suppress), full_command.group(1), name, tuple(values))
+
+
+def cache_keys(child_args):
+    '''
+    Keys of the top-level nodes parsed into a Macro.TmpCommandCache, as
+    node_key gives them, without building the nodes. Nodes nested in blocks
+    follow their block in child_args, with longer paths.
+
+    Args:
+        child_args (list): child args of a TmpCommandCache
+
+    Returns:
+        list: (key, start, end) tuples, child_args[start:end] being the
+        node and its descendants. key is None for nodes only known once
+        built, e.g. from json.
+    '''
+    def read(index):
+        kwargs = child_args[index]
+        depth = len(kwargs['path'])
+        index += 1
+        if kwargs.get('type') == 'command' and isinstance(kwargs.get('command'), basestring):
+            key = command_key(kwargs['command'], kwargs.get('suppress'))
+        elif kwargs.get('type') == 'block' and not kwargs.get('block') and not kwargs.get('block_json'):
+            keys = []
+            while index < len(child_args) and len(child_args[index]['path']) > depth:
+                child_key, index = read(index)
+                keys.append(child_key)
+            key = None if None in keys else ('block', bool(kwargs.get('suppress')), tuple(keys))
+        else:
+            key = None
+
+        while index < len(child_args) and len(child_args[index]['path']) > depth:
+            index += 1
+        return key, index
+
+    result = []
+    index = 0
+    while index < len(child_args):
+        key, end = read(index)
+        result.append((key, index, end))
+        index = end
+    return result
+
+
+def diff(a, b, max_cost=2000):
+    '''
+    Lists the edits turning sequence a into sequence b, with the Myers
+    algorithm: a shortest edit script, found in O((N + M) D) time for D
+    differences. Common leading and trailing items are matched first.
+
+    Past `max_cost` differences the differing middle is listed as a single
+    replace, which keeps the time and memory bounded on unrelated sequences.
+
+    Args:
+        a (list): hashable items
+        b (list): hashable items
+        max_cost (int): most insertions and deletions searched, or None
+
+    Returns:
+        list: (tag, i1, i2, j1, j2) tuples as difflib.SequenceMatcher's
+        get_opcodes() returns them, tag one of 'equal', 'replace', 'delete'
+        and 'insert'
+    '''
+    n = len(a)
+    m = len(b)
+    start = 0
+    while start < n and start < m and a[start] == b[start]:
+        start += 1
+    end_a = n
+    end_b = m
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+
+    # Runs of equal items, as (i, j, length)
+    runs = [(0, 0, start)]
+    middle = _myers(a[start:end_a], b[start:end_b], max_cost)
+    if middle is not None:
+        runs.extend((start + i, start + j, length) for i, j, length in middle)
+    runs.append((end_a, end_b, n - end_a))
+
+    opcodes = []
+    i = 0
+    j = 0
+    for run_i, run_j, length in runs:
+        if i < run_i or j < run_j:
+            tag = 'replace' if i < run_i and j < run_j else ('delete' if i < run_i else 'insert')
+            opcodes.append((tag, i, run_i, j, run_j))
+        if length:
+            if opcodes and opcodes[-1][0] == 'equal':
+                # Runs meeting end to end
+                opcodes[-1] = ('equal', opcodes[-1][1], run_i + length, opcodes[-1][3], run_j + length)
+            else:
+                opcodes.append(('equal', run_i, run_i + length, run_j, run_j + length))
+        i = run_i + length
+        j = run_j + length
+    return opcodes
+
+
+def _myers(a, b, max_cost):
+    # Returns the runs of equal items of a shortest edit script, in order,
+    # or None past max_cost
+    n = len(a)
+    m = len(b)
+    if not n or not m:
+        return []
+
+    max_d = n + m if max_cost is None else min(n + m, max_cost)
+    offset = max_d + 1
+    # Furthest x reached on each diagonal k = x - y, at offset + k
+    v = [0] * (2 * max_d + 3)
+    # Diagonals -d - 1 to d + 1 of v, as they were before each step d
+    trace = []
+
+    for d in xrange(max_d + 1):
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in xrange(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace, x, y):
+    runs = []
+    for d in xrange(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if d == 0:
+            start_x = 0
+            prev_x = prev_y = 0
+        else:
+            if k == -d or (k != d and v[k - 1 + d + 1] < v[k + 1 + d + 1]):
+                # Down from diagonal k + 1: an item of b inserted
+                prev_k = k + 1
+                prev_x = v[prev_k + d + 1]
+                start_x = prev_x
+            else:
+                # Right from diagonal k - 1: an item of a deleted
+                prev_k = k - 1
+                prev_x = v[prev_k + d + 1]
+                start_x = prev_x + 1
+            prev_y = prev_x - prev_k
+        if x > start_x:
+            runs.append((start_x, start_x - k, x - start_x))
+        x = prev_x
+        y = prev_y
+    runs.reverse()
+    return runs
+
+
+# A difference found by tree_diff(). tag is 'equal', 'delete', 'insert',
+# 'change' or 'move'. old and new are the nodes, None where missing, and
+# old_index and new_index their indices among their siblings. children lists
+# the differences inside a changed block.
+DiffEntry = namedtuple('DiffEntry', ['tag', 'old', 'new', 'old_index', 'new_index', 'children'])
+
+# Nodes merge3() couldn't merge: the base's, ours and theirs, as lists.
+MergeConflict = namedtuple('MergeConflict', ['base', 'ours', 'theirs'])
+
+# A block merge3() merged the children of: ours, and the merged children.
+MergedBlock = namedtuple('MergedBlock', ['block', 'children'])
+
+# Comment lines around the two sides of a conflict in merged macros
+conflict_markers = ('<<<<<<< ours', '=======', '>>>>>>> theirs')
+
+
+def identity_key(node):
+    '''
+    What makes two nodes the same node edited: the command, or the block
+    name. Differing nodes of the same identity are reported as changes.
+
+    Args:
+        node (MacroBaseCommand): command or block
+
+    Returns:
+        tuple: hashable key
+    '''
+    if isinstance(node, MacroBlockCommand):
+        return ('block', node.name)
+    return ('command', node.command)
+
+
+def tree_diff(old_nodes, new_nodes):
+    '''
+    Compares two sequences of nodes, e.g. the top-level nodes of two
+    macros. Nodes are matched by node_key, so names, comments and colors
+    are not compared, and blocks as a whole. Among the nodes that differ,
+    nodes of the same command or block name are paired as changes, and
+    changed blocks are compared in turn. A deleted node inserted elsewhere
+    is reported once, as moved.
+
+    Args:
+        old_nodes (list): nodes
+        new_nodes (list): nodes
+
+    Returns:
+        list: DiffEntry tuples, in the order of new_nodes with deleted nodes
+        where they were
+    '''
+    old_keys = [node_key(node) for node in old_nodes]
+    new_keys = [node_key(node) for node in new_nodes]
+
+    entries = []
+    for tag, i1, i2, j1, j2 in diff(old_keys, new_keys):
+        if tag == 'equal':
+            for offset in xrange(i2 - i1):
+                entries.append(DiffEntry('equal', old_nodes[i1 + offset], new_nodes[j1 + offset], i1 + offset, j1 + offset, []))
+            continue
+
+        # Pair up the differing nodes of the same command or block
+        old_run = [identity_key(node) for node in old_nodes[i1:i2]]
+        new_run = [identity_key(node) for node in new_nodes[j1:j2]]
+        for run_tag, a1, a2, b1, b2 in diff(old_run, new_run):
+            if run_tag == 'equal':
+                for offset in xrange(a2 - a1):
+                    i = i1 + a1 + offset
+                    j = j1 + b1 + offset
+                    old = old_nodes[i]
+                    new = new_nodes[j]
+                    children = []
+                    if isinstance(new, MacroBlockCommand) and old.direct_suppress == new.direct_suppress:
+                        children = tree_diff(old.children, new.children)
+                    entries.append(DiffEntry('change', old, new, i, j, children))
+            else:
+                for i in xrange(i1 + a1, i1 + a2):
+                    entries.append(DiffEntry('delete', old_nodes[i], None, i, None, []))
+                for j in xrange(j1 + b1, j1 + b2):
+                    entries.append(DiffEntry('insert', None, new_nodes[j], None, j, []))
+
+    # Deleted nodes inserted elsewhere were moved
+    deleted = {}
+    for index, entry in enumerate(entries):
+        if entry.tag == 'delete':
+            deleted.setdefault(old_keys[entry.old_index], []).append(index)
+    if not deleted:
+        return entries
+
+    moved = set()
+    for index, entry in enumerate(entries):
+        if entry.tag == 'insert' and deleted.get(new_keys[entry.new_index]):
+            old_entry = entries[deleted[new_keys[entry.new_index]].pop(0)]
+            moved.add(old_entry.old_index)
+            entries[index] = DiffEntry('move', old_entry.old, entry.new, old_entry.old_index, entry.new_index, [])
+    return [entry for entry in entries if entry.tag != 'delete' or entry.old_index not in moved]
+
+
+def describe(node):
+    '''
+    One line description of a node for diff reports.
+
+    Args:
+        node (MacroBaseCommand): command or block
+
+    Returns:
+        str: description
+    '''
+    if isinstance(node, MacroBlockCommand):
+        text = 'Block: %s' % node.name
+    else:
+        text = node.render_LXM_without_comment()
+    return '# ' + text if node.direct_suppress else text
+
+
+def format_diff(entries, context=False, depth=0):
+    '''
+    Lists tree_diff() entries as text lines: '-' deleted, '+' inserted, '~'
+    changed and '>' moved, each with its 1-based position among its
+    siblings. Block contents are indented.
+
+    Args:
+        entries (list): DiffEntry tuples
+        context (bool): list the equal nodes too
+        depth (int): block nesting depth of the entries
+
+    Returns:
+        list: lines
+    '''
+    indent = '    ' * depth
+    lines = []
+    for entry in entries:
+        if entry.tag == 'equal':
+            if context:
+                lines.append('  %s%d %s' % (indent, entry.new_index + 1, describe(entry.new)))
+        elif entry.tag == 'delete':
+            lines.append('- %s%d %s' % (indent, entry.old_index + 1, describe(entry.old)))
+        elif entry.tag == 'insert':
+            lines.append('+ %s%d %s' % (indent, entry.new_index + 1, describe(entry.new)))
+        elif entry.tag == 'move':
+            lines.append('> %s%d %s (was %d)' % (indent, entry.new_index + 1, describe(entry.new), entry.old_index + 1))
+        else:
+            lines.append('~ %s%d %s' % (indent, entry.new_index + 1, describe(entry.new)))
+            if entry.children:
+                lines.extend(format_diff(entry.children, context, depth + 1))
+            else:
+                lines.append('  %s  was %s' % (indent, describe(entry.old)))
+    return lines
+
+
+def changed_nodes(entries):
+    '''
+    The new nodes of tree_diff() entries that are not equal, innermost
+    first in changed blocks.
+
+    Args:
+        entries (list): DiffEntry tuples
+
+    Returns:
+        list: nodes
+    '''
+    nodes = []
+    for entry in entries:
+        if entry.tag == 'change' and entry.children:
+            nodes.extend(changed_nodes(entry.children))
+        elif entry.tag in ('insert', 'change', 'move'):
+            nodes.append(entry.new)
+    return nodes
+
+
+def merge3(base, ours, theirs):
+    '''
+    Three-way merge of two edited copies of a macro. Where only one side
+    changed a run of nodes, its change is taken; where both made the same
+    change, it is taken once; a block both sides changed differently is
+    merged child by child; anything else is a conflict. Of nodes equal by
+    node_key, theirs is taken if only theirs changed names, comments or
+    colors, and ours otherwise.
+
+    Args:
+        base (list): nodes of the common ancestor
+        ours (list): nodes of our copy
+        theirs (list): nodes of their copy
+
+    Returns:
+        list: nodes, MergedBlock and MergeConflict tuples, in order
+    '''
+    base_keys = [node_key(node) for node in base]
+    our_keys = [node_key(node) for node in ours]
+    their_keys = [node_key(node) for node in theirs]
+
+    def matches(keys):
+        # Index in keys matching each base node, or None
+        result = [None] * len(base)
+        for tag, i1, i2, j1, j2 in diff(base_keys, keys):
+            if tag == 'equal':
+                for offset in xrange(i2 - i1):
+                    result[i1 + offset] = j1 + offset
+        return result
+
+    ours_at = matches(our_keys)
+    theirs_at = matches(their_keys)
+
+    merged = []
+    i = a = b = 0
+    while i < len(base) or a < len(ours) or b < len(theirs):
+        if i < len(base) and ours_at[i] == a and theirs_at[i] == b:
+            # Stable: the same node on all three sides
+            same = tuple(ours[a].render_LXM()) == tuple(base[i].render_LXM())
+            merged.append(theirs[b] if same else ours[a])
+            i += 1
+            a += 1
+            b += 1
+            continue
+
+        # The next base node both sides still have
+        end = i
+        while end < len(base) and (ours_at[end] is None or theirs_at[end] is None):
+            end += 1
+        end_a = ours_at[end] if end < len(base) else len(ours)
+        end_b = theirs_at[end] if end < len(base) else len(theirs)
+
+        base_run = base_keys[i:end]
+        our_run = our_keys[a:end_a]
+        their_run = their_keys[b:end_b]
+        if our_run == base_run:
+            merged.extend(theirs[b:end_b])
+        elif their_run == base_run or our_run == their_run:
+            merged.extend(ours[a:end_a])
+        elif len(base_run) == len(our_run) == len(their_run) == 1 and \
+                isinstance(ours[a], MacroBlockCommand) and \
+                identity_key(base[i]) == identity_key(ours[a]) == identity_key(theirs[b]):
+            merged.append(MergedBlock(ours[a], merge3(base[i].children, ours[a].children, theirs[b].children)))
+        else:
+            merged.append(MergeConflict(base[i:end], ours[a:end_a], theirs[b:end_b]))
+        i, a, b = end, end_a, end_b
+
+    return merged
+
+
+def conflicts(merged):
+    '''
+    Counts the conflicts in merge3() results, in blocks too.
+
+    Args:
+        merged (list): merge3() results
+
+    Returns:
+        int: number of conflicts
+    '''
+    count = 0
+    for item in merged:
+        if isinstance(item, MergeConflict):
+            count += 1
+        elif isinstance(item, MergedBlock):
+            count += conflicts(item.children)
+    return count
+
+
+def render_merge(merged):
+    '''
+    Renders merge3() results as LXM lines, without the shebang. Both sides
+    of a conflict are kept, between comment lines with conflict_markers,
+    which Replay shows as comments on the lines that follow them, or after
+    the last line when a conflict ends the macro or a block.
+
+    Args:
+        merged (list): merge3() results
+
+    Returns:
+        list: LXM lines
+    '''
+    lines = []
+    for item in merged:
+        if isinstance(item, MergeConflict):
+            lines.append('# ' + conflict_markers[0])
+            for node in item.ours:
+                lines.extend(node.render_LXM())
+            lines.append('# ' + conflict_markers[1])
+            for node in item.theirs:
+                lines.extend(node.render_LXM())
+            lines.append('# ' + conflict_markers[2])
+        elif isinstance(item, MergedBlock):
+            block = item.block
+            prefix = '# ' if block.direct_suppress else ''
+            lines.extend(block.render_comments())
+            if block.direct_suppress:
+                lines.append('# replay suppress:')
+            lines.append(prefix + '# Command Block Begin: %s' % block.name)
+            for line in render_merge(item.children):
+                lines.append(prefix + (line if line.startswith('#') else ' ' * 4 + line))
+            lines.append(prefix + '# Command Block End: %s' % block.name)
+        else:
+            lines.extend(item.render_LXM())
+    return lines
@@ -0,0 +1,232 @@
+# python
+'''
+The MacroDocuments module contains the MacroDocuments class, which keeps the
+macros open in Replay, and the MacroDocument class, which holds one of them
+while another one is shown
+'''
+import os
+from Macro import Macro
+
+
+class MacroDocument(object):
+    '''
+    An open macro: its top-level nodes and the `Macro()` state that belongs
+    to them. While a document is shown, its state lives in `Macro()` itself
+    and is copied back here when another document is shown.
+
+    Args:
+        None
+
+    Returns:
+        MacroDocument
+    '''
+    def __init__(self):
+        self.children = []
+        self.primary = None
+        self.file_path = None
+        self.file_format = None
+        self.file_stat = None
+        self.unsaved_changes = False
+
+    def title():
+        doc = '''
+        str: file name of the macro, or None if it has never been saved
+        '''
+        def fget(self):
+            if self.file_path:
+                return os.path.basename(self.file_path)
+            return None
+        return locals()
+
+    title = property(**title())
+
+
+class MacroDocuments(object):
+    '''
+    The macros open in Replay. One of them, the active document, is shown in
+    `Macro()`; the others keep their nodes as they were, so switching between
+    documents only swaps the children of the tree's root and a few class
+    variables, without reading any file again.
+
+    Everything `Macro()` caches outside the tree is shared by the documents:
+    command schemas, the command catalog and the clipboard, which copies
+    commands between them. A file that is already open and unchanged on disk
+    is shown again rather than read again (see `find()`).
+
+    Undo steps keep the nodes they change, and undoing a step of a hidden
+    document shows that document first (see `UndoJournal`).
+
+    Like `Macro()`, the documents work entirely with class variables.
+
+    Args:
+        None
+
+    Returns:
+        MacroDocuments
+    '''
+    _documents = []
+    _active = 0
+
+    def documents():
+        doc = '''
+        list: MacroDocument of each open macro, in the order they were opened.
+        The active document is brought up to date with `Macro()` first.
+        '''
+        def fget(self):
+            if not self.__class__._documents:
+                self.__class__._documents.append(MacroDocument())
+                self.__class__._active = 0
+            self.store()
+            return self.__class__._documents
+        return locals()
+
+    documents = property(**documents())
+
+    def active():
+        doc = '''
+        int: index of the document shown in `Macro()`
+        '''
+        def fget(self):
+            return self.__class__._active
+        return locals()
+
+    active = property(**active())
+
+    def store(self):
+        '''
+        Copies the state of `Macro()` to the active document
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        macro = Macro()
+        document = self.__class__._documents[self.__class__._active]
+        document.children = macro.root.children
+        document.primary = macro.primary
+        document.file_path = macro.file_path
+        document.file_format = macro.file_format
+        document.file_stat = macro.file_stat
+        document.unsaved_changes = macro.unsaved_changes
+
+    def restore(self, document):
+        '''
+        Shows a document in `Macro()`. The view is not rebuilt.
+
+        Args:
+            document (MacroDocument): document to show
+
+        Returns:
+            None
+        '''
+        macro = Macro()
+        macro.root.children = document.children
+        macro.primary = document.primary
+        macro.file_path = document.file_path
+        macro.file_format = document.file_format
+        macro.file_stat = document.file_stat
+        macro.unsaved_changes = document.unsaved_changes
+        macro.reset_color_on_select = False
+        macro.invalidate_argument_index()
+
+    def switch(self, index):
+        '''
+        Shows another open document. The view is not rebuilt.
+
+        Args:
+            index (int): document index
+
+        Returns:
+            MacroDocument: the document now shown
+        '''
+        documents = self.documents
+        if not 0 <= index < len(documents):
+            raise IndexError("No open macro at index %s" % index)
+        if index != self.__class__._active:
+            self.__class__._active = index
+            self.restore(documents[index])
+        return documents[index]
+
+    def new(self):
+        '''
+        Opens an empty document and shows it. The view is not rebuilt.
+
+        Args:
+            None
+
+        Returns:
+            MacroDocument: the new document
+        '''
+        documents = self.documents
+        documents.append(MacroDocument())
+        return self.switch(len(documents) - 1)
+
+    def close(self, index=None):
+        '''
+        Closes a document without saving it. If it was shown, the document
+        after it is shown instead, or the one before it if it was the last.
+        Closing the only document leaves an empty one. The view is not
+        rebuilt.
+
+        Args:
+            index (int): document index. Default: the active document
+
+        Returns:
+            None
+        '''
+        documents = self.documents
+        active = self.__class__._active
+        if index is None:
+            index = active
+        if not 0 <= index < len(documents):
+            raise IndexError("No open macro at index %s" % index)
+
+        del documents[index]
+        if not documents:
+            documents.append(MacroDocument())
+
+        if index < active:
+            self.__class__._active = active - 1
+        elif index == active:
+            self.__class__._active = min(index, len(documents) - 1)
+            self.restore(documents[self.__class__._active])
+
+    def find(self, file_path, unchanged=False):
+        '''
+        Returns the open document of a macro file
+
+        Args:
+            file_path (str): macro file path
+            unchanged (bool): only if the file hasn't changed since it was opened
+
+        Returns:
+            int: document index, or None if the file isn't open
+        '''
+        key = os.path.normcase(os.path.abspath(file_path))
+        for index, document in enumerate(self.documents):
+            if document.file_path and os.path.normcase(os.path.abspath(document.file_path)) == key:
+                if not unchanged:
+                    return index
+                try:
+                    info = os.stat(file_path)
+                except OSError:
+                    return None
+                if document.file_stat == (info.st_mtime, info.st_size):
+                    return index
+        return None
+
+    def titles(self, untitled):
+        '''
+        Returns a display name for each open document, marked with an
+        asterisk if it has unsaved changes
+
+        Args:
+            untitled (str): name of documents that have never been saved
+
+        Returns:
+            list: names, in document order
+        '''
+        return [(document.title or untitled) + (' *' if document.unsaved_changes else '')
+                for document in self.documents]
@@ -0,0 +1,602 @@
+# python
+'''
+The MacroLibrary module contains the MacroLibrary class, which keeps a SQLite
+catalog of the commands in macro files on disk, and the index_file function
+that reads a single macro for it
+'''
+import os
+import re
+import json
+import sqlite3
+from collections import namedtuple
+import lx
+from LXMParser import LXMParser
+from PythonParser import PythonParser
+from MacroCommand import MacroCommand
+
+
+# A command found by MacroLibrary.search(). `field` names the column that matched.
+LibraryMatch = namedtuple('LibraryMatch', ['path', 'position', 'command', 'name', 'block', 'field'])
+
+
+class LibraryBuilder(object):
+    '''
+    LXMParser builder that records the commands of a macro as plain tuples
+    instead of building a tree, for MacroLibrary.
+
+    Args:
+        None
+
+    Returns:
+        LibraryBuilder
+    '''
+    def __init__(self):
+        # (position, block, command, prefix, suppress, button name, comment)
+        self.commands = []
+        # (position, arg index, arg name, value)
+        self.args = []
+        # (position of first command, name, comment)
+        self.blocks = []
+
+        self.block_names = []
+        self.comments = []
+        self.meta = []
+
+    def buildType(self, type):
+        '''
+        File format of the macro. Not recorded.
+
+        Args:
+            type (str): either LXM or PY
+
+        Returns:
+            None
+        '''
+        pass
+
+    def buildCommand(self, line, suppress):
+        '''
+        Records a command line
+
+        Args:
+            line (str): command
+            suppress (bool): whether the command is suppressed
+
+        Returns:
+            None
+        '''
+        full_command = re.search(r'([!?+]*)(\S+)', line)
+        if full_command is not None:
+            args = list()
+            try:
+                self.parse_args(line[len(full_command.group(0)):], args)
+            except Exception:
+                # Unbalanced quotes; keep the arguments read so far
+                pass
+            self.add_command(full_command.group(2), full_command.group(1), suppress, args)
+
+        self.comments = []
+        self.meta = []
+
+    def buildBlockStart(self, block, suppress):
+        '''
+        Records the start of a block
+
+        Args:
+            block (list): (name, suppress) of each open block
+            suppress (bool): whether the block is suppressed
+
+        Returns:
+            None
+        '''
+        self.add_block(block[-1][0])
+
+    def buildBlockEnd(self, block):
+        '''
+        Records the end of a block
+
+        Args:
+            block (list): (name, suppress) of each open block
+
+        Returns:
+            None
+        '''
+        self.block_names.pop()
+        self.comments = []
+        self.meta = []
+
+    def buildMeta(self, name, value):
+        '''
+        Records metadata for the next command
+
+        Args:
+            name (str): metadata name
+            value (str): metadata as json
+
+        Returns:
+            None
+        '''
+        try:
+            self.meta.append((name, json.loads(value)))
+        except ValueError:
+            # For backward compatibility
+            self.meta.append((name, value))
+
+    def buildComment(self, comment):
+        '''
+        Records a comment line for the next command
+
+        Args:
+            comment (str): comment
+
+        Returns:
+            None
+        '''
+        self.comments.append(comment)
+
+    def parse_args(self, args_string, args):
+        '''
+        Splits an argument string the way MacroCommand does. Arguments are
+        not matched against the command's schema, which needs modo, so
+        positional arguments are recorded without their names.
+
+        Args:
+            args_string (str): modo argument string
+            args (list): (name, value) tuples are appended here
+
+        Returns:
+            None
+        '''
+        while args_string:
+            arg_name, args_string = MacroCommand.get_next_arg_name(args_string)
+            arg_value, args_string = MacroCommand.get_next_arg_value(args_string)
+            if not arg_value:
+                break
+            args.append((arg_name, arg_value))
+
+    def add_command(self, command, prefix, suppress, args):
+        '''
+        Records a command with the comments and metadata read before it
+
+        Args:
+            command (str): command name
+            prefix (str): command prefix
+            suppress (bool): whether the command is suppressed
+            args (list): (name, value) tuples
+
+        Returns:
+            None
+        '''
+        position = len(self.commands)
+        name = dict(self.meta).get('name')
+        self.commands.append((
+            position,
+            self.block_names[-1] if self.block_names else None,
+            command,
+            prefix or None,
+            bool(suppress),
+            name if isinstance(name, basestring) else None,
+            '\n'.join(self.comments) or None
+        ))
+        for index, (arg_name, value) in enumerate(args):
+            self.args.append((position, index, arg_name, value))
+
+    def add_block(self, name):
+        '''
+        Records a block with the comments read before it
+
+        Args:
+            name (str): block name
+
+        Returns:
+            None
+        '''
+        self.blocks.append((len(self.commands), name, '\n'.join(self.comments) or None))
+        self.block_names.append(name)
+        self.comments = []
+        self.meta = []
+
+    def read_json(self, commands_json):
+        '''
+        Records commands and blocks from json dicts, as written by
+        `Macro.render_json()`
+
+        Args:
+            commands_json (list): json dicts
+
+        Returns:
+            None
+        '''
+        for command_json in commands_json:
+            if 'command' in command_json:
+                attributes = command_json['command']
+                self.read_json_comment(attributes.get('comment') or [])
+                args = [(arg.get('argName'), '%s' % arg['value']) for arg in attributes.get('args', []) if arg.get('value') is not None]
+                self.add_command(attributes['name'], attributes.get('prefix'), attributes.get('suppress'), args)
+                self.comments = []
+                self.meta = []
+
+            elif 'command block' in command_json:
+                attributes = command_json['command block']
+                self.read_json_comment(attributes.get('comment') or [])
+                self.add_block(attributes['name'])
+                self.read_json(attributes.get('commands', []))
+                self.block_names.pop()
+
+    def read_json_comment(self, lines):
+        '''
+        Splits json comment lines into comments and metadata, the way
+        MacroBaseCommand.comment_before does
+
+        Args:
+            lines (list): comment lines
+
+        Returns:
+            None
+        '''
+        for line in lines:
+            meta = re.search(r'^replay\s+(\S+):(.+)$', line)
+            if meta is None:
+                self.comments.append(line)
+            else:
+                self.buildMeta(meta.group(1), meta.group(2))
+
+
+def index_file(path):
+    '''
+    Reads a macro file for the library. Runs in the indexing processes, so
+    it only returns plain data.
+
+    Args:
+        path (str): macro file path
+
+    Returns:
+        dict: path, mtime, size, format, error and the builder's commands,
+        args and blocks, or None if the file is gone
+    '''
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+
+    record = {
+        'path': path,
+        'mtime': info.st_mtime,
+        'size': info.st_size,
+        'format': MacroLibrary.formats.get(os.path.splitext(path)[1].lower()),
+        'error': None,
+        'commands': [],
+        'args': [],
+        'blocks': []
+    }
+
+    builder = LibraryBuilder()
+    try:
+        if record['format'] == 'json':
+            with open(path, 'r') as json_file:
+                builder.read_json(json.load(json_file))
+        elif record['format'] == 'py':
+            PythonParser().parse(path, builder)
+        else:
+            LXMParser().parse(path, builder)
+    except Exception as error:
+        record['error'] = str(error) or error.__class__.__name__
+        return record
+
+    record['commands'] = builder.commands
+    record['args'] = builder.args
+    record['blocks'] = builder.blocks
+    return record
+
+
+class MacroLibrary(object):
+    '''
+    Persistent SQLite catalog of the macros in a set of directories: their
+    commands, argument values, button names, comments and block names.
+
+    `update()` walks directory trees and reads new or changed files in a pool
+    of processes; unchanged files (same mtime and size) are skipped.
+    `search()` only queries the database, so it returns at once.
+
+    Like `Macro()`, the library works entirely with class variables. The
+    database lives in modo's user folder unless `database_path` is set.
+
+    Args:
+        None
+
+    Returns:
+        MacroLibrary
+    '''
+    _database_path = None
+    _connection = None
+    _connection_path = None
+
+    # Macro formats by file extension
+    formats = {
+        '.lxm': 'lxm',
+        '.py': 'py',
+        '.json': 'json'
+    }
+
+    # Columns searched for each search field
+    search_columns = {
+        'command': 'c.command',
+        'name': 'c.button_name',
+        'comment': 'c.comment',
+        'block': 'c.block',
+        'arg': 'a.value'
+    }
+
+    schema = '''
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            format TEXT,
+            mtime REAL,
+            size INTEGER,
+            error TEXT
+        );
+        CREATE TABLE IF NOT EXISTS commands (
+            file_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            block TEXT,
+            command TEXT,
+            prefix TEXT,
+            suppress INTEGER,
+            button_name TEXT,
+            comment TEXT,
+            PRIMARY KEY (file_id, position)
+        );
+        CREATE TABLE IF NOT EXISTS args (
+            file_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            arg_index INTEGER NOT NULL,
+            name TEXT,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS blocks (
+            file_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT,
+            comment TEXT
+        );
+        CREATE INDEX IF NOT EXISTS commands_command ON commands (command);
+        CREATE INDEX IF NOT EXISTS commands_button_name ON commands (button_name);
+        CREATE INDEX IF NOT EXISTS args_file ON args (file_id, position);
+        CREATE INDEX IF NOT EXISTS blocks_file ON blocks (file_id);
+    '''
+
+    def database_path():
+        doc = '''
+        str: path of the SQLite database. Defaults to replay_library.db in
+        modo's user folder.
+        '''
+        def fget(self):
+            if self.__class__._database_path is None:
+                user = lx.eval('query platformservice path.path ? user')
+                self.__class__._database_path = os.path.join(user, 'replay_library.db')
+            return self.__class__._database_path
+        def fset(self, value):
+            self.__class__._database_path = value
+        return locals()
+
+    database_path = property(**database_path())
+
+    def connection():
+        doc = '''
+        sqlite3.Connection: open connection to the database, created with
+        the library's schema if needed
+        '''
+        def fget(self):
+            cls = self.__class__
+            path = self.database_path
+            if cls._connection is None or cls._connection_path != path:
+                self.close()
+                connection = sqlite3.connect(path)
+                connection.text_factory = str
+                connection.executescript(self.schema)
+                cls._connection = connection
+                cls._connection_path = path
+            return cls._connection
+        return locals()
+
+    connection = property(**connection())
+
+    def close(self):
+        '''
+        Closes the database connection, if open
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        cls = self.__class__
+        if cls._connection is not None:
+            cls._connection.close()
+        cls._connection = None
+        cls._connection_path = None
+
+    def scan(self, directories):
+        '''
+        Walks directory trees for macro files
+
+        Args:
+            directories (list): directory paths
+
+        Returns:
+            dict: (mtime, size) by file path
+        '''
+        files = dict()
+        for directory in directories:
+            for root, dir_names, file_names in os.walk(directory):
+                for file_name in file_names:
+                    if os.path.splitext(file_name)[1].lower() not in self.formats:
+                        continue
+                    path = os.path.join(root, file_name)
+                    try:
+                        info = os.stat(path)
+                    except OSError:
+                        continue
+                    files[path] = (info.st_mtime, info.st_size)
+        return files
+
+    def update(self, directories, processes=None):
+        '''
+        Brings the catalog of directory trees up to date. New and changed
+        files are read, and files that are gone are dropped.
+
+        Args:
+            directories (list): directory paths
+            processes (int): number of indexing processes. Default: one per
+                CPU. Use 1 to read files in this process, e.g. inside modo,
+                whose executable can't host a python process pool.
+
+        Returns:
+            tuple: number of files read, number of files dropped
+        '''
+        directories = [os.path.normpath(directory) for directory in directories]
+        prefixes = tuple(os.path.join(directory, '') for directory in directories)
+
+        found = self.scan(directories)
+
+        connection = self.connection
+        known = dict()
+        for file_id, path, mtime, size in connection.execute('SELECT id, path, mtime, size FROM files'):
+            if path.startswith(prefixes):
+                known[path] = (file_id, mtime, size)
+
+        removed = [known[path][0] for path in known if path not in found]
+        stale = sorted(path for path, stat in found.iteritems() if path not in known or known[path][1:] != stat)
+
+        with connection:
+            for file_id in removed:
+                self.delete_file(file_id)
+
+            if processes != 1 and len(stale) > 1:
+                import multiprocessing
+                processes = processes or multiprocessing.cpu_count()
+                pool = multiprocessing.Pool(processes)
+                try:
+                    chunk_size = max(1, len(stale) // (processes * 4))
+                    for path, record in zip(stale, pool.imap(index_file, stale, chunk_size)):
+                        self.store(record, known.get(path))
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                for path in stale:
+                    self.store(index_file(path), known.get(path))
+
+        return len(stale), len(removed)
+
+    def delete_file(self, file_id):
+        '''
+        Drops a file and its commands from the catalog
+
+        Args:
+            file_id (int): id of the file's row
+
+        Returns:
+            None
+        '''
+        for table in ('commands', 'args', 'blocks'):
+            self.connection.execute('DELETE FROM %s WHERE file_id = ?' % table, (file_id,))
+        self.connection.execute('DELETE FROM files WHERE id = ?', (file_id,))
+
+    def store(self, record, known=None):
+        '''
+        Writes a file record from index_file() to the catalog, replacing any
+        earlier record of the same file
+
+        Args:
+            record (dict): file record, or None to just drop the earlier one
+            known (tuple): (id, mtime, size) of the earlier record, if any
+
+        Returns:
+            None
+        '''
+        connection = self.connection
+        if known is not None:
+            self.delete_file(known[0])
+        if record is None:
+            return
+
+        file_id = connection.execute(
+            'INSERT INTO files (path, format, mtime, size, error) VALUES (?, ?, ?, ?, ?)',
+            (record['path'], record['format'], record['mtime'], record['size'], record['error'])
+        ).lastrowid
+
+        connection.executemany(
+            'INSERT INTO commands (file_id, position, block, command, prefix, suppress, button_name, comment) '
+            'VALUES (%d, ?, ?, ?, ?, ?, ?, ?)' % file_id, record['commands']
+        )
+        connection.executemany(
+            'INSERT INTO args (file_id, position, arg_index, name, value) VALUES (%d, ?, ?, ?, ?)' % file_id,
+            record['args']
+        )
+        connection.executemany(
+            'INSERT INTO blocks (file_id, position, name, comment) VALUES (%d, ?, ?, ?)' % file_id,
+            record['blocks']
+        )
+
+    def search(self, text, field='any', limit=200):
+        '''
+        Finds the commands that match a search. Commands match on their name
+        exactly; button names, comments, block names and argument values match
+        if they contain the text. `*` and `?` are wildcards in every field.
+
+        Args:
+            text (str): text to look for
+            field (str): 'command', 'name', 'comment', 'block', 'arg', or
+                'any' for all of them. Default: 'any'
+            limit (int): maximum number of matches. Default: 200
+
+        Returns:
+            list: LibraryMatch tuples, sorted by path and position
+        '''
+        if field != 'any' and field not in self.search_columns:
+            raise ValueError("Unknown search field '%s', expected any or %s" % (field, ', '.join(sorted(self.search_columns))))
+
+        fields = sorted(self.search_columns) if field == 'any' else [field]
+
+        wildcard = '*' in text or '?' in text
+        pattern = re.sub(r'([%_\\])', r'\\\1', text).replace('*', '%').replace('?', '_')
+
+        queries = list()
+        params = list()
+        for name in fields:
+            column = self.search_columns[name]
+            if name == 'command' and not wildcard:
+                condition = '%s = ?' % column
+                params.append(text)
+            else:
+                condition = "%s LIKE ? ESCAPE '\\'" % column
+                params.append(pattern if wildcard else '%' + pattern + '%')
+
+            join = 'JOIN args a ON a.file_id = c.file_id AND a.position = c.position ' if name == 'arg' else ''
+            queries.append(
+                "SELECT DISTINCT f.path, c.position, c.command, c.button_name, c.block, '%s' AS field "
+                "FROM commands c JOIN files f ON f.id = c.file_id %sWHERE %s" % (name, join, condition)
+            )
+
+        # A command matching several fields is one match, so the rows are
+        # grouped before the limit applies
+        query = 'SELECT path, position, command, button_name, block, MIN(field) FROM (%s) GROUP BY 1, 2 ORDER BY 1, 2 LIMIT ?' % \
+            ' UNION ALL '.join(queries)
+        params.append(limit)
+
+        return [LibraryMatch(*row) for row in self.connection.execute(query, params)]
+
+    def files(self):
+        '''
+        Lists the catalogued files
+
+        Args:
+            None
+
+        Returns:
+            list: (path, format, error) tuples, sorted by path
+        '''
+        return list(self.connection.execute('SELECT path, format, error FROM files ORDER BY path'))
@@ -0,0 +1,364 @@
+# python
+'''
+The MacroValidator module contains the MacroValidator class, which checks
+macro commands against modo's command schemas before they run, and the
+validate_file function that checks a single macro file for it
+'''
+import os
+import re
+import json
+from collections import namedtuple
+from LXMParser import LXMParser
+from PythonParser import PythonParser
+from CommandCatalog import CommandCatalog
+from MacroCommand import MacroCommand
+from MacroBlockCommand import MacroBlockCommand
+
+
+# A problem found by MacroValidator. `path` is the macro file, or None for
+# nodes of the open macro; `line` the line in that file, or None.
+ValidationIssue = namedtuple('ValidationIssue', ['path', 'line', 'command', 'message'])
+
+# One argument of a command line: an optional name, then a value that is
+# quoted, in braces or runs to the next space. Splits arguments as
+# MacroCommand.get_next_arg_name and get_next_arg_value do, in one pass.
+_arg_pattern = re.compile(r'''\s*(?:([^\s'"{:]*):)?(?:"([^"]*)"|'([^']*)'|\{([^}]*)\}|(\S+))''')
+
+_command_pattern = re.compile(r'\s*([!?+]*)(\S+)')
+
+_number = r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+
+# Values accepted by type name. Numbers may carry a unit ("10 mm", "50%").
+# Integer arguments also take the names of their hints, e.g. "on".
+_float_value = re.compile(r'%s(?:\s*[^\d\s.+-]\S*)?$' % _number)
+_integer_value = re.compile(r'(?:[+-]?\d+|[A-Za-z_][\w.-]*)$')
+_vector_value = re.compile(r'\s*%s(?:\s*[^\d\s.+-]\S*)?(?:\s+%s(?:\s*[^\d\s.+-]\S*)?){2}\s*$' % (_number, _number))
+_boolean_values = set(['true', 'false', 'on', 'off', 'yes', 'no', '1', '0'])
+
+# Type names treated alike, as in commander's Var module
+_float_types = set(['acceleration', 'angle', 'axis', 'color1', 'distance', 'float', 'force',
+                    'light', 'mass', 'percent', 'speed', 'time', 'uvcoord'])
+_vector_types = set(['angle3', 'color', 'distance3', 'float3', 'percent3'])
+
+
+def _type_check(type_name):
+    '''
+    Returns a function telling whether a value string suits an argument type,
+    or None for types that take any string (string, value, &item...).
+    '''
+    if type_name == 'integer':
+        return _integer_value.match
+    if type_name == 'boolean':
+        return lambda value: value.lower() in _boolean_values
+    if type_name in _float_types:
+        return _float_value.match
+    if type_name in _vector_types:
+        return _vector_value.match
+    return None
+
+
+class ValidationBuilder(object):
+    '''
+    LXMParser builder that validates each command line as it is read,
+    instead of building a tree, for MacroValidator.
+
+    Args:
+        validator (MacroValidator): validator to check commands with
+        parser (LXMParser): parser feeding this builder, for line numbers
+        path (str): macro file path, for the issues
+
+    Returns:
+        ValidationBuilder
+    '''
+    def __init__(self, validator, parser, path):
+        self.validator = validator
+        self.parser = parser
+        self.path = path
+        self.issues = []
+        self.lines = 0
+
+    def buildType(self, type):
+        pass
+
+    def buildCommand(self, line, suppress):
+        '''
+        Validates a command line, unless suppressed
+
+        Args:
+            line (str): command
+            suppress (bool): whether the command is suppressed
+
+        Returns:
+            None
+        '''
+        self.lines += 1
+        if suppress and not self.validator.include_suppressed:
+            return
+        self.issues.extend(self.validator.validate_line(line, self.parser.line_index, self.path))
+
+    def buildBlockStart(self, block, suppress):
+        pass
+
+    def buildBlockEnd(self, block):
+        pass
+
+    def buildMeta(self, name, value):
+        pass
+
+    def buildComment(self, comment):
+        pass
+
+
+def validate_file(task):
+    '''
+    Validates a macro file. Runs in the validation processes, so it only
+    returns plain data.
+
+    Args:
+        task (tuple): macro file path, whether to check suppressed commands
+
+    Returns:
+        dict: path, number of commands read, issues as tuples and error, the
+        message of the error that stopped reading the file, if any
+    '''
+    path, include_suppressed = task
+    validator = MacroValidator(include_suppressed)
+    result = {'path': path, 'lines': 0, 'issues': [], 'error': None}
+    try:
+        issues, result['lines'] = validator.validate_file(path)
+    except Exception as error:
+        result['error'] = str(error) or error.__class__.__name__
+        return result
+
+    result['issues'] = [tuple(issue) for issue in issues]
+    return result
+
+
+class MacroValidator(object):
+    '''
+    Checks macro commands against the schemas modo reports for them: unknown
+    commands, unknown or repeated argument names, more arguments than the
+    command takes, and values that don't suit the argument's type.
+
+    Schemas come from `MacroCommand.command_schema()` and are prepared once
+    per command, so long macros and whole libraries are checked quickly.
+    `validate_files()` checks many files in a pool of processes, as
+    `MacroLibrary.update()` reads them.
+
+    Args:
+        include_suppressed (bool): check suppressed commands too
+
+    Returns:
+        MacroValidator
+    '''
+    def __init__(self, include_suppressed=False):
+        self.include_suppressed = include_suppressed
+        # Command name: (argument names, index by name, type checks), or None
+        # for commands modo doesn't know
+        self._commands = {}
+
+    def command_info(self, command):
+        '''
+        Returns what the checks need to know of a command, cached
+
+        Args:
+            command (str): modo command name
+
+        Returns:
+            tuple: argument names, argument index by name, type check by
+            index, or None if modo doesn't know the command
+        '''
+        try:
+            return self._commands[command]
+        except KeyError:
+            pass
+
+        info = None
+        if CommandCatalog().is_valid(command):
+            schema = MacroCommand.command_schema(command)
+            names = list(schema['argNames'])
+            type_names = list(schema['argTypeNames']) + [None] * (len(names) - len(schema['argTypeNames']))
+            info = (names, dict((name, index) for index, name in enumerate(names)),
+                    [_type_check(type_name) for type_name in type_names])
+        self._commands[command] = info
+        return info
+
+    def check_args(self, command, args):
+        '''
+        Checks a command's arguments against its schema
+
+        Args:
+            command (str): modo command name
+            args (list): (name or None, value string) tuples, in order
+
+        Returns:
+            list: messages, empty if the command is valid
+        '''
+        info = self.command_info(command)
+        if info is None:
+            return ['Unknown command "%s"' % command]
+        names, indices, checks = info
+
+        messages = []
+        given = set()
+        for counter, (name, value) in enumerate(args):
+            if name:
+                index = indices.get(name)
+                if index is None:
+                    messages.append('Unknown argument "%s"' % name)
+                    continue
+            elif counter < len(names):
+                index = counter
+            else:
+                messages.append('Too many arguments: %d given, takes %d' % (len(args), len(names)))
+                break
+
+            if index in given:
+                messages.append('Argument "%s" is set twice' % names[index])
+            given.add(index)
+
+            # Queried and substituted values are only known when the command runs
+            check = checks[index]
+            if check is not None and value != '?' and not value.startswith('%') and not check(value):
+                messages.append('Argument "%s" expects %s, got "%s"' % (
+                    names[index], MacroCommand.command_schema(command)['argTypeNames'][index], value))
+        return messages
+
+    def validate_line(self, line, line_number=None, path=None):
+        '''
+        Validates a command line
+
+        Args:
+            line (str): modo command string
+            line_number (int): line of the command in its file, for the issues
+            path (str): file of the command, for the issues
+
+        Returns:
+            list: ValidationIssue tuples
+        '''
+        match = _command_pattern.match(line)
+        if match is None:
+            return []
+        command = match.group(2)
+
+        args = []
+        args_string = line
+        position = match.end()
+        while True:
+            arg = _arg_pattern.match(args_string, position)
+            if arg is None:
+                break
+            position = arg.end()
+            name, double, single, braced, plain = arg.groups()
+            if plain is not None and plain[0] in '"\'{':
+                return [ValidationIssue(path, line_number, command, 'Unterminated quote in arguments')]
+            value = next(group for group in (double, single, braced, plain) if group is not None)
+            args.append((name, value))
+
+        return [ValidationIssue(path, line_number, command, message) for message in self.check_args(command, args)]
+
+    def validate_json(self, commands_json, path=None):
+        '''
+        Validates commands from json dicts, as written by `Macro.render_json()`
+
+        Args:
+            commands_json (list): json dicts
+            path (str): file of the commands, for the issues
+
+        Returns:
+            tuple: list of ValidationIssue tuples, number of commands read
+        '''
+        issues = []
+        lines = 0
+        for command_json in commands_json:
+            if 'command' in command_json:
+                attributes = command_json['command']
+                lines += 1
+                if attributes.get('suppress') and not self.include_suppressed:
+                    continue
+                args = [(arg.get('argName'), '%s' % arg['value']) for arg in attributes.get('args', []) if arg.get('value') is not None]
+                issues.extend(ValidationIssue(path, None, attributes['name'], message)
+                              for message in self.check_args(attributes['name'], args))
+
+            elif 'command block' in command_json:
+                attributes = command_json['command block']
+                if attributes.get('suppress') and not self.include_suppressed:
+                    continue
+                block_issues, block_lines = self.validate_json(attributes.get('commands', []), path)
+                issues.extend(block_issues)
+                lines += block_lines
+        return issues, lines
+
+    def validate_file(self, path):
+        '''
+        Validates a macro file in LXM, python or json format
+
+        Args:
+            path (str): macro file path
+
+        Returns:
+            tuple: list of ValidationIssue tuples, number of commands read
+        '''
+        if os.path.splitext(path)[1].lower() == '.json':
+            with open(path, 'r') as json_file:
+                return self.validate_json(json.load(json_file), path)
+
+        if os.path.splitext(path)[1].lower() == '.py':
+            parser = PythonParser()
+        else:
+            parser = LXMParser()
+        builder = ValidationBuilder(self, parser, path)
+        parser.parse(path, builder)
+        return builder.issues, builder.lines
+
+    def validate_files(self, paths, processes=None, initializer=None, initargs=()):
+        '''
+        Validates macro files, in a pool of processes
+
+        Args:
+            paths (list): macro file paths
+            processes (int): number of validation processes. Default: one
+                per CPU. Use 1 to check files in this process, e.g. inside
+                modo, whose executable can't host a python process pool.
+            initializer (callable): run in each new process, e.g. to set up
+                the command schemas outside of modo
+            initargs (tuple): arguments of initializer
+
+        Returns:
+            list: `validate_file()` results, in the order of paths
+        '''
+        tasks = [(path, self.include_suppressed) for path in paths]
+        if processes == 1 or len(tasks) < 2:
+            return [validate_file(task) for task in tasks]
+
+        import multiprocessing
+        processes = processes or multiprocessing.cpu_count()
+        pool = multiprocessing.Pool(processes, initializer, initargs)
+        try:
+            chunk_size = max(1, len(tasks) // (processes * 4))
+            return list(pool.imap(validate_file, tasks, chunk_size))
+        finally:
+            pool.close()
+            pool.join()
+
+    def validate_nodes(self, nodes):
+        '''
+        Validates the commands of macro nodes as they would be played.
+        Suppressed nodes are skipped unless include_suppressed is set.
+
+        Args:
+            nodes (list): MacroCommand and MacroBlockCommand nodes
+
+        Returns:
+            list: (node, ValidationIssue) tuples
+        '''
+        found = []
+        for node in nodes:
+            if node.suppress and not self.include_suppressed:
+                continue
+            if isinstance(node, MacroBlockCommand):
+                found.extend(self.validate_nodes(node.children))
+            elif isinstance(node, MacroCommand):
+                for issue in self.validate_line(node.render_LXM_without_comment()):
+                    found.append((node, issue))
+        return found
@@ -1,26 +1,186 @@
 # python
 '''
 The Message module contains the message function, which is used for querying
-the modo message service
+the modo message service, and the MessageCache class behind it
 '''
+import os
+import re
+import time
+from collections import OrderedDict
 import lx
 
 
+class MessageCache(object):
+    '''
+    Persistent least-recently-used cache of message table lookups.
+
+    Messages are looked up with `msgfind` once per (table, id) and kept here;
+    `msgcompose` arguments are substituted in Python. The cache is emptied
+    when modo's locale changes, which is detected through the `LOCALE`
+    message of the `MECCO_REPLAY` table, checked at most once a second.
+
+    Like `Macro()`, the cache works entirely with class variables.
+
+    Args:
+        None
+
+    Returns:
+        MessageCache
+    '''
+    _messages = OrderedDict()
+    _locale = None
+    _locale_checked = 0
+
+    # Maximum number of cached messages
+    size = 512
+
+    # Seconds between locale checks
+    locale_interval = 1.0
+
+    # Message that names the locale of the active tables
+    locale_message = ('MECCO_REPLAY', 'LOCALE')
+
+    @staticmethod
+    def query(table, message_id):
+        '''
+        Looks a message up in the message service, bypassing the cache
+
+        Args:
+            table (str): message table
+            message_id (str): message id
+
+        Returns:
+            str: message template
+        '''
+        return lx.eval("query messageservice msgfind ? {@%s@@%s@}" % (table, message_id))
+
+    @staticmethod
+    def compose(template, args):
+        '''
+        Substitutes arguments into a message template the way `msgcompose`
+        does: `%1` is replaced with the first argument and so on.
+
+        Args:
+            template (str): message template
+            args (list): arguments
+
+        Returns:
+            str: composed message
+        '''
+        def replace(match):
+            index = int(match.group(1)) - 1
+            if 0 <= index < len(args):
+                return '%s' % (args[index],)
+            return match.group(0)
+        return re.sub(r'%(\d+)', replace, template)
+
+    def check_locale(self):
+        '''
+        Empties the cache if the locale has changed since the last check
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        cls = self.__class__
+        now = time.time()
+        if now - cls._locale_checked < self.locale_interval:
+            return
+        cls._locale_checked = now
+
+        locale = self.query(*self.locale_message)
+        if locale != cls._locale:
+            cls._messages.clear()
+            cls._locale = locale
+
+    def find(self, table, message_id):
+        '''
+        Returns a message template, from the cache if possible
+
+        Args:
+            table (str): message table
+            message_id (str): message id
+
+        Returns:
+            str: message template
+        '''
+        self.check_locale()
+
+        messages = self.__class__._messages
+        key = (table, message_id)
+        template = messages.pop(key, None)
+        if template is None:
+            template = self.query(table, message_id)
+        messages[key] = template
+
+        while len(messages) > self.size:
+            messages.popitem(last=False)
+        return template
+
+    def preload(self, table, config_path=None):
+        '''
+        Looks up every message of a table listed in the kit's messages.cfg,
+        so that later lookups are served from the cache
+
+        Args:
+            table (str): message table
+            config_path (str): messages config. Default: Configs/messages.cfg
+
+        Returns:
+            int: number of messages loaded
+        '''
+        # Only needed here, so not imported with the module
+        import xml.etree.ElementTree as ElementTree
+
+        if config_path is None:
+            config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Configs', 'messages.cfg')
+
+        message_ids = list()
+        try:
+            root = ElementTree.parse(config_path).getroot()
+        except (IOError, ElementTree.ParseError):
+            return 0
+        for element in root.iter('hash'):
+            if element.get('type') == 'Table' and element.get('key', '').split('.')[0] == table:
+                message_ids.extend(child.get('key') for child in element if child.get('type') == 'T')
+
+        # Distinct ids, since each locale's table lists the same ones
+        message_ids = list(OrderedDict.fromkeys(message_ids))
+        for message_id in message_ids:
+            self.find(table, message_id)
+        return len(message_ids)
+
+    def clear(self):
+        '''
+        Empties the cache
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self.__class__._messages.clear()
+        self.__class__._locale = None
+        self.__class__._locale_checked = 0
+
+
 def message(table, message_id, *args):
     '''
-    A convenience function for querying the modo message service
+    A convenience function for querying the modo message service. Lookups
+    are cached; see MessageCache.
 
     Args:
-        table (???): table to be queried
-        message_id (???): id of message to be found
+        table (str): table to be queried
+        message_id (str): id of message to be found
         \*args: additional message arguments (see modo messageservice msgcompose)
 
     Returns:
-        str: lx.eval of query
+        str: message, with the arguments substituted
     '''
+    template = MessageCache().find(table, message_id)
     if len(args) != 0:
-        args_list = ["{%s}" % arg for arg in args]
-        cmd = ("query messageservice msgcompose ? {@%s@@%s@" + " %s" * len(args) + "}") % tuple([table, message_id] + args_list)
-    else:
-        cmd = ("query messageservice msgfind ? {@%s@@%s@}") % (table, message_id)
-    return lx.eval(cmd)
+        return MessageCache.compose(template, args)
+    return template
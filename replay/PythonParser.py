@@ -0,0 +1,314 @@
+# python
+'''
+The PythonParser module contains the PythonParser class, which reads python
+macros with the `ast` module instead of evaluating them line by line
+'''
+import re
+import ast
+from LXMParser import LXMParser, LXMError
+
+
+# lx functions whose literal calls are read as commands
+_eval_functions = ('eval', 'eval1', 'evalN')
+
+# A whole line calling lx.eval with a plain string, the bulk of generated
+# scripts. Read without building its syntax tree; strings with escapes or
+# prefixes go through `ast`.
+_simple_eval = re.compile(r'''lx\.eval\(\s*(?:'([^'\\]*)'|"([^"\\]*)")\s*\)\s*(?:#.*)?$''')
+
+
+def _quote(value):
+    # Quotes a value the way MacroCommand.render_LXM_without_comment does
+    if value == '':
+        return '""'
+    if '"' in value:
+        return '{%s}' % value
+    if re.search(r'\W', value):
+        return '"%s"' % value
+    return value
+
+
+def _literal_string(node):
+    # A literal value as a command argument string, or None if it isn't one
+    try:
+        value = ast.literal_eval(node)
+    except ValueError:
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    if isinstance(value, (str, int, long, float)):
+        return str(value)
+    return None
+
+
+class PythonParser(LXMParser):
+    '''
+    Parser for python macros. Takes the same builders as LXMParser.
+
+    The script is parsed with `ast` in one pass. Top-level `lx.eval()`,
+    `lx.eval1()`, `lx.evalN()` and `lx.command()` calls with literal
+    arguments are read as commands. Any other statement - loops,
+    assignments, calls with computed arguments - can't be replayed line by
+    line, so its source lines are kept as comments of the next command, and
+    its first and last lines are listed in `skipped`. A line holding several
+    statements is read as a whole: it is kept as comments unless every
+    statement on it is a command.
+
+    Comment lines between statements are read as in LXM files: Replay's
+    suppressed commands, block headers and footers, metadata and comments.
+    The lines of Replay's blocks are indented, which python doesn't allow
+    at the top level, so they are dedented first; line numbers are kept.
+
+    Args:
+        None
+
+    Returns:
+        PythonParser
+    '''
+    def __init__(self):
+        super(PythonParser, self).__init__()
+        self.skipped = []
+
+    def parseStream(self, file, builder):
+        '''
+        Parses the lines of a python macro
+
+        Args:
+            file (list or file object): lines of python code
+            builder (object): builder instance
+
+        Returns:
+            None
+        '''
+        self.initParser(builder)
+        self.skipped = []
+        self.type = "PY"
+        self.builder.buildType(self.type)
+
+        if isinstance(file, list):
+            lines = [line.rstrip('\r\n') for line in file]
+        else:
+            lines = file.read().split('\n')
+            lines = [line.rstrip('\r') for line in lines]
+        self.dedentBlocks(lines)
+
+        # Simple calls at the start of a line are blanked out for `ast`, and
+        # read as commands if they turn out to be between statements.
+        simple = {}
+        code = list(lines)
+        for index, line in enumerate(lines):
+            if line.startswith('lx.eval('):
+                match = _simple_eval.match(line)
+                if match is not None:
+                    simple[index + 1] = match.group(1) if match.group(1) is not None else match.group(2)
+                    code[index] = ''
+
+        try:
+            module = ast.parse('\n'.join(code))
+        except SyntaxError as err:
+            if not simple:
+                raise LXMError(line=err.lineno, message="Invalid python: %s" % err.msg)
+            # A blanked line was the continuation of another one
+            simple = {}
+            code = lines
+            try:
+                module = ast.parse('\n'.join(lines))
+            except SyntaxError as err:
+                raise LXMError(line=err.lineno, message="Invalid python: %s" % err.msg)
+
+        line_number = 1
+        body = module.body
+        index = 0
+        while index < len(body):
+            statement = body[index]
+            # Comment, blank and simple lines before the statement
+            while line_number < statement.lineno:
+                self.readLine(line_number, lines[line_number - 1], simple)
+                line_number += 1
+
+            # Statements after it on the same line, after semicolons
+            statements = [statement]
+            index += 1
+            while index < len(body) and body[index].lineno == statement.lineno:
+                statements.append(body[index])
+                index += 1
+
+            # The statements run to the last line of code before the next
+            # one; comments after that belong to the next statement.
+            next_start = body[index].lineno if index < len(body) else len(lines) + 1
+            end = statement.lineno
+            for row in xrange(next_start - 1, statement.lineno, -1):
+                line = code[row - 1].strip()
+                if line and line[0] != '#':
+                    end = row
+                    break
+
+            self.readStatements(statements, lines[statement.lineno - 1:end])
+            for row in xrange(statement.lineno, end + 1):
+                self.endLine()
+            line_number = end + 1
+
+        while line_number <= len(lines):
+            self.readLine(line_number, lines[line_number - 1], simple)
+            line_number += 1
+
+    def dedentBlocks(self, lines):
+        '''
+        Removes the indentation Replay gives the commands of blocks
+
+        Args:
+            lines (list): lines of python code, changed in place
+
+        Returns:
+            None
+        '''
+        depth = 0
+        for index, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped.startswith('#'):
+                if self.isBlockStart(stripped) is not None:
+                    depth += 1
+                elif depth and self.isBlockEnd(stripped) is not None:
+                    depth -= 1
+            elif depth and line.startswith(' ' * 4 * depth):
+                lines[index] = line[4 * depth:]
+
+    def readLine(self, line_number, line, simple):
+        '''
+        Parses a line between statements: a comment, a blank line or a
+        simple lx.eval call
+
+        Args:
+            line_number (int): line number, from 1
+            line (str): line of python code
+            simple (dict): commands of the simple calls by line number
+
+        Returns:
+            None
+        '''
+        self.line_index = line_number
+        command = simple.get(line_number)
+        if command is not None:
+            self.buildCommand(command)
+            self.skip_next_comments = False
+        else:
+            self.parseLine(line)
+        self.endLine()
+
+    def endLine(self):
+        '''
+        Clears the suppression of the previous line once it has been read,
+        as LXMParser.readLines does after each line
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        if self.in_suppress_counter != 0:
+            self.in_suppress_counter -= 1
+            if self.in_suppress_counter == 0:
+                self.in_suppress = False
+
+    def readStatements(self, statements, lines):
+        '''
+        Builds commands from statements that start on the same line, or
+        comments from their lines if any of them isn't a command
+
+        Args:
+            statements (list): top-level ast.stmt objects, in order
+            lines (list): source lines of the statements
+
+        Returns:
+            None
+        '''
+        first = statements[0].lineno
+        commands = [self.literalCommand(statement) for statement in statements]
+        if None not in commands:
+            for command in commands:
+                self.line_index = first
+                self.buildCommand(command)
+            self.skip_next_comments = False
+            return
+
+        self.line_index = first
+        self.skipped.append((first, first + len(lines) - 1))
+        for line in lines:
+            if line.strip():
+                self.builder.buildComment(line.rstrip())
+
+    def literalCommand(self, statement):
+        '''
+        Returns the command of a statement calling lx with literal arguments
+
+        Args:
+            statement (ast.stmt): statement
+
+        Returns:
+            str: modo command string, or None if the statement is anything else
+        '''
+        if not isinstance(statement, ast.Expr) or not isinstance(statement.value, ast.Call):
+            return None
+        call = statement.value
+        function = call.func
+        if not isinstance(function, ast.Attribute) or not isinstance(function.value, ast.Name) or function.value.id != 'lx':
+            return None
+        if call.starargs is not None or call.kwargs is not None or not call.args:
+            return None
+
+        command = _literal_string(call.args[0])
+        if command is None:
+            return None
+
+        if function.attr in _eval_functions:
+            if len(call.args) != 1 or call.keywords:
+                return None
+            return command
+
+        if function.attr == 'command':
+            for arg in call.args[1:]:
+                value = _literal_string(arg)
+                if value is None:
+                    return None
+                command += ' ' + _quote(value)
+            for keyword in call.keywords:
+                value = _literal_string(keyword.value)
+                if value is None:
+                    return None
+                command += ' %s:%s' % (keyword.arg, _quote(value))
+            return command
+
+        return None
+
+    def handleNonCommentLine(self, line):
+        '''
+        Handles the code of suppressed commands, which is commented out and
+        so only read once the parser strips the comment
+
+        Args:
+            line (str): line of python code
+
+        Returns:
+            None
+        '''
+        line = line.strip()
+        match = _simple_eval.match(line)
+        if match is not None:
+            command = match.group(1) if match.group(1) is not None else match.group(2)
+        else:
+            try:
+                module = ast.parse(line)
+            except SyntaxError:
+                module = None
+
+            command = None
+            if module is not None and len(module.body) == 1:
+                command = self.literalCommand(module.body[0])
+
+        if command is not None:
+            self.buildCommand(command)
+        else:
+            self.builder.buildComment(line)
@@ -0,0 +1,73 @@
+# python
+'''
+The RecentFiles module contains the RecentFiles class, which keeps the list
+of recently-opened macro files
+'''
+import lx
+
+
+class RecentFiles(object):
+    '''
+    Persistent list of recently-opened macro files.
+
+    The list is stored in the `mecco_replay_recent_files` user value, as
+    paths joined by ";", for persistence between sessions. The value is split
+    once per change rather than on every popup query.
+
+    Args:
+        None
+
+    Returns:
+        RecentFiles
+    '''
+    _value = None
+    _paths = []
+
+    # Number of files to remember
+    limit = 10
+
+    def value():
+        doc = '''
+        str: the user value holding the list
+        '''
+        def fget(self):
+            return lx.eval('user.value mecco_replay_recent_files ?') or ''
+        def fset(self, value):
+            lx.eval('user.value mecco_replay_recent_files {%s}' % value)
+        return locals()
+
+    value = property(**value())
+
+    def paths():
+        doc = '''
+        list: recent file paths, most recent first
+        '''
+        def fget(self):
+            value = self.value
+            if value != self.__class__._value:
+                self.__class__._paths = [path for path in value.split(';') if path]
+                self.__class__._value = value
+            return self.__class__._paths
+        return locals()
+
+    paths = property(**paths())
+
+    def add(self, path):
+        '''
+        Moves a path to the top of the list, dropping duplicates and the
+        oldest paths beyond the limit
+
+        Args:
+            path (str): file path
+
+        Returns:
+            None
+        '''
+        seen = set()
+        paths = list()
+        for existing in [path] + self.value.split(';'):
+            if existing.lower() not in seen:
+                seen.add(existing.lower())
+                paths.append(existing)
+
+        self.value = ';'.join(paths[:self.limit])
@@ -0,0 +1,407 @@
+# python
+'''
+The UndoJournal module contains the UndoJournal class and the deltas it
+stores. Together they hold the tree edits behind Replay's undo objects.
+'''
+import lx
+from Macro import Macro
+from MacroDocuments import MacroDocuments
+
+
+class UndoJournal(object):
+    '''
+    Shared journal of the deltas behind Replay's `lxifc.Undo` objects.
+
+    MODO owns the undo stack, so every Replay undo object keeps its own delta,
+    but the delta is also recorded here so that their combined size can be
+    capped. Once the journal grows past its memory budget, the oldest deltas
+    are expired: their payload is released and their undo objects do nothing
+    when MODO calls them.
+
+    The budget is read from the `replay_undo_memory` user value, in megabytes.
+
+    Every delta belongs to the document that was shown when it was recorded,
+    and undoing or redoing it shows that document again, so the history of
+    each open macro survives switching between them.
+
+    Like `Macro()`, the journal works entirely with class variables.
+
+    Args:
+        None
+
+    Returns:
+        UndoJournal
+    '''
+    _deltas = []
+    _size = 0
+
+    # Budget used when the user value can't be read, in bytes
+    _default_budget = 64 * 1024 * 1024
+
+    def record(self, delta):
+        '''
+        Adds a delta to the journal and trims the oldest deltas if the journal
+        is over budget. The newest delta is never trimmed.
+
+        Args:
+            delta (UndoDelta): delta of an edit that has just been applied
+
+        Returns:
+            UndoDelta: the recorded delta
+        '''
+        documents = MacroDocuments()
+        delta.document = documents.documents[documents.active]
+        self.__class__._deltas.append(delta)
+        self.__class__._size += delta.size
+        self.trim()
+        return delta
+
+    def trim(self, budget=None):
+        '''
+        Expires the oldest deltas until the journal fits its budget
+
+        Args:
+            budget (int): budget in bytes. Default: the user preference
+
+        Returns:
+            None
+        '''
+        if budget is None:
+            budget = self.budget
+
+        deltas = self.__class__._deltas
+        expire = 0
+        size = self.__class__._size
+        while size > budget and expire < len(deltas) - 1:
+            size -= deltas[expire].size
+            deltas[expire].expire()
+            expire += 1
+
+        del deltas[:expire]
+        self.__class__._size = size
+
+    def clear(self):
+        '''
+        Expires the deltas of the shown document. Used whenever its macro is
+        replaced, since the deltas refer to nodes that no longer exist. The
+        deltas of other documents are kept.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        documents = MacroDocuments()
+        document = documents.documents[documents.active]
+        kept = []
+        for delta in self.__class__._deltas:
+            if delta.document is document:
+                delta.expire()
+            else:
+                kept.append(delta)
+        self.__class__._deltas[:] = kept
+        self.__class__._size = sum(delta.size for delta in kept)
+
+    def budget():
+        doc = '''
+        int: memory budget of the journal in bytes
+        '''
+        def fget(self):
+            try:
+                return int(lx.eval('user.value replay_undo_memory ?')) * 1024 * 1024
+            except:
+                return self.__class__._default_budget
+        return locals()
+
+    budget = property(**budget())
+
+    def size():
+        doc = '''
+        int: estimated size of all deltas in the journal, in bytes
+        '''
+        def fget(self):
+            return self.__class__._size
+        return locals()
+
+    size = property(**size())
+
+    def deltas():
+        doc = '''
+        list: deltas in the journal, oldest first
+        '''
+        def fget(self):
+            return list(self.__class__._deltas)
+        return locals()
+
+    deltas = property(**deltas())
+
+
+class UndoDelta(object):
+    '''
+    Base class for an undoable edit of the Replay tree. Deltas refer to the
+    nodes they change by identity rather than by path, and are applied and
+    reverted without rebuilding the view; that is left to the undo object.
+
+    Subclasses implement `_apply()` and `_revert()`, which make and undo the
+    edit, and `_release()` if they have a payload to drop on expiry. They set
+    `size` to an estimate of the memory they keep alive.
+
+    Args:
+        None
+
+    Returns:
+        UndoDelta
+    '''
+    # Rough cost of a node kept alive by a delta, and of any other record
+    NODE_SIZE = 3000
+    RECORD_SIZE = 200
+
+    size = 0
+    expired = False
+    # MacroDocument shown when the delta was recorded
+    document = None
+
+    def apply(self):
+        '''
+        Applies the delta (redo)
+
+        Args:
+            None
+
+        Returns:
+            bool: False if the delta has expired and nothing was done
+        '''
+        if self.expired:
+            lx.out('Replay: this step is no longer in the undo journal')
+            return False
+        self.show_document()
+        self._apply()
+        return True
+
+    def revert(self):
+        '''
+        Reverts the delta (undo)
+
+        Args:
+            None
+
+        Returns:
+            bool: False if the delta has expired and nothing was done
+        '''
+        if self.expired:
+            lx.out('Replay: this step is no longer in the undo journal')
+            return False
+        self.show_document()
+        self._revert()
+        return True
+
+    def expire(self):
+        '''
+        Releases the delta's payload. Expired deltas can't be applied or
+        reverted anymore.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self.expired = True
+        self._release()
+
+    def show_document(self):
+        '''
+        Shows the document the delta belongs to, if another one is shown.
+        The view is not rebuilt.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        if self.document is None:
+            return
+        documents = MacroDocuments()
+        for index, document in enumerate(documents.documents):
+            if document is self.document:
+                documents.switch(index)
+                return
+
+    def _release(self):
+        pass
+
+    @classmethod
+    def subtree_size(cls, nodes):
+        '''
+        Estimates the memory kept alive by some nodes and everything built
+        below them
+
+        Args:
+            nodes (list): TreeNode objects
+
+        Returns:
+            int: size in bytes
+        '''
+        count = 0
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.loaded_children)
+        return count * cls.NODE_SIZE
+
+
+class SetDelta(UndoDelta):
+    '''
+    Changes node properties through `Macro.batch_edit()`. Each change is a
+    (node, attr, old, new) tuple, where attr is either a property name or a
+    function taking the node and the value to set.
+
+    Args:
+        changes (list): (node, attr, old, new) tuples, in the order they apply
+
+    Returns:
+        SetDelta
+    '''
+    def __init__(self, changes):
+        self.m_changes = list(changes)
+        self.size = len(self.m_changes) * self.RECORD_SIZE
+
+    def _apply(self):
+        Macro().batch_edit([(node, attr, new) for node, attr, old, new in self.m_changes], notify=False)
+
+    def _revert(self):
+        Macro().batch_edit([(node, attr, old) for node, attr, old, new in reversed(self.m_changes)], notify=False)
+
+    def _release(self):
+        self.m_changes = []
+
+
+class MoveDelta(UndoDelta):
+    '''
+    Moves nodes amongst their siblings. Each move is a (node, from, to) tuple
+    of sibling indices.
+
+    Args:
+        moves (list): (node, from_index, to_index) tuples, in the order they apply
+
+    Returns:
+        MoveDelta
+    '''
+    def __init__(self, moves):
+        self.m_moves = list(moves)
+        self.size = len(self.m_moves) * self.RECORD_SIZE
+
+    def _apply(self):
+        for node, from_index, to_index in self.m_moves:
+            node.index = to_index
+
+    def _revert(self):
+        for node, from_index, to_index in reversed(self.m_moves):
+            node.index = from_index
+
+    def _release(self):
+        self.m_moves = []
+
+
+class InsertDelta(UndoDelta):
+    '''
+    Inserts nodes into the tree. Built from nodes that are already in place;
+    their parents and paths are remembered so that a redo can splice the very
+    same node objects back in.
+
+    Args:
+        nodes (list): TreeNode objects, currently in the tree
+
+    Returns:
+        InsertDelta
+    '''
+    def __init__(self, nodes):
+        # Ascending path order, so each insert makes the next index valid
+        self.m_placements = sorted(((node.path, node.parent, node) for node in nodes), key=lambda x: x[0])
+        self.size = self.subtree_size(nodes)
+
+    def nodes():
+        doc = '''
+        list: nodes handled by the delta, in path order
+        '''
+        def fget(self):
+            return [node for path, parent, node in self.m_placements]
+        return locals()
+
+    nodes = property(**nodes())
+
+    def insert(self):
+        '''Splices the nodes back in, one insert per run of adjacent siblings.'''
+        macro = Macro()
+        runs = []
+        for path, parent, node in self.m_placements:
+            last = runs[-1] if runs else None
+            if last is not None and last[0] is parent and last[1] + len(last[2]) == path[-1]:
+                last[2].append(node)
+            else:
+                runs.append((parent, path[-1], [node]))
+
+        for parent, index, nodes in runs:
+            macro.insert_children(parent, index, nodes, notify=False)
+
+    def remove(self):
+        '''Detaches the nodes. Detached nodes keep their subtree and parent.'''
+        Macro().remove_nodes(self.nodes, notify=False)
+
+    def _apply(self):
+        self.insert()
+
+    def _revert(self):
+        self.remove()
+
+    def _release(self):
+        self.m_placements = []
+
+
+class RemoveDelta(InsertDelta):
+    '''
+    Removes nodes from the tree. The removed subtrees are kept as they are
+    rather than serialized, so undo restores the very same node objects.
+
+    Args:
+        nodes (list): TreeNode objects, currently in the tree
+
+    Returns:
+        RemoveDelta
+    '''
+    def _apply(self):
+        self.remove()
+
+    def _revert(self):
+        self.insert()
+
+
+class CompositeDelta(UndoDelta):
+    '''
+    Several deltas applied in order and reverted in reverse order.
+
+    Args:
+        deltas (list): UndoDelta objects
+
+    Returns:
+        CompositeDelta
+    '''
+    def __init__(self, deltas):
+        self.m_deltas = list(deltas)
+        self.size = sum(delta.size for delta in self.m_deltas)
+
+    def _apply(self):
+        for delta in self.m_deltas:
+            delta._apply()
+
+    def _revert(self):
+        for delta in reversed(self.m_deltas):
+            delta._revert()
+
+    def _release(self):
+        for delta in self.m_deltas:
+            delta.expire()
+        self.m_deltas = []
@@ -1,16 +1,107 @@
 # python
+'''
+The replay package. Every MODO session imports it while loading the kit's
+plugins, so only the modules plugins need at load time are imported eagerly:
+commander, which every command subclasses, and Notifier, which has to be
+blessed at startup. Everything else is imported the first time one of its
+names is used, e.g. `replay.Macro` or `from replay import message`.
+
+Call `import_report()` for the time each lazily imported module took.
+'''
+import sys
+import time
+import types
+import importlib
 
 import commander
-import lumberjack
+from Notifier import *
 
 
-from Macro import *
-from MacroCommand import *
-from MacroBaseCommand import *
-from MacroBlockCommand import *
-from MacroCommandArg import *
-from Notifier import *
-from Message import *
-from RecordingCache import *
-from LXMParser import *
-from CommandAttributes import *
+# Names exported by the package, by the module that defines them
+_lazy_modules = {
+    'lumberjack': None,
+    'Macro': ['Macro'],
+    'MacroCommand': ['MacroCommand'],
+    'MacroBaseCommand': ['MacroBaseCommand'],
+    'MacroBlockCommand': ['MacroBlockCommand'],
+    'MacroCommandArg': ['MacroCommandArg'],
+    'Message': ['MessageCache', 'message'],
+    'RecordingCache': ['RecordingCache'],
+    'Clipboard': ['Clipboard'],
+    'RecentFiles': ['RecentFiles'],
+    'DirectoryCache': ['ScriptEntry', 'DirectoryCache'],
+    'LXMParser': ['LXMError', 'LXMParser'],
+    'PythonParser': ['PythonParser'],
+    'CommandAttributes': ['ArgAttributes', 'CommandAttributes'],
+    'CommandCatalog': ['CommandCatalog'],
+    'UndoJournal': ['UndoJournal', 'UndoDelta', 'SetDelta', 'MoveDelta', 'InsertDelta', 'RemoveDelta', 'CompositeDelta'],
+    'ArgumentIndex': ['ArgumentIndex'],
+    'MacroLibrary': ['LibraryMatch', 'MacroLibrary'],
+    'MacroDiff': ['node_key', 'command_key', 'cache_keys', 'diff', 'DiffEntry', 'MergeConflict', 'MergedBlock',
+                  'tree_diff', 'format_diff', 'changed_nodes', 'merge3', 'conflicts', 'render_merge'],
+    'MacroValidator': ['ValidationIssue', 'MacroValidator'],
+    'MacroDocuments': ['MacroDocument', 'MacroDocuments'],
+}
+
+# Module name by exported name. Subpackages export themselves.
+_lazy_names = {}
+for _module_name, _names in _lazy_modules.items():
+    for _name in (_names or [_module_name]):
+        _lazy_names[_name] = _module_name
+
+# (module name, seconds) for each lazily imported module, in import order
+_import_times = []
+
+
+class _LazyPackage(types.ModuleType):
+    '''
+    Module type of the replay package. Imports a module the first time one
+    of its names is looked up.
+    '''
+    def __getattr__(self, name):
+        module_name = _lazy_names.get(name)
+        if module_name is None:
+            raise AttributeError("'module' object has no attribute '%s'" % name)
+
+        start = time.time()
+        module = importlib.import_module('%s.%s' % (self.__name__, module_name))
+        _import_times.append((module_name, time.time() - start))
+
+        self._export_loaded()
+        return self.__dict__[name]
+
+    def _export_loaded(self):
+        # Importing a submodule binds the module itself to its name in the
+        # package, e.g. replay.Macro, where the class of the same name
+        # belongs. Export the names of every module loaded so far.
+        for module_name, names in _lazy_modules.items():
+            module = sys.modules.get('%s.%s' % (self.__name__, module_name))
+            if module is None:
+                continue
+            for name in names or []:
+                self.__dict__[name] = getattr(module, name)
+            if names is None:
+                self.__dict__[module_name] = module
+
+
+def import_report():
+    '''
+    Lists the lazily imported modules and the time each import took. Times
+    include any modules imported along the way.
+
+    Args:
+        None
+
+    Returns:
+        list: (module name, seconds) tuples, in import order
+    '''
+    return list(_import_times)
+
+
+# Swap this module for a lazy one with the same contents. The original is
+# kept alive, since python 2 clears the globals of a collected module.
+_package = _LazyPackage(__name__, __doc__)
+_package._module = sys.modules[__name__]
+_package.__dict__.update(dict((key, value) for key, value in globals().items() if key not in ('__name__', '__doc__')))
+sys.modules[__name__] = _package
+_package._export_loaded()
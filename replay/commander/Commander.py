@@ -1,10 +1,42 @@
 # python
 
-import lx, lxu, traceback
+import lx, lxu, traceback, types
+from collections import namedtuple
 from lxifc import UIValueHints, Visitor
 from operator import ior
 from Var import *
 
+# What __init__ needs to add an argument, worked out once per command class.
+# datatype is the lowercase datatype name, type the lx.symbol sTYPE_ value
+# and flags the combined fCMDARG_ bits.
+ArgumentSpec = namedtuple('ArgumentSpec', ['name', 'datatype', 'type', 'flags', 'default'])
+
+
+class _ArgumentTemplate(object):
+
+    """One cached argument of a command class. Methods of the instance the
+    argument came from are rebound to each new instance; arguments without
+    any are shared as they are."""
+
+    __slots__ = ('argument', 'methods')
+
+    def __init__(self, argument, instance):
+        self.argument = argument
+        self.methods = dict(
+            (key, value.im_func) for key, value in argument.iteritems()
+            if isinstance(value, types.MethodType) and value.im_self is instance
+        )
+
+    def bind(self, instance):
+        if not self.methods:
+            return self.argument
+
+        argument = dict(self.argument)
+        for key, function in self.methods.iteritems():
+            argument[key] = types.MethodType(function, instance, instance.__class__)
+        return argument
+
+
 class CommanderClass(lxu.command.BasicCommand):
 
     """Wrapper for lxu.command.BasicCommand. Improves and simplifies common
@@ -40,6 +72,9 @@ class CommanderClass(lxu.command.BasicCommand):
     ****************
     """
 
+    # Whether commander_arguments() can be cached per class. See there.
+    commander_cache_arguments = True
+
     def __init__(self):
 
         # Since we run our own __init__(), we need to explicitly run the
@@ -83,36 +118,26 @@ class CommanderClass(lxu.command.BasicCommand):
         except AttributeError:
             self.commander_default_values_init()
 
-        # Loop through command arguments defined in commander_arguments()
-        # and initialize.
-        for n, argument in enumerate(self.commander_arguments()):
+        # Add the arguments defined in commander_arguments(). Their names,
+        # datatypes and flags are worked out once per class; see
+        # commander_argument_specs().
+        specs = self.commander_argument_specs()
+        if specs is None:
+            return lx.symbol.e_FAILED
 
-            # Arguments need a valid name and datatype. Without those, we die.
-
-            if not argument.get(DATATYPE):
-                return lx.symbol.e_FAILED
-
-            if not argument.get(NAME):
-                return lx.symbol.e_FAILED
-
-            datatype = getattr(lx.symbol, 'sTYPE_' + argument[DATATYPE].upper())
-            if not datatype:
-                return lx.symbol.e_FAILED
+        for n, spec in enumerate(specs):
 
             # Add the argument as normal.
-            self.dyna_Add(argument[NAME], datatype)
+            self.dyna_Add(spec.name, spec.type)
 
             # If this is the first time running the command, the class variable
             # _commander_stored_values will be empty. In that case, populate it.
             if n >= len(self._commander_stored_values):
-                self.commander_default_values_set(argument.get(VALUE))
+                self.commander_default_values_set(spec.default)
 
             # If a list of flags is included in the argument, set them.
-            flags = []
-            for flag in argument.get(FLAGS, []):
-                flags.append(getattr(lx.symbol, 'fCMDARG_' + flag.upper()))
-            if flags:
-                self.basic_SetFlags(n, reduce(ior, flags))
+            if spec.flags:
+                self.basic_SetFlags(n, spec.flags)
 
         # CommandClass can implement the commander_notifiers() method to update
         # FormCommandLists and Popups. If implemented, add the notifiers.
@@ -124,9 +149,95 @@ class CommanderClass(lxu.command.BasicCommand):
 
     def commander_arguments(self):
         """To be overridden by subclasses.
-        Should return a list of dictionaries, one for each argument."""
+        Should return a list of dictionaries, one for each argument.
+
+        Called once per class: the result is cached and reused by every
+        instance, with any of this instance's methods in it (e.g. a
+        values_list method) rebound to the new instance. Callables are still
+        called every time they're needed, so dynamic values stay dynamic.
+        Set commander_cache_arguments = False if the list itself changes."""
         return []
 
+    def commander_cached_arguments(self):
+        """Returns commander_arguments() for this instance, from the class
+        cache if commander_cache_arguments is set.
+        You should never need to touch this."""
+        try:
+            return self._commander_argument_list
+        except AttributeError:
+            pass
+
+        if not self.commander_cache_arguments:
+            return self.commander_arguments()
+
+        cls = self.__class__
+        template = cls.__dict__.get('_commander_argument_template')
+
+        if template is None:
+            arguments = self.commander_arguments()
+            cls._commander_argument_template = [_ArgumentTemplate(argument, self) for argument in arguments]
+
+        else:
+            arguments = [argument.bind(self) for argument in template]
+
+        self._commander_argument_list = arguments
+        return arguments
+
+    def commander_argument_specs(self):
+        """Returns an ArgumentSpec for each argument, or None if any argument
+        lacks a valid name or datatype. Cached per class along with the
+        arguments.
+        You should never need to touch this."""
+        cls = self.__class__
+        if self.commander_cache_arguments and '_commander_argument_specs' in cls.__dict__:
+            return cls._commander_argument_specs
+
+        specs = []
+        for argument in self.commander_cached_arguments():
+
+            # Arguments need a valid name and datatype. Without those, we die.
+            if not argument.get(DATATYPE) or not argument.get(NAME):
+                specs = None
+                break
+
+            datatype = getattr(lx.symbol, 'sTYPE_' + argument[DATATYPE].upper())
+            if not datatype:
+                specs = None
+                break
+
+            flags = [getattr(lx.symbol, 'fCMDARG_' + flag.upper()) for flag in argument.get(FLAGS, [])]
+
+            specs.append(ArgumentSpec(
+                argument[NAME],
+                argument[DATATYPE].lower(),
+                datatype,
+                reduce(ior, flags) if flags else 0,
+                argument.get(VALUE)
+            ))
+
+        if self.commander_cache_arguments:
+            cls._commander_argument_specs = specs
+        return specs
+
+    def commander_value_hints(self, index, hints_class, values):
+        """Returns a hints_class object for the values. The last object made
+        for each argument of the class is reused as long as the values are
+        unchanged, so popups that are queried over and over don't rebuild
+        their lists.
+        You should never need to touch this."""
+        cls = self.__class__
+        if '_commander_hints' not in cls.__dict__:
+            cls._commander_hints = {}
+
+        cached = cls._commander_hints.get(index)
+        if cached is not None and cached[0] is hints_class and cached[1] == values:
+            return cached[2]
+
+        values = list(values)
+        hints = hints_class(values)
+        cls._commander_hints[index] = (hints_class, values, hints)
+        return hints
+
     def commander_notifiers(self):
         """To be overridden by subclasses.
         Should return a list of tuples, e
@@ -196,25 +307,27 @@ class CommanderClass(lxu.command.BasicCommand):
         if not self.dyna_IsSet(index):
             return default
 
+        datatype = self.commander_argument_specs()[index].datatype
+
         # If it's a string, use dyna_String to grab it.
-        if self.commander_arguments()[index][DATATYPE].lower() in sTYPE_STRINGs:
+        if datatype in sTYPE_STRINGs:
             return self.dyna_String(index)
 
         # If the value is a vector, use dyna_String to grab it, then parse it
         # into a list of float vlues.
-        elif self.commander_arguments()[index][DATATYPE].lower() in sTYPE_STRING_vectors:
+        elif datatype in sTYPE_STRING_vectors:
             return [float(i) for i in self.dyna_String(index).split(" ")]
 
         # If the value is an integer, use dyna_Int to grab it.
-        elif self.commander_arguments()[index][DATATYPE].lower() in sTYPE_INTEGERs:
+        elif datatype in sTYPE_INTEGERs:
             return self.dyna_Int(index)
 
         # If the value is a float, use dyna_Float to grab it.
-        elif self.commander_arguments()[index][DATATYPE].lower in sTYPE_FLOATs:
+        elif datatype in sTYPE_FLOATs:
             return self.dyna_Float(index)
 
         # If the value is a boolean, use dyna_Bool to grab it.
-        elif self.commander_arguments()[index][DATATYPE].lower() in sTYPE_BOOLEANs:
+        elif datatype in sTYPE_BOOLEANs:
             return self.dyna_Bool(index)
 
         # If something bonkers is going on, use the default.
@@ -223,8 +336,8 @@ class CommanderClass(lxu.command.BasicCommand):
     def commander_args(self):
         """Returns a dictionary of arguments in name:value pairs."""
         args = {}
-        for i in range(len(self.commander_arguments())):
-            name = self.commander_arguments()[i][NAME]
+        for i, spec in enumerate(self.commander_argument_specs()):
+            name = spec.name
             value = self.commander_arg_value(i)
             args[name] = value
         return args
@@ -235,8 +348,8 @@ class CommanderClass(lxu.command.BasicCommand):
         NOTE: Always returns strings, regardless of datatype. If you want datatype
         detection (and you probably do), use commander_args()."""
         args = {}
-        for i in range(len(self.commander_arguments())):
-            name = self.commander_arguments()[i][NAME]
+        for i, spec in enumerate(self.commander_argument_specs()):
+            name = spec.name
             value = self.commander_arg_string(i)
             args[name] = value
         return args
@@ -275,7 +388,7 @@ class CommanderClass(lxu.command.BasicCommand):
 
         You should never need to touch this."""
 
-        args = self.commander_arguments()
+        args = self.commander_cached_arguments()
         if index < len(args):
 
             # If an explicit label is provided, use it.
@@ -307,7 +420,7 @@ class CommanderClass(lxu.command.BasicCommand):
 
         You should never need to touch this."""
 
-        args = self.commander_arguments()
+        args = self.commander_cached_arguments()
         if index < len(args):
             arg = args[index]
             arg_data = None
@@ -342,14 +455,13 @@ class CommanderClass(lxu.command.BasicCommand):
             # Form Command List. We'll need to return a different class
             # depending on the 'values_list_type'.
 
-            if self.valueListType(index) == POPUP:
-                return PopupClass(values)
+            values_list_type = self.valueListType(index)
 
-            elif self.valueListType(index) == sPresetText:
-                return PopupClass(values)
+            if values_list_type in (POPUP, sPresetText):
+                return self.commander_value_hints(index, PopupClass, values)
 
-            elif self.valueListType(index) == FCL:
-                return FormCommandListClass(values)
+            elif values_list_type == FCL:
+                return self.commander_value_hints(index, FormCommandListClass, values)
 
     def cmd_DialogInit(self):
         """Sets default values for arguments in command dialogs as
@@ -358,7 +470,7 @@ class CommanderClass(lxu.command.BasicCommand):
 
         You should never need to touch this."""
 
-        for n, argument in enumerate(self.commander_arguments()):
+        for n, argument in enumerate(self.commander_cached_arguments()):
 
             # If we already have a value, use it.
             # This is especially important when a command is run with args
@@ -368,7 +480,7 @@ class CommanderClass(lxu.command.BasicCommand):
 
             datatype = argument.get(DATATYPE, '').lower()
             stored_value = self._commander_stored_values[n]
-            default_value = self.commander_arguments()[n].get(VALUE)
+            default_value = argument.get(VALUE)
 
             # If there's no default and nothing stored, we're done here.
             if default_value == None and not stored_value:
@@ -393,7 +505,7 @@ class CommanderClass(lxu.command.BasicCommand):
 
         You should never need to touch this."""
 
-        for n, argument in enumerate(self.commander_arguments()):
+        for n, argument in enumerate(self.commander_cached_arguments()):
             self._commander_stored_values[n] = self.commander_arg_value(n)
 
         try:
@@ -402,7 +514,7 @@ class CommanderClass(lxu.command.BasicCommand):
             lx.out(traceback.format_exc())
             
     def valueListType(self, index):
-        args = self.commander_arguments()
+        args = self.commander_cached_arguments()
         type = args[index].get(VALUES_LIST_TYPE)
         if hasattr(type, '__call__'):
             return type()
@@ -420,7 +532,7 @@ class CommanderClass(lxu.command.BasicCommand):
         va = lx.object.ValueArray()
         va.set(vaQuery)
 
-        args = self.commander_arguments()
+        args = self.commander_cached_arguments()
 
         # If index out of range, bail
         if index > len(args):
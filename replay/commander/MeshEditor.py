@@ -1,6 +1,7 @@
 import lx, lxu, traceback
 from lxifc import UIValueHints, Visitor
 from operator import ior
+from MeshSnapshot import MeshSnapshot
 
 class MeshEditorClass():
     def __init__(self, args = None, mesh_edit_flags = []):
@@ -12,6 +13,14 @@ class MeshEditorClass():
         self.edge_accessor = None
         self.meshmap_accessor = None
         self.point_accessor = None
+        self.snapshot = None
+
+    def mesh_snapshot(self):
+        """Returns a MeshSnapshot of the current layer, taken on first use.
+        Set `self.snapshot = None` after editing the mesh to take a new one."""
+        if self.snapshot is None:
+            self.snapshot = MeshSnapshot(self.mesh_svc, self.mesh, self.polygon_accessor)
+        return self.snapshot
 
     def mesh_edit_action(self):
         return None
@@ -42,6 +51,7 @@ class MeshEditorClass():
             return
 
         for n in xrange (layer_scan.Count ()):
+            self.snapshot = None
             if read_only:
                 self.mesh = lx.object.Mesh (layer_scan.MeshBase(n))
             if not read_only:
@@ -85,61 +95,19 @@ class MeshEditorClass():
         layer_scan.Apply ()
 
     def get_active_polys_by_island(self):
-        mark_mode_checked = self.mesh_svc.ModeCompose ('user0', None)
-        mark_mode_unchecked = self.mesh_svc.ModeCompose (None, 'user0')
-
-        visClear = SetMarksClass (self.polygon_accessor, mark_mode_unchecked)
-        self.polygon_accessor.Enumerate (mark_mode_checked, visClear, 0)
-
-        visIslands = PolysByIslandClass (self.polygon_accessor, self.point_accessor, mark_mode_checked)
-        self.polygon_accessor.Enumerate (mark_mode_unchecked, visIslands, 0)
-
-        return visIslands.islands
+        return self.mesh_snapshot().islands()
 
     def get_active_polys(self):
-        mark_mode_selected = self.mesh_svc.ModeCompose (lx.symbol.sMARK_SELECT, None)
-        mark_mode_valid = self.mesh_svc.ModeCompose (None, 'hide lock')
-
-        visitor = PolysClass (self.polygon_accessor, self.edge_accessor, mark_mode_valid)
-        self.polygon_accessor.Enumerate (mark_mode_selected, visitor, 0)
-
-        return visitor.getPolyIDs()
+        return self.mesh_snapshot().active_polys()
 
     def get_selected_polys_by_island(self):
-        mark_mode_toCheck = self.mesh_svc.ModeCompose (lx.symbol.sMARK_SELECT, lx.symbol.sMARK_USER_0)
-        mark_mode_valid = self.mesh_svc.ModeCompose (None, ' '.join ((lx.symbol.sMARK_USER_0, lx.symbol.sMARK_HIDE, lx.symbol.sMARK_LOCK)))
-        mark_mode_checked = self.mesh_svc.ModeCompose (lx.symbol.sMARK_USER_0, None)
-        mark_mode_clearChecked = self.mesh_svc.ModeCompose (None, lx.symbol.sMARK_USER_0)
-
-        # Wipe any existing user0 marks on the polygons, just so they don't interfere with our marks.
-        visClear = SetMarksClass (self.polygon_accessor, mark_mode_clearChecked)
-        self.polygon_accessor.Enumerate (mark_mode_checked, visClear, 0)
-
-        visitor = PolysByConnectedClass (self.polygon_accessor, self.edge_accessor, mark_mode_valid, mark_mode_checked)
-        self.polygon_accessor.Enumerate (mark_mode_toCheck, visitor, 0)
-
-        return visitor.getIslands()
+        return self.mesh_snapshot().selected_islands()
 
     def get_selected_polys_by_flood(self, i_POLYTAG = lx.symbol.i_POLYTAG_MATERIAL):
-        mark_mode_selected = self.mesh_svc.ModeCompose (lx.symbol.sMARK_SELECT, None)
-        mark_mode_valid = self.mesh_svc.ModeCompose (None, 'hide lock')
-
-        visitor = PolysByTagFloodClass (self.polygon_accessor, self.edge_accessor, mark_mode_valid, i_POLYTAG)
-        self.polygon_accessor.Enumerate (mark_mode_selected, visitor, 0)
-
-        return visitor.getPolyIDs()
+        return self.mesh_snapshot().flood_by_tag(i_POLYTAG)
 
     def get_selected_polys(self):
-        mark_mode = self.mesh_svc.ModeCompose (lx.symbol.sMARK_SELECT, 'hide lock')
-        selectedPolygons = set()
-        polyCount = self.mesh.PolygonCount ()
-
-        for p in xrange(polyCount):
-            self.polygon_accessor.SelectByIndex(p)
-            if self.polygon_accessor.TestMarks (mark_mode):
-                selectedPolygons.add (self.polygon_accessor.ID())
-
-        return selectedPolygons
+        return self.mesh_snapshot().selected_polys()
 
 class SetMarksClass(Visitor):
     def __init__(self, acc, mark):
@@ -0,0 +1,395 @@
+import lx
+from array import array
+from lxifc import Visitor
+
+# Polygon state flags
+POLY_SELECTED = 1
+POLY_HIDDEN = 2
+POLY_LOCKED = 4
+
+
+class MeshSnapshot(object):
+    """Flat copy of a mesh layer's polygon topology and mark state.
+
+    Selected, hidden and locked polygons are read by enumerating each mark,
+    which only visits the matching polygons. Polygons and their points are
+    read in one pass through the accessors the first time a query needs
+    them. Everything else (point to polygon lookups, islands, floods) runs
+    on the buffers, without calling back into the mesh. Islands and floods
+    are unions of polygon pairs in a UnionFind, computed once per snapshot.
+
+    Polygons and points are referred to by index. `poly_ids` and `point_ids`
+    map indices back to the IDs the accessors use.
+
+    Buffers:
+        poly_flags (bytearray): POLY_SELECTED | POLY_HIDDEN | POLY_LOCKED by polygon index
+        poly_ids (list): polygon IDs by polygon index
+        poly_offsets (array): points of polygon i are poly_points[poly_offsets[i]:poly_offsets[i+1]]
+        poly_points (array): point indices
+        point_ids (list): point IDs by point index
+        point_offsets, point_polys (array): polygons around each point
+
+    The snapshot is not updated when the mesh changes. Take a new one after
+    editing."""
+
+    def __init__(self, mesh_svc, mesh, polygon_accessor):
+        self.mesh = mesh
+        self.polygon_accessor = polygon_accessor
+        self.poly_count = mesh.PolygonCount()
+        self._poly_ids = None
+        self._poly_offsets = None
+        self._poly_points = None
+        self._point_ids = None
+        self._point_offsets = None
+        self._point_polys = None
+        self._tags = {}
+        self._edge_pairs = None
+        # Query results, kept for the life of the snapshot
+        self._results = {}
+
+        # IDs of the marked polygons, by index, known before the topology is read
+        self.marked_ids = {}
+        self.poly_flags = bytearray(self.poly_count)
+        for flag, mark in ((POLY_SELECTED, lx.symbol.sMARK_SELECT),
+                           (POLY_HIDDEN, lx.symbol.sMARK_HIDE),
+                           (POLY_LOCKED, lx.symbol.sMARK_LOCK)):
+            self.read_mark(mesh_svc.ModeCompose(mark, None), flag)
+        self.selected = sorted(index for index, flags in enumerate(self.poly_flags) if flags & POLY_SELECTED) \
+            if self.marked_ids else []
+
+    def read_mark(self, mark_mode, flag):
+        """Sets `flag` on the polygons matching a mark mode."""
+        visitor = PolyIndexVisitor(self.polygon_accessor)
+        self.polygon_accessor.Enumerate(mark_mode, visitor, 0)
+        flags = self.poly_flags
+        for index, poly_id in visitor.polys:
+            flags[index] |= flag
+            self.marked_ids[index] = poly_id
+
+    def read_topology(self):
+        """Reads every polygon's ID and points."""
+        polygon = self.polygon_accessor
+        poly_ids = self._poly_ids = []
+        poly_points = self._poly_points = array('l')
+        poly_offsets = self._poly_offsets = array('l', [0])
+        point_ids = self._point_ids = []
+        point_index = {}
+
+        for p in xrange(self.poly_count):
+            polygon.SelectByIndex(p)
+            poly_ids.append(polygon.ID())
+            for v in xrange(polygon.VertexCount()):
+                point_id = polygon.VertexByIndex(v)
+                index = point_index.get(point_id)
+                if index is None:
+                    index = point_index[point_id] = len(point_ids)
+                    point_ids.append(point_id)
+                poly_points.append(index)
+            poly_offsets.append(len(poly_points))
+
+    def tags(self, i_POLYTAG):
+        """Returns the string tag of every polygon for a tag type, read on
+        first use."""
+        if i_POLYTAG not in self._tags:
+            tag = lx.object.StringTag()
+            tag.set(self.polygon_accessor)
+            values = []
+            for p in xrange(self.poly_count):
+                self.polygon_accessor.SelectByIndex(p)
+                values.append(tag.Get(i_POLYTAG))
+            self._tags[i_POLYTAG] = values
+        return self._tags[i_POLYTAG]
+
+    @property
+    def poly_ids(self):
+        if self._poly_ids is None:
+            self.read_topology()
+        return self._poly_ids
+
+    @property
+    def poly_offsets(self):
+        if self._poly_offsets is None:
+            self.read_topology()
+        return self._poly_offsets
+
+    @property
+    def poly_points(self):
+        if self._poly_points is None:
+            self.read_topology()
+        return self._poly_points
+
+    @property
+    def point_ids(self):
+        if self._point_ids is None:
+            self.read_topology()
+        return self._point_ids
+
+    @property
+    def point_count(self):
+        return len(self.point_ids)
+
+    def points(self, poly):
+        """Point indices of a polygon."""
+        return self.poly_points[self.poly_offsets[poly]:self.poly_offsets[poly + 1]]
+
+    def build_point_polys(self):
+        """Inverts polygon to point into point to polygon, by counting."""
+        counts = array('l', [0]) * (len(self.point_ids) + 1)
+        for point in self.poly_points:
+            counts[point + 1] += 1
+        for i in xrange(len(self.point_ids)):
+            counts[i + 1] += counts[i]
+
+        point_polys = array('l', [0]) * len(self.poly_points)
+        fill = array('l', counts)
+        offsets = self.poly_offsets
+        points = self.poly_points
+        for poly in xrange(self.poly_count):
+            for i in xrange(offsets[poly], offsets[poly + 1]):
+                point = points[i]
+                point_polys[fill[point]] = poly
+                fill[point] += 1
+
+        self._point_offsets = counts
+        self._point_polys = point_polys
+
+    @property
+    def point_offsets(self):
+        if self._point_offsets is None:
+            self.build_point_polys()
+        return self._point_offsets
+
+    @property
+    def point_polys(self):
+        if self._point_polys is None:
+            self.build_point_polys()
+        return self._point_polys
+
+    def polys_around(self, point):
+        """Indices of the polygons using a point."""
+        offsets = self.point_offsets
+        return self.point_polys[offsets[point]:offsets[point + 1]]
+
+    def edge_neighbors(self, poly):
+        """Indices of the polygons sharing an edge with a polygon."""
+        points = self.points(poly)
+        count = len(points)
+        neighbors = set()
+        for i in xrange(count):
+            shared = set(self.polys_around(points[i]))
+            shared.intersection_update(self.polys_around(points[(i + 1) % count]))
+            neighbors |= shared
+        neighbors.discard(poly)
+        return neighbors
+
+    def point_neighbors(self, poly):
+        """Indices of the polygons sharing a point with a polygon."""
+        neighbors = set()
+        for point in self.points(poly):
+            neighbors.update(self.polys_around(point))
+        neighbors.discard(poly)
+        return neighbors
+
+    def is_valid(self, poly):
+        """Whether a polygon is neither hidden nor locked."""
+        return not self.poly_flags[poly] & (POLY_HIDDEN | POLY_LOCKED)
+
+    def ids(self, polys):
+        poly_ids = self.poly_ids
+        return set(poly_ids[poly] for poly in polys)
+
+    def active_polys(self):
+        """IDs of the selected polygons."""
+        return set(self.marked_ids[poly] for poly in self.selected)
+
+    def selected_polys(self):
+        """IDs of the selected polygons that are neither hidden nor locked."""
+        return set(self.marked_ids[poly] for poly in self.selected if self.is_valid(poly))
+
+    def build_edge_pairs(self):
+        """Lists the pairs of polygons sharing an edge. On edges shared by
+        more than two polygons, every two of them make a pair."""
+        first = array('l')
+        second = array('l')
+        edge_polys = {}
+        point_count = len(self.point_ids)
+        offsets = self.poly_offsets
+        points = self.poly_points
+        for poly in xrange(self.poly_count):
+            start = offsets[poly]
+            end = offsets[poly + 1]
+            for i in xrange(start, end):
+                a = points[i]
+                b = points[i + 1] if i + 1 < end else points[start]
+                key = a * point_count + b if a < b else b * point_count + a
+                polys = edge_polys.setdefault(key, [])
+                for other in polys:
+                    if other != poly:
+                        first.append(other)
+                        second.append(poly)
+                polys.append(poly)
+        self._edge_pairs = (first, second)
+
+    @property
+    def edge_pairs(self):
+        if self._edge_pairs is None:
+            self.build_edge_pairs()
+        return self._edge_pairs
+
+    def edge_components(self, mask):
+        """UnionFind of the polygons connected by shared edges, through
+        polygons whose `mask` entry is set."""
+        components = UnionFind(self.poly_count)
+        first, second = self.edge_pairs
+        union = components.union
+        for i in xrange(len(first)):
+            a = first[i]
+            b = second[i]
+            if mask[a] and mask[b]:
+                union(a, b)
+        return components
+
+    def valid_mask(self):
+        """bytearray set for the polygons that are neither hidden nor locked."""
+        if 'valid' not in self._results:
+            invalid = POLY_HIDDEN | POLY_LOCKED
+            self._results['valid'] = bytearray(0 if flags & invalid else 1 for flags in self.poly_flags)
+        return self._results['valid']
+
+    def islands(self):
+        """Sets of polygon IDs connected by shared points, for every polygon."""
+        if 'islands' not in self._results:
+            components = UnionFind(self.poly_count)
+            union = components.union
+            offsets = self.point_offsets
+            point_polys = self.point_polys
+            for point in xrange(len(self.point_ids)):
+                start = offsets[point]
+                for i in xrange(start + 1, offsets[point + 1]):
+                    union(point_polys[start], point_polys[i])
+            self._results['islands'] = [self.ids(members) for members in components.members(xrange(self.poly_count)).itervalues()]
+        return [set(island) for island in self._results['islands']]
+
+    def selected_islands(self):
+        """Tuples of polygon IDs connected by shared edges to the selected
+        polygons, through polygons that are neither hidden nor locked and not
+        in an island already."""
+        if 'selected_islands' not in self._results:
+            valid = self.valid_mask()
+            components = self.edge_components(valid)
+            members = None
+            claimed = set()
+            islands = []
+            for seed in self.selected:
+                if valid[seed]:
+                    roots = [components.find(seed)]
+                    island = set()
+                else:
+                    # Hidden or locked selected polygons start an island of
+                    # their own, taking in the unclaimed islands around them
+                    roots = [components.find(neighbor) for neighbor in self.edge_neighbors(seed) if valid[neighbor]]
+                    island = set([seed])
+
+                roots = [root for root in set(roots) if root not in claimed]
+                if valid[seed] and not roots:
+                    continue
+                if members is None:
+                    members = components.members(xrange(self.poly_count), valid)
+                for root in roots:
+                    claimed.add(root)
+                    island.update(members[root])
+                islands.append(tuple(self.ids(island)))
+            self._results['selected_islands'] = islands
+        return list(self._results['selected_islands'])
+
+    def flood_by_tag(self, i_POLYTAG):
+        """IDs of the polygons reached from each selected polygon by shared
+        edges, through polygons that are neither hidden nor locked and share
+        a tag value with that selected polygon."""
+        key = ('flood_by_tag', i_POLYTAG)
+        if key in self._results:
+            return set(self._results[key])
+        if not self.selected:
+            return set()
+
+        tags = self.tags(i_POLYTAG)
+        valid = self.valid_mask()
+
+        # Tag strings are split once per distinct string
+        split = {}
+        for tag in set(tags):
+            split[tag] = frozenset((tag or '').split(';'))
+
+        # Selected polygons grouped by the tag values they flood through
+        seeds = {}
+        for seed in self.selected:
+            seeds.setdefault(split[tags[seed]] if tags[seed] else frozenset(), []).append(seed)
+
+        reached = set()
+        for seed_values, group in seeds.iteritems():
+            reached.update(group)
+            if not seed_values:
+                continue
+
+            matches = dict((tag, not seed_values.isdisjoint(values)) for tag, values in split.iteritems())
+            mask = bytearray(1 if valid[poly] and matches[tags[poly]] else 0 for poly in xrange(self.poly_count))
+            components = self.edge_components(mask)
+
+            roots = set()
+            for seed in group:
+                if mask[seed]:
+                    roots.add(components.find(seed))
+                else:
+                    roots.update(components.find(neighbor) for neighbor in self.edge_neighbors(seed) if mask[neighbor])
+            for root, members in components.members(xrange(self.poly_count), mask).iteritems():
+                if root in roots:
+                    reached.update(members)
+
+        self._results[key] = self.ids(reached)
+        return set(self._results[key])
+
+
+class UnionFind(object):
+    """Disjoint sets of the integers 0 to count - 1, in arrays."""
+
+    def __init__(self, count):
+        self.parent = array('l', xrange(count))
+        self.size = array('l', [1]) * count
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            # Path halving
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a, b):
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return a
+        size = self.size
+        if size[a] < size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        size[a] += size[b]
+        return a
+
+    def members(self, items, mask=None):
+        """Returns {root: [members]} for items, or the items set in mask."""
+        members = {}
+        find = self.find
+        for item in items:
+            if mask is None or mask[item]:
+                members.setdefault(find(item), []).append(item)
+        return members
+
+
+class PolyIndexVisitor(Visitor):
+    def __init__(self, polygon):
+        self.polygon = polygon
+        self.polys = []
+
+    def vis_Evaluate(self):
+        self.polys.append((self.polygon.Index(), self.polygon.ID()))
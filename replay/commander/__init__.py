@@ -5,4 +5,5 @@ __author__ = "Adam"
 
 from Commander import *
 from MeshEditor import *
+from MeshSnapshot import *
 from Var import *
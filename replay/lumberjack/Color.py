@@ -1,10 +1,30 @@
 # python
 
 class Color(object):
+    """Immutable rich text color for treeview cells.
 
-    def __init__(self):
-        self._internal_rgb = []
-        self._special = None
+    Nearly every cell in a tree uses one of a handful of colors, so instances
+    are interned: constructing a color with the same values twice returns the
+    same shared object. To change a cell's color, assign a new `Color` to it
+    rather than modifying the existing one:
+
+    `value.color = Color.by_name('gray')`
+    `value.color = Color.from_hex('#ff0000')`"""
+
+    __slots__ = ('_internal_rgb', '_special')
+
+    _instances = {}
+
+    def __new__(cls, special=None, rgb=None):
+        rgb = tuple(rgb) if rgb else ()
+        key = (special, rgb)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = super(Color, cls).__new__(cls)
+            instance._special = special
+            instance._internal_rgb = rgb
+            cls._instances[key] = instance
+        return instance
 
     # Markup for rich text
     def markup(self):
@@ -21,45 +41,42 @@ class Color(object):
         r, g, b = [int(n * 255) for n in self._internal_rgb]
         return str(0x01000000 | ((r << 16) | (g << 8 | b)))
 
-    # Set Explicit Color
-    def set_with_8bit(self, r, g, b):
-        """Sets internal RGB with three int values between 0-255."""
-        self._internal_rgb = [(n / 255) for n in (r, g, b)]
+    # Explicit Color
+    @classmethod
+    def from_8bit(cls, r, g, b):
+        """Returns the color for three int values between 0-255."""
+        return cls(rgb=[(n / 255.0) for n in (r, g, b)])
 
-    def set_with_float(self, r, g, b):
-        """Sets internal RGB with three decimal values 0.0-1.0"""
-        self._internal_rgb = [r, g, b]
+    @classmethod
+    def from_float(cls, r, g, b):
+        """Returns the color for three decimal values 0.0-1.0"""
+        return cls(rgb=[r, g, b])
 
-    def set_with_hex(self, h):
-        """Sets internal RGB using a 16-bit hex code string, e.g. "#ffffff"""
+    @classmethod
+    def from_hex(cls, h):
+        """Returns the color for a 16-bit hex code string, e.g. "#ffffff"""
         h = h.strip()
         if h[0] == '#':
             h = h[1:]
         r, g, b = h[:2], h[2:4], h[4:]
-        r, g, b = [int(n, 16) for n in (r, g, b)]
-        self._internal_rgb = [r, g, b]
+        return cls.from_8bit(*[int(n, 16) for n in (r, g, b)])
 
-    # Set Special Color
-    def special_by_int():
+    # Special Color
+    def special():
         doc = """Certain specific color codes are built-in to MODO for common UI
-        conventions, such as 4113 for grayed out text. Should be a string. If
-        unsure, leave this alone."""
+        conventions, such as 4113 for grayed out text. If unsure, leave this alone."""
         def fget(self):
-            return self._special_by_int
-        def fset(self, value):
-            self._special_by_int = value
-            self._internal_rgb = []
+            return self._special
         return locals()
 
-    special_by_int = property(**special_by_int())
+    special = property(**special())
 
-    def special_by_name(self, name):
-        """Sets special MODO colors by human-readable names."""
+    @classmethod
+    def by_name(cls, name):
+        """Returns special MODO colors by human-readable names."""
         if name in ['gray', 'grey']:
             # 4113 is a special color for grayed-out text in MODO
-            self._special = 4113
-        elif name == 'default':
-            self._special = None
+            return cls(special=4113)
         elif name == 'black':
-            self._special = None
-            self._internal_rgb = [0,0,0]
+            return cls(rgb=[0, 0, 0])
+        return cls()
@@ -2,9 +2,22 @@
 
 
 class Font(object):
-    """Special class for storing and retrieving font flags for use in treeviews."""
+    """Special class for storing and retrieving font flags for use in treeviews.
 
-    _font = None
+    Fonts are immutable and interned, so all cells using the same font share
+    one object. Assign a new font to change a cell: `value.font = Font.italic()`"""
+
+    __slots__ = ('_font',)
+
+    _instances = {}
+
+    def __new__(cls, font=None):
+        instance = cls._instances.get(font)
+        if instance is None:
+            instance = super(Font, cls).__new__(cls)
+            instance._font = font
+            cls._instances[font] = instance
+        return instance
 
     def markup(self):
         """Returns the markup string for use in treeview cells."""
@@ -12,14 +25,18 @@ class Font(object):
             return '\x03({}:{})'.format('f', self._font)
         return ''
 
-    def set_bold(self):
-        self._font = 'FONT_BOLD'
+    @classmethod
+    def bold(cls):
+        return cls('FONT_BOLD')
 
-    def set_italic(self):
-        self._font = 'FONT_ITALIC'
+    @classmethod
+    def italic(cls):
+        return cls('FONT_ITALIC')
 
-    def set_normal(self):
-        self._font = 'FONT_NORMAL'
+    @classmethod
+    def normal(cls):
+        return cls('FONT_NORMAL')
 
-    def set_default(self):
-        self._font = 'FONT_DEFAULT'
+    @classmethod
+    def default(cls):
+        return cls('FONT_DEFAULT')
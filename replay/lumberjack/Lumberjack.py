@@ -136,9 +136,12 @@ class Lumberjack(object):
     `Lumberjack().children[n].columns[col_name].value = value # equiv of above`
     `Lumberjack().children[n].columns[col_name].display_value = display_value`
     `Lumberjack().children[n].columns[col_name].input_region = region_name`
-    `Lumberjack().children[n].columns[col_name].color.set_with_hex("#ffffff")`
-    `Lumberjack().children[n].columns[col_name].font.set_bold()`
-    `Lumberjack().children[n].columns[col_name].font.set_italic()`
+    `Lumberjack().children[n].columns[col_name].color = Color.from_hex("#ffffff")`
+    `Lumberjack().children[n].columns[col_name].font = Font.bold()`
+    `Lumberjack().children[n].columns[col_name].font = Font.italic()`
+
+    Colors and fonts are immutable objects shared between cells, so always
+    assign a new one rather than modifying the current one.
 
     Attributes are TreeNodes that appear under the `+` sign in the MODO UI.
     They have the same columns as other nodes, but are separate from the
@@ -500,6 +503,66 @@ class Lumberjack(object):
             kwargs['parent'].children.insert(kwargs['index'], newNode)
         return newNode
 
+    def insert_children(self, parent, index, nodes, notify=True):
+        """Inserts a list of detached `TreeNode()` objects as children of `parent`,
+        starting at `index`, with a single splice of the children list. Fires one
+        `path_event()` and one `rebuild_view()` unless `notify` is False.
+
+        :param parent: (TreeNode) new parent node; root if None
+        :param index: (int) index of the first inserted node; appends if None
+        :param nodes: (list) nodes to insert
+        :param notify: (bool) fire path event and rebuild the view"""
+        if parent is None:
+            parent = self.root
+
+        children = parent.children
+        if index is None:
+            index = len(children)
+
+        for node in nodes:
+            node.parent = parent
+        children[index:index] = nodes
+
+        if notify:
+            self.path_event()
+            self.rebuild_view()
+
+        return nodes
+
+    def remove_nodes(self, nodes, notify=True):
+        """Removes a list of `TreeNode()` objects, along with their descendants,
+        from the tree. Each parent's children list is rebuilt once, however many of
+        its children are removed. Fires one `path_event()` and one `rebuild_view()`
+        unless `notify` is False.
+
+        Removed nodes keep their `parent` property, so they can be inspected or
+        inserted back with `insert_children()`.
+
+        :param nodes: (list) nodes to remove
+        :param notify: (bool) fire path event and rebuild the view"""
+        removed = set(id(node) for node in nodes)
+
+        # If we don't clear out the `primary` property for the controller,
+        # a removed node will live on as a zombie.
+        node = self.primary
+        while node is not None:
+            if id(node) in removed:
+                self.primary = None
+                break
+            node = node.parent
+
+        parents = {}
+        for node in nodes:
+            if node.parent is not None:
+                parents[id(node.parent)] = node.parent
+
+        for parent in parents.values():
+            parent.children[:] = [child for child in parent.children if id(child) not in removed]
+
+        if notify:
+            self.path_event()
+            self.rebuild_view()
+
     def clear(self):
         """Deletes all nodes from the tree."""
         self.primary = None
@@ -566,3 +629,70 @@ class Lumberjack(object):
             return Lumberjack.node_for_path_recursive(self.root, path)
         except Lumberjack.BadPath:
             raise Exception("Invalid path %s" % str(path))
+
+    def nodes_for_paths(self, paths):
+        """Returns the `TreeNode()` objects at a list of paths, in the same order.
+        Each parent is looked up once, however many of its children are asked for.
+
+        :param paths: (list) paths of the nodes"""
+        parents = {}
+        nodes = []
+        for path in paths:
+            key = tuple(path[:-1])
+            parent = parents.get(key)
+            if parent is None:
+                parent = parents[key] = self.node_for_path(path[:-1])
+            if not path:
+                nodes.append(parent)
+                continue
+            try:
+                nodes.append(parent.children[path[-1]])
+            except IndexError:
+                raise Exception("Invalid path %s" % str(path))
+        return nodes
+
+    def paths_for_nodes(self, nodes):
+        """Returns the paths of a list of `TreeNode()` objects, in the same order.
+        Sibling indices are mapped once per parent instead of searching the
+        parent's children for every node, so the cost stays linear however many
+        siblings the nodes share.
+
+        :param nodes: (list) nodes in the tree"""
+        indices = {}
+        paths = {}
+
+        def path_for(node):
+            path = paths.get(id(node))
+            if path is not None:
+                return path
+
+            parent = node.parent
+            if parent is None:
+                path = []
+            else:
+                key = (id(parent), node.is_attribute)
+                siblings = indices.get(key)
+                if siblings is None:
+                    child_list = parent.attributes if node.is_attribute else parent.children
+                    siblings = indices[key] = dict((id(child), index) for index, child in enumerate(child_list))
+                path = path_for(parent) + [siblings[id(node)]]
+
+            paths[id(node)] = path
+            return path
+
+        return [list(path_for(node)) for node in nodes]
+
+    def top_level_nodes(self, nodes):
+        """Returns the nodes from a list that have none of their ancestors in the
+        list, in their original order.
+
+        :param nodes: (list) nodes in the tree"""
+        ids = set(id(node) for node in nodes)
+        top_level = []
+        for node in nodes:
+            parent = node.parent
+            while parent is not None and id(parent) not in ids:
+                parent = parent.parent
+            if parent is None:
+                top_level.append(node)
+        return top_level
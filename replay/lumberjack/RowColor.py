@@ -26,9 +26,14 @@ class RowColor(object):
     - 'dark_grey'
     - 'grey'
     - 'white'
-    ```"""
+    ```
+
+    Row colors are immutable and interned: `RowColor('red')` always returns
+    the same shared object."""
+
+    __slots__ = ('_current_color_name',)
 
-    _current_color_name = None
+    _instances = {}
 
     _lookup = {
         # LXmTREEITEM_ROWCOLOR_MASK
@@ -72,8 +77,13 @@ class RowColor(object):
         'white':      0x00110000
     }
 
-    def __init__(self, color = None):
-        self._current_color_name = color
+    def __new__(cls, color = None):
+        instance = cls._instances.get(color)
+        if instance is None:
+            instance = super(RowColor, cls).__new__(cls)
+            instance._current_color_name = color
+            cls._instances[color] = instance
+        return instance
 
     def name():
         doc = """The name of the row color. Use `None` for no color.
@@ -101,8 +111,6 @@ class RowColor(object):
         ```"""
         def fget(self):
             return self._current_color_name
-        def fset(self, value):
-            self._current_color_name = value
         return locals()
 
     name = property(**name())
@@ -16,6 +16,46 @@ fTREE_VIEW_EXPSUB                = 0x00000004        # Sub-items are expanded an
 fTREE_VIEW_SELECTED              = 0x00000040
 
 
+class Columns(dict):
+    """Dictionary of `TreeValue()` objects keyed by column name, as stored in
+    `TreeNode().columns`. Keeps each value's `owner` pointing at the node and
+    drops the node's cached display row whenever a column is replaced."""
+
+    def __init__(self, owner, values=None):
+        super(Columns, self).__init__()
+        self._owner = owner
+        if values:
+            self.update(values)
+
+    def __setitem__(self, key, value):
+        if isinstance(value, TreeValue):
+            value.owner = self._owner
+        super(Columns, self).__setitem__(key, value)
+        self._owner.invalidate_row()
+
+    def __delitem__(self, key):
+        super(Columns, self).__delitem__(key)
+        self._owner.invalidate_row()
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).iteritems():
+            self[key] = value
+
+    def setdefault(self, key, value=None):
+        if key not in self:
+            self[key] = value
+        return self[key]
+
+    def pop(self, key, *args):
+        result = super(Columns, self).pop(key, *args)
+        self._owner.invalidate_row()
+        return result
+
+    def clear(self):
+        super(Columns, self).clear()
+        self._owner.invalidate_row()
+
+
 class TreeNode(object):
     """Generalized container object for TreeView node data. Everything needed
     to draw the node in the TreeView UI is contained in the TreeNode, as well
@@ -40,6 +80,14 @@ class TreeNode(object):
     # We sometimes need to tell the controller when things update.
     _controller = None
 
+    # Compact raw representation of children that have not been built yet.
+    # Subclasses that build their children on demand store it here and
+    # implement `build_children()`. `None` means all children are built.
+    _pending_children = None
+
+    # Cached display strings for the row, see `display_row`.
+    _row_cache = None
+
     def __init__(self, **kwargs):
 
         # Whether selectable in GUI
@@ -49,7 +97,7 @@ class TreeNode(object):
         self._selected = kwargs.get('selected', False)
 
         # Dict of TreeValue objects for each column; {column_name: TreeValue()}
-        self._columns = kwargs.get('columns', {})
+        self._columns = Columns(self, kwargs.get('columns'))
 
         # Nodes can be either `child` or `attribute`, but must be one or the other.
         self._is_attribute = kwargs.get('is_attribute', False)
@@ -197,11 +245,44 @@ class TreeNode(object):
         def fget(self):
             return self._columns
         def fset(self, columns):
-            self._columns = columns
+            self._columns = Columns(self, columns)
+            self.invalidate_row()
         return locals()
 
     columns = property(**columns())
 
+    def display_row(self, column_definitions):
+        """Returns a tuple of display strings for the row, one per column in
+        `column_definitions` order. Entries are `None` for columns that are
+        missing or displayed through their cell command.
+
+        The treeview asks for every cell on every repaint, so the tuple is
+        cached until a column value changes.
+
+        :param column_definitions: (list) column definitions of the tree's root node"""
+        cache = self._row_cache
+        if cache is not None and cache[0] is column_definitions:
+            return cache[1]
+
+        row = []
+        volatile = False
+        for column in column_definitions:
+            value = self._columns.get(column['name'])
+            if value is None or value.use_cell_command_for_display:
+                row.append(None)
+                continue
+            row.append(value.display_value)
+            volatile = volatile or value.is_volatile
+        row = tuple(row)
+
+        if not volatile:
+            self._row_cache = (column_definitions, row)
+        return row
+
+    def invalidate_row(self):
+        """Drops the cached `display_row()`."""
+        self._row_cache = None
+
     def parent():
         doc = """The parent node of the current `TreeNode()` object. The root
         node's parent is `None`."""
@@ -247,15 +328,47 @@ class TreeNode(object):
     def children():
         doc = """A list of `TreeNode()` objects that are children of the current
         node. Note that children appear under the triangular twirl in the listview
-        GUI, while attributes appear under the + sign."""
+        GUI, while attributes appear under the + sign.
+
+        Children stored in raw form are built on first access."""
         def fget(self):
+            if self._pending_children is not None:
+                self.materialize_children()
             return self._children
         def fset(self, value):
+            self._pending_children = None
             self._children = value
         return locals()
 
     children = property(**children())
 
+    @property
+    def loaded_children(self):
+        """Children that have already been built. Unbuilt children can't be
+        selected or displayed, so walkers looking for GUI state use this
+        instead of `children` to avoid building them."""
+        return self._children
+
+    @property
+    def child_count(self):
+        """Number of children, without building the ones stored in raw form."""
+        if self._pending_children is not None:
+            return len(self._pending_children)
+        return len(self._children)
+
+    def materialize_children(self):
+        """Builds the children stored in raw form, if any."""
+        pending = self._pending_children
+        if pending is None:
+            return
+        self._pending_children = None
+        self.build_children(pending)
+
+    def build_children(self, pending):
+        """Builds child nodes from the raw representation stored in
+        `_pending_children`. Implement in subclasses that build children lazily."""
+        pass
+
     def attributes():
         doc = """A list of `TreeNode()` objects that are attributes of the current
         node. Note that attributes appear under the + sign in the listview
@@ -353,7 +466,7 @@ class TreeNode(object):
         """Returns a list of all currently-selected children, grandchildren, etc
         of the current node."""
         selected_nodes = []
-        for child in self.children:
+        for child in self._children:
             if child.selected:
                 selected_nodes.append(child)
             selected_nodes.extend(child.selected_descendants)
@@ -363,7 +476,7 @@ class TreeNode(object):
     def selected_children(self):
         """Returns a list of all currently-selected children of the current node."""
         selected_nodes = []
-        for child in self.children:
+        for child in self._children:
             if child.selected:
                 selected_nodes.append(child)
         return selected_nodes
@@ -405,7 +518,7 @@ class TreeNode(object):
 
     def deselect_descendants(self):
         """Deselects all children, grandchildren, etc."""
-        for child in self.children:
+        for child in self._children:
             if child.selected:
                 # Only change it if we need to, since setting `select`
                 # fires the update notifier.
@@ -434,9 +547,14 @@ class TreeNode(object):
         the node itself, use `delete()`"""
         # If we don't clear out the `primary` property for the controller,
         # this node will live on as a zombie, eating the brains of...
-        if self._controller.primary in self.descendants:
-            self._controller.primary = None
-        del self.children[:]
+        node = self._controller.primary
+        while node is not None:
+            if node.parent is self:
+                self._controller.primary = None
+                break
+            node = node.parent
+        self._pending_children = None
+        del self._children[:]
 
     def delete_attributes(self):
         """Deletes all attributes from the current node. To delete
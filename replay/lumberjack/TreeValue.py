@@ -15,20 +15,67 @@ class TreeValue(object):
     Typically there is only one icon at the beginning of the string, and the entire cell
     has the same color and font. To keep things simple, the font, color, and icon
     properties are all designed to work this way. If you need something more complex,
-    you'll need to provide a custom `display_value` to override our default construct."""
+    you'll need to provide a custom `display_value` to override our default construct.
+
+    There is one TreeValue per cell, so the class uses `__slots__` to stay small.
+    Color and font are shared, immutable `Color()` and `Font()` instances.
+
+    The treeview asks for `display_value` on every repaint, so the markup string
+    is computed once and cached until one of the properties it depends on is set.
+    The `TreeNode()` owning the value is told as well, so it can drop its cached row."""
+
+    __slots__ = (
+        '_value',
+        '_cell_command',
+        '_batch_command',
+        '_datatype',
+        '_use_cell_command_for_display',
+        '_display_value',
+        '_input_region',
+        '_color',
+        '_font',
+        '_icon_resource',
+        '_tooltip',
+        '_display_cache',
+        '_owner'
+    )
 
     def __init__(self, **kwargs):
-        self._value = value if 'value' in kwargs else None
-        self._cell_command = cell_command if 'cell_command' in kwargs else None
-        self._batch_command = batch_command if 'batch_command' in kwargs else None
-        self._datatype = datatype if 'datatype' in kwargs else None
-        self._use_cell_command_for_display = use_cell_command_for_display if 'use_cell_command_for_display' in kwargs else False
-        self._display_value = display_value if 'display_value' in kwargs else None
-        self._input_region = input_region if 'input_region' in kwargs else None
-        self._color = color if 'color' in kwargs else Color()
-        self._font = font if 'font' in kwargs else Font()
-        self._icon_resource = icon_resource if 'icon_resource' in kwargs else None
-        self._tooltip = tooltip if 'tooltip' in kwargs else None
+        self._value = kwargs.get('value', None)
+        self._cell_command = kwargs.get('cell_command', None)
+        self._batch_command = kwargs.get('batch_command', None)
+        self._datatype = kwargs.get('datatype', None)
+        self._use_cell_command_for_display = kwargs.get('use_cell_command_for_display', False)
+        self._display_value = kwargs.get('display_value', None)
+        self._input_region = kwargs.get('input_region', None)
+        self._color = kwargs.get('color', Color())
+        self._font = kwargs.get('font', Font())
+        self._icon_resource = kwargs.get('icon_resource', None)
+        self._tooltip = kwargs.get('tooltip', None)
+        self._display_cache = None
+        self._owner = None
+
+    def invalidate(self):
+        """Drops the cached display string, and the owning node's cached row."""
+        self._display_cache = None
+        if self._owner is not None:
+            self._owner.invalidate_row()
+
+    def owner():
+        doc = """The `TreeNode()` whose `columns` contain this value. Set by the node."""
+        def fget(self):
+            return self._owner
+        def fset(self, value):
+            self._owner = value
+        return locals()
+
+    owner = property(**owner())
+
+    @property
+    def is_volatile(self):
+        """True if the display string can't be cached because the value is a
+        callable evaluated on every paint."""
+        return self._display_value is None and hasattr(self._value, '__call__')
 
     def use_cell_command_for_display():
         doc = """Boolean is True if `cell_command` is a query and should be used
@@ -39,6 +86,7 @@ class TreeValue(object):
             return self._use_cell_command_for_display
         def fset(self, use_cell_command_for_display):
             self._use_cell_command_for_display = use_cell_command_for_display
+            self.invalidate()
         return locals()
 
     use_cell_command_for_display = property(**use_cell_command_for_display())
@@ -51,6 +99,7 @@ class TreeValue(object):
             return self._value
         def fset(self, value):
             self._value = value
+            self.invalidate()
         return locals()
 
     value = property(**value())
@@ -99,6 +148,7 @@ class TreeValue(object):
             return self._icon_resource
         def fset(self, icon_resource):
             self._icon_resource = icon_resource
+            self.invalidate()
         return locals()
 
     icon_resource = property(**icon_resource())
@@ -169,6 +219,9 @@ class TreeValue(object):
         in the cell regardless of the actual cell value. Automatically prepends the
         `Value` object's color and font markup as appropriate."""
         def fget(self):
+            if self._display_cache is not None:
+                return self._display_cache
+
             if self._display_value is not None:
                 display_string = str(self._display_value)
             elif self._value is not None:
@@ -189,40 +242,51 @@ class TreeValue(object):
             markup += self._font.markup() if self._font else ''
             markup += self._color.markup() if self._color else ''
             markup += display_string
+
+            if not self.is_volatile:
+                self._display_cache = markup
             return markup
         def fset(self, value):
             self._display_value = value
+            self.invalidate()
         return locals()
 
     display_value = property(**display_value())
 
-    def intput_region():
+    def input_region():
         doc = """Region for input-mapping. Must correspond to one of the input_region
         strings provided during the `Lumberjack().bless()` operation."""
         def fget(self):
-            return self._intput_region
+            return self._input_region
         def fset(self, value):
-            self._intput_region = value
+            self._input_region = value
         return locals()
 
-    intput_region = property(**intput_region())
+    input_region = property(**input_region())
+
+    # Misspelled name kept for backwards compatibility.
+    intput_region = input_region
 
     def color():
-        doc = "Should be a Lumberjack `Color()` object. Default: None"
+        doc = """Should be a Lumberjack `Color()` object. Colors are shared between
+        cells, so assign a new one instead of modifying it. Default: `Color()`"""
         def fget(self):
             return self._color
         def fset(self, value):
             self._color = value
+            self.invalidate()
         return locals()
 
     color = property(**color())
 
     def font():
-        doc = "Should be a Lumberjack `Font()` object. Default: None"
+        doc = """Should be a Lumberjack `Font()` object. Fonts are shared between
+        cells, so assign a new one instead of modifying it. Default: `Font()`"""
         def fget(self):
             return self._font
         def fset(self, value):
             self._font = value
+            self.invalidate()
         return locals()
 
     font = property(**font())
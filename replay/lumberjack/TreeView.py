@@ -28,8 +28,24 @@ class TreeView( lxifc.TreeView,
         # Note: TreeView classes require a root TreeNode object. Without this,
         # Bad Things happen. Be sure to include this parameter when instantiating
         # the class for the first time.
+        for key in ('root', 'primary_column_position', 'input_regions', 'controller'):
+            if key in kwargs:
+                self.__class__.configure(**kwargs)
+                break
+
+        # Finally, initialize the current node in the iterator.
+        self.m_currentNode = kwargs.get('node') if kwargs.get('node') else self._root
+        self.m_currentIndex = kwargs.get('curIndex') if 'curIndex' in kwargs else 0
+
+    @classmethod
+    def configure(cls, **kwargs):
+        """Sets up the class-wide state shared by the treeview and all cursors
+        spawned from it. Runs once, when the first instance is created during
+        `Lumberjack.bless()`, so that spawning a cursor only has to set its
+        position in the tree."""
+
         if 'root' in kwargs:
-            self.__class__._root = kwargs.get('root')
+            cls._root = kwargs.get('root')
 
         # Moves the primary column to the specified column index.
         #
@@ -40,48 +56,43 @@ class TreeView( lxifc.TreeView,
         # To move it over to the selcond-from-left slot, for example, provide this
         # function a value of 1.
         if 'primary_column_position' in kwargs:
-            self.__class__._primary_column_position = kwargs.get('primary_column_position')
+            cls._primary_column_position = kwargs.get('primary_column_position')
 
         # The available input regions as blessed by the parent `Lumberjack.bless()`
         # function. Once blessed, this should not change at any time during a MODO session.
         if 'input_regions' in kwargs:
-            self.__class__._input_regions = kwargs.get('input_regions')
+            cls._input_regions = kwargs.get('input_regions')
 
         # The controller object for the TreeNode and TreeView objects. We occasionally
         # need to phone home to tell it about important updates or ask for global information.
         # Added during the blessing.
         if 'controller' in kwargs:
-            self.__class__._controller = kwargs.get('controller')
+            cls._controller = kwargs.get('controller')
 
         # Because TreeView() does not inherit `object`, you cannot put a
         # classvariable declaration outside of __init__() without affecting all
         # subclasses.
         try:
-            self._root
+            cls._root
         except AttributeError:
-            lx.out ('%s requires a root TreeNode on init.' % self.__class__.__name__)
-            raise Exception('%s requires a root TreeNode on init.' % self.__class__.__name__)
+            lx.out ('%s requires a root TreeNode on init.' % cls.__name__)
+            raise Exception('%s requires a root TreeNode on init.' % cls.__name__)
 
         try:
-            self._primary_column_position
+            cls._primary_column_position
         except AttributeError:
-            self.__class__._primary_column_position = 0
+            cls._primary_column_position = 0
 
         try:
-            self._input_regions
+            cls._input_regions
         except AttributeError:
-            self.__class__._input_regions = []
+            cls._input_regions = []
 
         try:
-            self._controller
+            cls._controller
         except AttributeError:
-            lx.out('%s requires a root controller object on init.' % self.__class__.__name__)
-            raise Exception('%s requires a root controller object on init.' % self.__class__.__name__)
-
-
-        # Finally, initialize the current node in the iterator.
-        self.m_currentNode = kwargs.get('node') if kwargs.get('node') else self._root
-        self.m_currentIndex = kwargs.get('curIndex') if 'curIndex' in kwargs else 0
+            lx.out('%s requires a root controller object on init.' % cls.__name__)
+            raise Exception('%s requires a root controller object on init.' % cls.__name__)
 
     # --------------------------------------------------------------------------------------------------
     # Listener port
@@ -149,7 +160,9 @@ class TreeView( lxifc.TreeView,
     def tree_Spawn(self, mode):
         """Spawn a new instance of this tier in the tree."""
 
-        # create an instance of our current location in the tree
+        # create an instance of our current location in the tree. MODO holds on
+        # to spawned trees for as long as it likes, so each spawn gets its own;
+        # the class-wide setup was done once in `configure()`.
         newTree = self.__class__(node=self.m_currentNode, curIndex=self.m_currentIndex)
 
         # Convert to a tree interface
@@ -194,12 +207,12 @@ class TreeView( lxifc.TreeView,
 
     def tree_ChildIsLeaf(self):
         """If the current tier has no children then it is
-        considered a leaf"""
-        return (len( self.m_currentNode.children ) == 0)
+        considered a leaf. Doesn't build children stored in raw form."""
+        return (self.m_currentNode.child_count == 0)
 
     def tree_Count(self):
         """Returns the number of nodes in this tier of
-        the tree"""
+        the tree. Builds the tier's children if they are stored in raw form."""
         return len( self.m_currentNode.children )
 
     def tree_Current(self):
@@ -296,7 +309,7 @@ class TreeView( lxifc.TreeView,
 
     def treeview_IsDescendantSelected (self):
         # Backwards for some reason...
-        for child in self.targetNode().children:
+        for child in self.targetNode().loaded_children:
             if child.selected:
                 return False
         return True
@@ -377,9 +390,8 @@ class TreeView( lxifc.TreeView,
 
         column_name = self._root.column_definitions[columnIndex]['name']
 
-        try:
-            target_region = self.targetNode().columns[column_name].input_region
-        except AttributeError:
+        target_region = self.targetNode().columns[column_name].input_region
+        if target_region is None:
             # The column has no input region assignment.
             return False
 
@@ -506,26 +518,17 @@ class TreeView( lxifc.TreeView,
 
         (NOTE: Empty cells render with zero height in the tree. Ugly.)"""
 
-        column_definitions = self._root.column_definitions
-        node = self.targetNode()
-
-        # I'll be honest: I don't understand this loop. It's here for some
-        # reason, and the method fails if I try to do it without the loop.
-        # So it's here. If you can think of a better way, by all means.
-        for n in range(len(column_definitions)):
-            if index == n:
-
-                # If we're using a treeview_CellCommand() query to render the cell,
-                # we don't send a string.
-                if node.columns[column_definitions[n]['name']].use_cell_command_for_display:
-                    lx.notimpl()
+        # The node caches its row of display strings, so answering a paint
+        # doesn't need any formatting.
+        try:
+            value = self.targetNode().display_row(self._root.column_definitions)[index]
+        except:
+            value = None
 
-                try:
-                    # Print the `display_value` in the cell
-                    return node.columns[column_definitions[n]['name']].display_value
-                except:
-                    break
+        if value is not None:
+            return value
 
-        # If node.columns[] doesn't contain a key for some reason,
-        # we need to fail gracefully lest we crash MODO.
+        # If node.columns[] doesn't contain a key for some reason, or the
+        # cell is drawn by its cell command, we need to fail gracefully lest
+        # we crash MODO.
         lx.notimpl()